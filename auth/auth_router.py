@@ -1,37 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from core.security import verify_password, create_access_token
+from core.security import verify_and_update_password, create_access_token, claims_usuario
+from core.rate_limit import limitador_login
 from database import get_db
 from models.usuarios import Usuario
 
 router = APIRouter(prefix="/auth", tags=["Autenticación"])
 
+logger = logging.getLogger(__name__)
+
 # 🧩 Modelo para el cuerpo del login
 class LoginData(BaseModel):
     correo: str
     contrasena: str
 
 @router.post("/login")
-def login(data: LoginData, db: Session = Depends(get_db)):
-    print(f"🟢 Recibido login con correo: {data.correo}, contraseña: {data.contrasena}")
+def login(data: LoginData, request: Request, db: Session = Depends(get_db)):
+    ip = request.client.host if request.client else None
+
+    # 🚦 Antes de la BD y de bcrypt: una ráfaga no consume CPU
+    try:
+        limitador_login.verificar(data.correo, ip)
+    except HTTPException:
+        logger.warning("login limitado", extra={"evento": "login_limitado", "correo": data.correo, "ip": ip})
+        raise
 
     user = db.query(Usuario).filter(Usuario.correo == data.correo).first()
     if not user:
-        print("❌ Usuario no encontrado.")
+        limitador_login.fallo(data.correo, ip)
+        logger.info("login fallido", extra={"evento": "login_fallido", "motivo": "correo", "correo": data.correo, "ip": ip})
         raise HTTPException(status_code=401, detail="Correo no encontrado")
 
-    print(f"✅ Usuario encontrado: {user.correo}")
-    print(f"Hash en BD: {user.contrasena_hash}")
-
-    valido = verify_password(data.contrasena, user.contrasena_hash)
-    print(f"¿Contraseña válida?: {valido}")
+    valido, nuevo_hash = verify_and_update_password(data.contrasena, user.contrasena_hash)
 
     if not valido:
+        limitador_login.fallo(data.correo, ip)
+        logger.info("login fallido", extra={"evento": "login_fallido", "motivo": "contrasena", "correo": data.correo, "ip": ip})
         raise HTTPException(status_code=401, detail="Contraseña incorrecta")
 
-    token = create_access_token({"sub": str(user.id_usuario)})
-    print("🔑 Token generado correctamente")
+    limitador_login.exito(data.correo)
+
+    # Re-hash perezoso si cambió BCRYPT_ROUNDS. UPDATE directo: es la misma
+    # contraseña, así que no debe pasar por el listener que revoca los tokens
+    # (core/revocacion_tokens.py) ni cerrar las otras sesiones del usuario
+    if nuevo_hash:
+        db.execute(
+            update(Usuario)
+            .where(Usuario.id_usuario == user.id_usuario)
+            .values(contrasena_hash=nuevo_hash)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    token = create_access_token(claims_usuario(user))
+    logger.info("login correcto", extra={"evento": "login_ok", "id_usuario": user.id_usuario, "ip": ip})
 
     return {
         "access_token": token,
@@ -0,0 +1,287 @@
+"""
+Auditoría de índices: corre EXPLAIN sobre las consultas reales de los
+routers contra un dataset sembrado y falla (exit 1) si alguna recorre
+una tabla completa que no está en su lista de permitidas.
+
+Por default crea una BD SQLite temporal con las migraciones (alembic
+upgrade head) y la siembra; con --url usa una BD ya sembrada (p. ej. MySQL de staging):
+
+    python benchmarks/auditoria_indices.py
+    python benchmarks/auditoria_indices.py --citas 50000 -v
+    python benchmarks/auditoria_indices.py --url mysql+pymysql://user:pw@host/AutismoMochis
+
+Cada consulta se ejecuta llamando a la función del router / util real; las
+sentencias SELECT que emite se capturan y se explican con sus parámetros.
+"""
+import argparse
+import re
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event, insert, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from database.base import Base  # noqa: E402
+from database.esquema import importar_modelos, migrar  # noqa: E402
+
+importar_modelos()
+
+from models.citas import Cita  # noqa: E402
+from models.cita_tipos import CitaTipo  # noqa: E402
+from models.correos_outbox import CorreoOutbox  # noqa: E402
+from models.grados_academicos import GradoAcademico  # noqa: E402
+from models.ninos import Nino  # noqa: E402
+from models.ninos_prospecto import NinoProspecto  # noqa: E402
+from models.personal import Personal  # noqa: E402
+from models.roles import Rol  # noqa: E402
+from models.terapias import Terapia  # noqa: E402
+from models.tutores import Tutor  # noqa: E402
+from models.usuarios import Usuario  # noqa: E402
+
+# Catálogos de pocas filas: recorrerlos completos es lo correcto
+TABLAS_CATALOGO = {"roles", "grados_academicos", "cita_tipos", "terapias"}
+
+
+# ===========================================================
+# 🌱 Dataset
+# ===========================================================
+def sembrar(engine, n_citas: int):
+    n_personal, n_tutores = 60, 400
+    hoy = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id_rol": i, "nombre_rol": n} for i, n in
+                                    enumerate(["Administrador", "Coordinador", "Terapeuta", "Tutor"], 1)])
+        conn.execute(insert(GradoAcademico), [{"id_grado": i, "nombre": f"Grado {i}"} for i in range(1, 5)])
+        conn.execute(insert(Terapia), [{"id_terapia": i, "nombre_terapia": f"Terapia {i}", "duracion_minutos": 45}
+                                       for i in range(1, 9)])
+        conn.execute(insert(CitaTipo), [{"id_tipo": i, "nombre_tipo": f"Tipo {i}"} for i in range(1, 5)])
+
+        usuarios = []
+        for i in range(1, n_personal + n_tutores + 1):
+            usuarios.append({
+                "id_usuario": i, "nombre": f"Nombre{i}", "apellido_paterno": f"Ap{i % 97}",
+                "correo": f"usuario{i}@ejemplo.com", "contrasena_hash": "x",
+                "id_rol": 3 if i <= n_personal else 4, "activo": True, "version_token": 0,
+            })
+        conn.execute(insert(Usuario), usuarios)
+        conn.execute(insert(Personal), [{"id_personal": i, "id_usuario": i, "id_grado": 1 + i % 4}
+                                        for i in range(1, n_personal + 1)])
+        conn.execute(insert(Tutor), [{"id_tutor": i, "id_usuario": n_personal + i} for i in range(1, n_tutores + 1)])
+        conn.execute(insert(Nino), [{"id_nino": i, "nombre": f"Niño{i}", "id_tutor": 1 + i % n_tutores}
+                                    for i in range(1, n_tutores * 2 + 1)])
+        conn.execute(insert(NinoProspecto), [{"id_prospecto": i, "nombre": f"Prospecto{i}"} for i in range(1, 201)])
+
+        citas = []
+        for i in range(1, n_citas + 1):
+            sin_nino = i % 10 == 0
+            citas.append({
+                "id_cita": i,
+                "id_nino": None if sin_nino else 1 + i % (n_tutores * 2),
+                "nombre_nino_libre": f"Libre{i}" if sin_nino else None,
+                "id_personal": 1 + i % n_personal,
+                "id_terapia": 1 + i % 8,
+                "id_tipo": 1 + i % 4,
+                "fecha": hoy + timedelta(days=(i % 365) - 180),
+                "hora": time(8 + i % 11, 0),
+                "estado": ["Programada", "Completada", "Cancelada"][i % 3],
+            })
+        conn.execute(insert(Cita), citas)
+        conn.execute(insert(CorreoOutbox), [
+            {"id_cita": i, "evento": "cita_creada", "estado": "enviado" if i % 50 else "pendiente",
+             "intentos": 0, "proximo_intento": datetime.now()}
+            for i in range(1, n_citas + 1)
+        ])
+
+
+# ===========================================================
+# 🔎 Consultas (las de los routers / utils, llamadas tal cual)
+# ===========================================================
+class Consulta(NamedTuple):
+    nombre: str
+    ejecutar: Callable[[Session], object]
+    # Recorridos aceptados a propósito: no fallan, pero se reportan como aviso
+    recorridos_permitidos: frozenset = frozenset()
+    motivo: str = ""
+
+
+_MOTIVO_PERSONAL = (
+    "con poco personal frente a usuarios el planner recorre personal y ordena en lugar "
+    "de caminar ix_usuarios_nombre_id saltando tutores; revisar si personal crece"
+)
+
+
+def _consultas() -> list[Consulta]:
+    from core.cache_roles import cache_roles, cargar_usuario_actual
+    from routers import citas as r_citas
+    from routers.personal import listar_personal
+    from utils.disponibilidad import intervalos_ocupados
+    from utils.email_notificaciones import resolver_datos_citas
+
+    hoy = date.today()
+
+    def get_citas(**filtros):
+        base = dict(estado=None, id_personal=None, id_terapia=None, id_tipo=None,
+                    desde=None, hasta=None, cursor=None, limite=50, expand=set())
+        return lambda db: r_citas.get_citas(**{**base, **filtros}, db=db)
+
+    def pagina_2(db):
+        primera = get_citas()(db)
+        return r_citas.get_citas(estado=None, id_personal=None, id_terapia=None, id_tipo=None,
+                                 desde=None, hasta=None, cursor=primera.next_cursor, limite=50, expand=set(), db=db)
+
+    def get_personal(**filtros):
+        base = dict(q=None, id_rol=None, id_grado=None, activo=None, orden="nombre", cursor=None, limite=50)
+        return lambda db: listar_personal(**{**base, **filtros}, db=db, _=None)
+
+    def lote_pendiente(db):
+        # Misma consulta que procesar_lote, sin enviar correos
+        return (
+            db.query(CorreoOutbox)
+            .filter(CorreoOutbox.estado.in_(("pendiente", "enviando")),
+                    CorreoOutbox.proximo_intento <= datetime.now())
+            .order_by(CorreoOutbox.proximo_intento, CorreoOutbox.id_correo)
+            .limit(50)
+            .all()
+        )
+
+    def usuario_actual(db):
+        cache_roles.invalidar()
+        return cargar_usuario_actual(db, 1)
+
+    return [
+        Consulta("auth.login: usuario por correo",
+                 lambda db: db.query(Usuario).filter(Usuario.correo == "usuario7@ejemplo.com").first()),
+        Consulta("core: usuario actual + rol", usuario_actual),
+        Consulta("GET /citas/", get_citas()),
+        Consulta("GET /citas/?cursor=", pagina_2),
+        Consulta("GET /citas/?estado=", get_citas(estado="Programada")),
+        Consulta("GET /citas/?id_personal=", get_citas(id_personal=3)),
+        Consulta("GET /citas/?desde=&hasta=", get_citas(desde=hoy, hasta=hoy + timedelta(days=7))),
+        Consulta("GET /citas/?expand=", get_citas(expand={"nino", "personal", "terapia", "tipo"})),
+        Consulta("GET /citas/{id}", lambda db: r_citas.get_cita(10, expand=set(), db=db)),
+        Consulta("GET /citas/hoy", lambda db: r_citas.citas_de_hoy(expand=set(), db=db)),
+        Consulta("GET /citas/prospectos", lambda db: r_citas.citas_prospectos(expand=set(), db=db)),
+        Consulta("GET /citas/terapeuta/{id}", lambda db: r_citas.citas_por_terapeuta(3, expand=set(), db=db)),
+        Consulta("GET /citas/nino/{id}", lambda db: r_citas.citas_por_nino(5, expand=set(), db=db)),
+        Consulta("disponibilidad: intervalos ocupados",
+                 lambda db: intervalos_ocupados(db, 3, hoy, hoy + timedelta(days=14))),
+        Consulta("notificaciones: datos de citas", lambda db: resolver_datos_citas(list(range(1, 200, 7)), db)),
+        Consulta("outbox: lote pendiente", lote_pendiente),
+        Consulta("GET /personal/", get_personal(), frozenset({"personal"}), _MOTIVO_PERSONAL),
+        Consulta("GET /personal/?orden=-correo", get_personal(orden="-correo"), frozenset({"personal"}),
+                 _MOTIVO_PERSONAL),
+        Consulta("GET /personal/?q=", get_personal(q="nombre1"), frozenset({"usuarios", "personal"}),
+                 "LIKE '%texto%' no puede usar índice"),
+    ]
+
+
+# ===========================================================
+# 📋 EXPLAIN
+# ===========================================================
+def _tabla_real(nombre: str, tablas: set[str]) -> str:
+    # Alias de SQLAlchemy: usuarios_1 -> usuarios
+    base = re.sub(r"_\d+$", "", nombre)
+    return base if base in tablas else nombre
+
+
+def _recorridos_sqlite(conn, sql, params, tablas) -> tuple[list[str], list[str]]:
+    plan = [fila[-1] for fila in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)]
+    completos = []
+    for paso in plan:
+        m = re.match(r"SCAN (\w+)(?: AS (\w+))?(.*)$", paso)
+        if m and "USING" not in m.group(3):
+            completos.append(_tabla_real(m.group(1), tablas))
+    return plan, completos
+
+
+def _recorridos_mysql(conn, sql, params, tablas) -> tuple[list[str], list[str]]:
+    filas = conn.exec_driver_sql(f"EXPLAIN {sql}", params).mappings().all()
+    plan = [f"{f['table']}: type={f['type']} key={f['key']} rows={f['rows']}" for f in filas]
+    completos = [_tabla_real(f["table"], tablas) for f in filas if f["type"] == "ALL" and f["table"]]
+    return plan, completos
+
+
+def auditar(engine, verbose: bool) -> int:
+    tablas = set(Base.metadata.tables)
+    explicar = _recorridos_sqlite if engine.dialect.name == "sqlite" else _recorridos_mysql
+    capturadas: list[tuple[str, object]] = []
+    capturando = False
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capturar(conn, cursor, sql, params, context, executemany):
+        if capturando and sql.lstrip().upper().startswith("SELECT"):
+            capturadas.append((sql, params))
+
+    fallas = avisos = 0
+    for consulta in _consultas():
+        capturadas.clear()
+        capturando = True
+        with Session(engine) as db:
+            consulta.ejecutar(db)
+            db.rollback()
+        capturando = False
+
+        problemas, aceptados, planes = [], [], []
+        with engine.connect() as conn:
+            for sql, params in capturadas:
+                plan, completos = explicar(conn, sql, params, tablas)
+                completos = [t for t in completos if t not in TABLAS_CATALOGO]
+                malos = [t for t in completos if t not in consulta.recorridos_permitidos]
+                if malos:
+                    problemas.append((sql, plan, malos))
+                elif completos:
+                    aceptados.append((sql, plan, completos))
+                else:
+                    planes.append(plan)
+
+        estado = "FALLA" if problemas else "aviso" if aceptados else "ok"
+        print(f"[{estado:5s}] {consulta.nombre} ({len(capturadas)} consultas)")
+        if verbose:
+            for plan in planes:
+                print(f"      {' | '.join(plan)}")
+        for sql, plan, tablas_recorridas in problemas + aceptados:
+            print(f"        recorrido completo de: {', '.join(sorted(set(tablas_recorridas)))}")
+            print("        " + " ".join(sql.split())[:300])
+            for paso in plan:
+                print(f"          {paso}")
+        if aceptados:
+            print(f"        aceptado: {consulta.motivo}")
+        fallas += len(problemas)
+        avisos += len(aceptados)
+
+    return fallas, avisos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="BD ya sembrada; sin esto se usa SQLite temporal")
+    parser.add_argument("--citas", type=int, default=20000)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            engine = create_engine(args.url)
+        else:
+            engine = create_engine(f"sqlite:///{tmp}/auditoria.db")
+            migrar(engine)
+            sembrar(engine, args.citas)
+            with engine.begin() as conn:
+                conn.execute(text("ANALYZE"))
+
+        fallas, avisos = auditar(engine, args.verbose)
+        engine.dispose()
+
+    print(f"\n{fallas} consulta(s) con recorrido completo" if fallas else "\nSin recorridos completos no aceptados")
+    if avisos:
+        print(f"{avisos} recorrido(s) aceptado(s), ver [aviso] arriba")
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Tiempo de arranque de un worker según DB_ESQUEMA_MODO.
+
+Cada medición es un proceso nuevo (como un worker de `uvicorn --workers N`):
+importa main y prepara el esquema. "crear" equivale al create_all que
+antes corría al importar main; "verificar" solo lee alembic_version.
+Con --workers se arrancan N procesos a la vez, como en un despliegue.
+
+    alembic upgrade head
+    python benchmarks/bench_arranque.py --repeticiones 10 --workers 4
+
+Usa la BD de DATABASE_URL (.env); en MySQL la diferencia es mayor porque
+create_all consulta el catálogo por cada tabla.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+CODIGO = """
+import time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+from database.esquema import preparar_esquema
+preparar_esquema(main.engine)
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+
+def _arrancar(modo: str, workers: int) -> list[tuple[float, float]]:
+    env = dict(os.environ, DB_ESQUEMA_MODO=modo, OUTBOX_HABILITADO="false", RECORDATORIOS_HABILITADO="false")
+    procesos = [
+        subprocess.Popen([sys.executable, "-c", CODIGO], cwd=RAIZ, env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    tiempos = []
+    for p in procesos:
+        salida, _ = p.communicate()
+        if p.returncode != 0:
+            raise SystemExit(f"El worker falló en modo {modo!r}")
+        importacion, esquema = map(float, salida.split()[-2:])
+        tiempos.append((importacion, esquema))
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--modo", action="append", help="default: crear y verificar")
+    args = parser.parse_args()
+
+    for modo in args.modo or ["crear", "verificar"]:
+        tiempos = [t for _ in range(args.repeticiones) for t in _arrancar(modo, args.workers)]
+        importacion = [i * 1000 for i, _ in tiempos]
+        esquema = [e * 1000 for _, e in tiempos]
+        total = [i + e for i, e in zip(importacion, esquema)]
+        print(
+            f"{modo:10s} import main: {statistics.median(importacion):7.1f} ms   "
+            f"esquema: {statistics.median(esquema):7.1f} ms   "
+            f"total p50: {statistics.median(total):7.1f} ms   max: {max(total):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Índice de búsqueda en memoria (/buscar): tiempo de construcción, memoria
+aproximada y latencia de consultas con acentos y errores de dedo.
+
+Siembra una BD SQLite temporal con N niños, prospectos y usuarios con
+nombres en español y mide sobre utils.busqueda.IndiceBusqueda:
+
+    python benchmarks/bench_busqueda.py --documentos 20000 --consultas 2000
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+from database.base import Base  # noqa: E402
+from database.esquema import importar_modelos  # noqa: E402
+
+importar_modelos()
+
+from models.ninos import Nino  # noqa: E402
+from models.ninos_prospecto import NinoProspecto  # noqa: E402
+from models.roles import Rol  # noqa: E402
+from models.tutores import Tutor  # noqa: E402
+from models.usuarios import Usuario  # noqa: E402
+from utils.busqueda import IndiceBusqueda  # noqa: E402
+
+NOMBRES = ["José", "María", "Ángel", "Sofía", "Íñigo", "Valentina", "Mateo", "Ximena", "Renata", "Jesús",
+           "Lucía", "Andrés", "Camila", "Sebastián", "Regina", "Julián", "Mónica", "Raúl", "Inés", "Tomás",
+           "Daniela", "Emiliano", "Fernanda", "Gael", "Isabella", "Leonardo", "Natalia", "Óscar", "Paulina",
+           "Rodrigo", "Santiago", "Ximena", "Yael", "Zoé", "Héctor", "Begoña", "Adrián", "Noé", "Dulce", "Iker"]
+APELLIDOS = ["Pérez", "Núñez", "Peña", "Domínguez", "Gutiérrez", "López", "Ramírez", "Martínez", "Ávila",
+             "Gómez", "Hernández", "Sánchez", "Ruíz", "Muñoz", "Jiménez", "Vázquez", "Díaz", "Álvarez",
+             "Castañeda", "Ibarra", "Valenzuela", "Félix", "Quiñónez", "Beltrán", "Ochoa", "Acosta", "Zazueta",
+             "Armenta", "Lugo", "Camacho", "Cota", "Leyva", "Inzunza", "Bojórquez", "Verdugo", "Montoya"]
+
+
+def _error_de_dedo(texto: str, rnd: random.Random) -> str:
+    """Quita acentos/mayúsculas y mete un error: borrar, cambiar o duplicar una letra."""
+    texto = texto.lower().translate(str.maketrans("áéíóúñ", "aeioun"))
+    i = rnd.randrange(1, len(texto) - 1)
+    return rnd.choice([
+        texto[:i] + texto[i + 1:],
+        texto[:i] + rnd.choice("aeioursnl") + texto[i + 1:],
+        texto[:i] + texto[i] + texto[i:],
+    ])
+
+
+def sembrar(engine, n: int, rnd: random.Random) -> list[str]:
+    nombre = lambda: f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"  # noqa: E731
+    nombres = [nombre() for _ in range(n)]
+    tercio = n // 3
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id_rol": 1, "nombre_rol": "Tutor"}])
+        usuarios = []
+        for i, completo in enumerate(nombres[:tercio], 1):
+            nom, ap, am = completo.split()
+            usuarios.append({"id_usuario": i, "nombre": nom, "apellido_paterno": ap, "apellido_materno": am,
+                             "correo": f"{nom.lower()}{i}@correo.com", "contrasena_hash": "x", "id_rol": 1})
+        conn.execute(insert(Usuario), usuarios)
+        conn.execute(insert(Tutor), [{"id_tutor": i, "id_usuario": i, "curp": f"CURP{i:014d}"}
+                                     for i in range(1, tercio + 1)])
+        conn.execute(insert(Nino), [
+            dict(zip(("nombre", "apellido_paterno", "apellido_materno"), completo.split()), id_nino=i)
+            for i, completo in enumerate(nombres[tercio:2 * tercio], 1)
+        ])
+        conn.execute(insert(NinoProspecto), [
+            dict(zip(("nombre", "apellido_paterno", "apellido_materno"), completo.split()), id_prospecto=i,
+                 nombre_tutor=nombre(), telefono_contacto=f"668-{rnd.randrange(10**6, 10**7)}")
+            for i, completo in enumerate(nombres[2 * tercio:], 1)
+        ])
+    return nombres
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documentos", type=int, default=20000)
+    parser.add_argument("--consultas", type=int, default=2000)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+    rnd = random.Random(args.semilla)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/busqueda.db")
+        Base.metadata.create_all(engine)
+        nombres = sembrar(engine, args.documentos, rnd)
+
+        indice = IndiceBusqueda(intervalo=3600, umbral=0.3)
+        inicio = time.perf_counter()
+        indice.asegurar(engine)
+        construccion = time.perf_counter() - inicio
+
+        # La memoria se mide en otra construcción: tracemalloc la hace más lenta
+        tracemalloc.start()
+        copia = IndiceBusqueda(intervalo=3600, umbral=0.3)
+        copia.asegurar(engine)
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del copia
+        engine.dispose()
+
+    print(f"Construcción: {construccion * 1000:.0f} ms, {indice.estado()['documentos']} documentos, "
+          f"~{memoria / 2**20:.1f} MB")
+
+    for etiqueta, transformar in [
+        ("exacta", lambda s: s),
+        ("sin acentos + error", lambda s: _error_de_dedo(s, rnd)),
+        ("solo nombre", lambda s: s.split()[0]),
+    ]:
+        latencias, encontrados = [], 0
+        for _ in range(args.consultas):
+            # Nombre + primer apellido, como se teclea en el buscador
+            buscado = " ".join(rnd.choice(nombres).split()[:2])
+            consulta = transformar(buscado)
+            esperado = " ".join(buscado.split()[:len(consulta.split())])
+            inicio = time.perf_counter()
+            resultados = indice.buscar(consulta, limite=20)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            encontrados += any(doc.titulo.startswith(esperado) for doc, _ in resultados)
+        latencias.sort()
+        print(f"{etiqueta:22s} p50 {statistics.median(latencias):6.2f} ms  "
+              f"p99 {latencias[int(len(latencias) * 0.99)]:6.2f} ms  "
+              f"con resultado esperado: {encontrados / args.consultas:.0%}")
+
+
+if __name__ == "__main__":
+    main()
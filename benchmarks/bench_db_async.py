@@ -0,0 +1,79 @@
+"""
+Comparación del stack sync (threadpool) contra el async (DB_ASYNC=true)
+en los CRUD simples.
+
+Levantar la API dos veces contra la misma base y correr el mismo escenario:
+
+    DB_ASYNC=false uvicorn main:app --port 8000
+    DB_ASYNC=true  uvicorn main:app --port 8001      # pip install "sqlalchemy[asyncio]" asyncmy
+
+    python benchmarks/bench_db_async.py --url http://127.0.0.1:8000 --concurrencia 200
+    python benchmarks/bench_db_async.py --url http://127.0.0.1:8001 --concurrencia 200
+
+Con concurrencia mayor que el threadpool de Starlette (40 hilos) el modelo
+sync encola peticiones esperando hilo; el async solo espera conexiones del
+pool de la BD (DB_POOL_SIZE + DB_MAX_OVERFLOW). Para SQLite usar aiosqlite.
+Requiere httpx.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+RUTAS = ["/ninos/", "/tutores/", "/terapias/", "/cita-tipos/", "/prospectos/"]
+
+
+async def _trabajador(cliente, cola, resultados):
+    while True:
+        try:
+            ruta = cola.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        inicio = time.perf_counter()
+        try:
+            r = await cliente.get(ruta)
+            codigo = r.status_code
+        except httpx.HTTPError as exc:
+            codigo = type(exc).__name__
+        resultados.append((codigo, time.perf_counter() - inicio))
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrencia", type=int, default=100)
+    parser.add_argument("--total", type=int, default=2000)
+    parser.add_argument("--ruta", action="append", help="rutas a pedir (default: los CRUD simples)")
+    args = parser.parse_args()
+
+    rutas = args.ruta or RUTAS
+    cola: asyncio.Queue = asyncio.Queue()
+    for i in range(args.total):
+        cola.put_nowait(rutas[i % len(rutas)])
+
+    resultados: list[tuple[int | str, float]] = []
+    limites = httpx.Limits(max_connections=args.concurrencia)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limites) as cliente:
+        inicio = time.perf_counter()
+        await asyncio.gather(*[_trabajador(cliente, cola, resultados) for _ in range(args.concurrencia)])
+        duracion = time.perf_counter() - inicio
+
+    print(f"{len(resultados)} peticiones en {duracion:.2f}s -> {len(resultados) / duracion:.1f} req/s")
+    for codigo, n in sorted(Counter(c for c, _ in resultados).items(), key=lambda x: str(x[0])):
+        latencias = [t * 1000 for c, t in resultados if c == codigo]
+        print(
+            f"  {codigo}: {n:5d}  p50={statistics.median(latencias):7.1f}ms"
+            f"  p95={_percentil(latencias, 95):7.1f}ms  p99={_percentil(latencias, 99):7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
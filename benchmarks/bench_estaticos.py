@@ -0,0 +1,108 @@
+"""
+Benchmark del servido de /static.
+
+Compara el StaticFiles de Starlette sin configurar con
+utils.estaticos.EstaticosCacheables sobre los mismos archivos:
+
+- "recarga": un cliente que respeta caché pide N veces un avatar y un PDF
+  del almacén (como recargar el dashboard). Con Cache-Control inmutable el
+  navegador ni siquiera pregunta; con el mount anterior revalida o
+  descarga de nuevo.
+- "range": pide un tramo de 1 MB del PDF (visor de PDF paginado).
+
+Corre en proceso con httpx.ASGITransport; para medir pathsend/sendfile
+levantar el servidor ASGI real (p. ej. granian) y apuntar --url.
+
+    python benchmarks/bench_estaticos.py --pdf-mb 20 --repeticiones 200
+Requiere httpx.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from starlette.staticfiles import StaticFiles  # noqa: E402
+
+from utils.estaticos import EstaticosCacheables  # noqa: E402
+
+
+def _crear_blob(carpeta: Path, contenido: bytes, extension: str) -> str:
+    sha256 = hashlib.sha256(contenido).hexdigest()
+    destino = carpeta / "blobs" / sha256[:2] / f"{sha256}{extension}"
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    destino.write_bytes(contenido)
+    return f"/blobs/{sha256[:2]}/{sha256}{extension}"
+
+
+class _CacheNavegador:
+    """Caché mínima: respeta max-age/immutable y revalida con If-None-Match."""
+
+    def __init__(self):
+        self.entradas: dict[str, tuple[str, float]] = {}
+
+    async def get(self, cliente: httpx.AsyncClient, ruta: str) -> tuple[int, int]:
+        etag, expira = self.entradas.get(ruta, (None, 0.0))
+        if etag and expira > time.monotonic():
+            return 0, 0  # servido de caché, sin red
+        headers = {"if-none-match": etag} if etag else {}
+        r = await cliente.get(ruta, headers=headers)
+        control = r.headers.get("cache-control", "")
+        max_age = 0
+        for parte in control.split(","):
+            if parte.strip().startswith("max-age="):
+                max_age = int(parte.strip().split("=", 1)[1])
+        if "etag" in r.headers:
+            self.entradas[ruta] = (r.headers["etag"], time.monotonic() + max_age)
+        return 1, len(r.content)
+
+
+async def _medir(nombre: str, app, rutas: list[str], pdf: str, repeticiones: int):
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        cache = _CacheNavegador()
+        peticiones = bytes_red = 0
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for ruta in rutas:
+                n, b = await cache.get(cliente, ruta)
+                peticiones += n
+                bytes_red += b
+        recarga = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for i in range(repeticiones):
+            desde = (i * 1024 * 1024) % (8 * 1024 * 1024)
+            r = await cliente.get(pdf, headers={"range": f"bytes={desde}-{desde + 1024 * 1024 - 1}"})
+            assert r.status_code == 206, r.status_code
+        rango = time.perf_counter() - inicio
+
+    print(
+        f"{nombre:12s} recarga: {peticiones:5d} peticiones, {bytes_red / 1024 / 1024:8.1f} MB, "
+        f"{recarga * 1000:8.1f} ms   range 1MB: {rango / repeticiones * 1000:6.2f} ms/pet"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdf-mb", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        carpeta = Path(tmp)
+        avatar = _crear_blob(carpeta, os.urandom(300 * 1024), ".jpg")
+        pdf = _crear_blob(carpeta, os.urandom(args.pdf_mb * 1024 * 1024), ".pdf")
+
+        await _medir("StaticFiles", StaticFiles(directory=carpeta), [avatar, pdf], pdf, args.repeticiones)
+        await _medir("cacheables", EstaticosCacheables(directory=carpeta), [avatar, pdf], pdf, args.repeticiones)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Memoria de GET /citas/export contra el número de citas.
+
+Siembra una BD SQLite temporal, llama al endpoint real y consume el
+StreamingResponse completo midiendo el pico de memoria con tracemalloc.
+Para comparar, mide también el enfoque ingenuo (`.all()` + CSV en memoria).
+El pico del streaming debe quedarse plano al crecer el número de filas
+(los tiempos incluyen el costo de tracemalloc).
+
+    python benchmarks/bench_export_citas.py --tamanos 20000 100000 300000
+    python benchmarks/bench_export_citas.py --formato xlsx      # requiere XlsxWriter
+"""
+import argparse
+import asyncio
+import csv
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from datetime import time as hora
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from database.base import Base  # noqa: E402
+from database.esquema import importar_modelos  # noqa: E402
+
+importar_modelos()
+
+from models.citas import Cita  # noqa: E402
+from models.cita_tipos import CitaTipo  # noqa: E402
+from models.ninos import Nino  # noqa: E402
+from models.personal import Personal  # noqa: E402
+from models.roles import Rol  # noqa: E402
+from models.terapias import Terapia  # noqa: E402
+from models.usuarios import Usuario  # noqa: E402
+from routers.citas import _ENCABEZADOS_EXPORT, _consulta_export, exportar_citas  # noqa: E402
+
+
+def sembrar(engine, n_citas: int):
+    hoy = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id_rol": 1, "nombre_rol": "Terapeuta"}])
+        conn.execute(insert(Usuario), [{"id_usuario": i, "nombre": f"Terapeuta{i}", "apellido_paterno": "Pérez",
+                                        "correo": f"t{i}@ejemplo.com", "contrasena_hash": "x", "id_rol": 1}
+                                       for i in range(1, 41)])
+        conn.execute(insert(Personal), [{"id_personal": i, "id_usuario": i} for i in range(1, 41)])
+        conn.execute(insert(Terapia), [{"id_terapia": i, "nombre_terapia": f"Terapia {i}"} for i in range(1, 9)])
+        conn.execute(insert(CitaTipo), [{"id_tipo": i, "nombre_tipo": f"Tipo {i}"} for i in range(1, 5)])
+        conn.execute(insert(Nino), [{"id_nino": i, "nombre": f"Niño{i}", "apellido_paterno": "Núñez"}
+                                    for i in range(1, 2001)])
+        for inicio in range(0, n_citas, 50_000):
+            conn.execute(insert(Cita), [
+                {
+                    "id_nino": None if i % 10 == 0 else 1 + i % 2000,
+                    "nombre_nino_libre": f"Libre {i}" if i % 10 == 0 else None,
+                    "id_personal": 1 + i % 40, "id_terapia": 1 + i % 8, "id_tipo": 1 + i % 4,
+                    "fecha": hoy - timedelta(days=i % 1500), "hora": hora(8 + i % 11),
+                    "estado": "Completada", "notas": "Sesión sin incidencias, seguimiento en casa.",
+                }
+                for i in range(inicio, min(inicio + 50_000, n_citas))
+            ])
+
+
+async def _consumir(respuesta) -> int:
+    total = 0
+    async for parte in respuesta.body_iterator:
+        total += len(parte)
+    return total
+
+
+def medir_streaming(engine, formato: str) -> tuple[float, int, float]:
+    with Session(engine) as db:
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        respuesta = exportar_citas(formato=formato, estado=None, id_personal=None, id_terapia=None,
+                                   id_tipo=None, desde=None, hasta=None, db=db, _=None)
+        tamano = asyncio.run(_consumir(respuesta))
+        duracion = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return pico / 2**20, tamano, duracion
+
+
+def medir_ingenuo(engine) -> tuple[float, int, float]:
+    with Session(engine) as db:
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        filas = _consulta_export(db).order_by(Cita.fecha.desc(), Cita.hora, Cita.id_cita).all()
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        escritor.writerow(_ENCABEZADOS_EXPORT)
+        escritor.writerows(filas)
+        tamano = len(buffer.getvalue().encode("utf-8"))
+        duracion = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return pico / 2**20, tamano, duracion
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[20_000, 100_000, 300_000])
+    parser.add_argument("--formato", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--sin-ingenuo", action="store_true", help="no medir el .all() de comparación")
+    args = parser.parse_args()
+
+    print(f"{'citas':>8}  {'streaming pico':>15}  {'ingenuo pico':>13}  {'archivo':>9}  {'tiempo':>7}")
+    for n in args.tamanos:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/export.db")
+            Base.metadata.create_all(engine)
+            sembrar(engine, n)
+
+            pico, tamano, duracion = medir_streaming(engine, args.formato)
+            ingenuo = "-" if args.sin_ingenuo or args.formato != "csv" else f"{medir_ingenuo(engine)[0]:10.1f} MB"
+            engine.dispose()
+
+        print(f"{n:8d}  {pico:12.1f} MB  {ingenuo:>13}  {tamano / 2**20:6.1f} MB  {duracion:6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
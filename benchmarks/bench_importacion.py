@@ -0,0 +1,137 @@
+"""
+Perfil de arranque de la app (`python -X importtime -c "import main"`).
+
+Corre N procesos nuevos y reporta la mediana de:
+  - el tiempo total de `import main`,
+  - el de `preparar_esquema` en modo "verificar" (lo que hace cada worker
+    en el startup), sobre una BD SQLite temporal ya migrada,
+  - los módulos con más tiempo acumulado (los de la app y las dependencias),
+  - el tiempo propio agrupado por paquete de primer nivel.
+
+    python benchmarks/bench_importacion.py --repeticiones 5 --top 25
+    python benchmarks/bench_importacion.py --modulo routers.personal
+
+Sirve para ver qué se carga al arrancar un worker y vigilar que las
+dependencias pesadas (alembic, passlib, Pillow, smtplib/email) sigan
+difiriéndose hasta su primer uso (también durante preparar_esquema).
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+_LINEA = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+_ESQUEMA = re.compile(r"^preparar_esquema: (\d+)$")
+
+# Lo que hace main.py en el startup de cada worker
+PREPARAR = """
+import time
+t = time.perf_counter()
+from database.session import engine
+from database.esquema import preparar_esquema
+preparar_esquema(engine, "verificar")
+import sys
+print(f"preparar_esquema: {int((time.perf_counter() - t) * 1e6)}", file=sys.stderr)
+"""
+
+# Se cargan solo cuando se usan: si aparecen, algo volvió a importarlas al arrancar
+DIFERIDOS = ("alembic", "passlib", "PIL", "smtplib", "utils.email_notificaciones", "utils.smtp_pool")
+
+
+def _bd_migrada(env: dict) -> str:
+    """BD SQLite temporal en la última versión, para que "verificar" pase."""
+    url = f"sqlite:///{tempfile.mkdtemp()}/arranque.db"
+    subprocess.run(
+        [sys.executable, "-c",
+         "import sys; from sqlalchemy import create_engine; from database.esquema import migrar; "
+         "migrar(create_engine(sys.argv[1]))", url],
+        cwd=RAIZ, env=env, check=True,
+    )
+    return url
+
+
+def _perfil(modulo: str, env: dict, esquema: bool) -> tuple[dict[str, int], dict[str, int], int, int]:
+    codigo = f"import {modulo}" + (PREPARAR if esquema else "")
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+
+    propio, acumulado, total, preparar = {}, {}, 0, 0
+    for linea in salida.splitlines():
+        if coincidencia := _ESQUEMA.match(linea):
+            preparar = int(coincidencia.group(1))
+            continue
+        coincidencia = _LINEA.match(linea)
+        if not coincidencia:
+            continue
+        self_us, acum_us, sangria, nombre = coincidencia.groups()
+        propio[nombre] = int(self_us)
+        acumulado[nombre] = int(acum_us)
+        if nombre == modulo and not sangria:
+            total = int(acum_us)
+    return propio, acumulado, total, preparar
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modulo", default="main")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--sin-esquema", action="store_true", help="no medir preparar_esquema")
+    args = parser.parse_args()
+
+    env = dict(os.environ, OUTBOX_HABILITADO="false", RECORDATORIOS_HABILITADO="false")
+    esquema = not args.sin_esquema
+    if esquema:
+        env.update(DATABASE_URL=_bd_migrada(env), DB_ESQUEMA_MODO="verificar")
+
+    totales, preparaciones = [], []
+    acumulados: dict[str, list[int]] = defaultdict(list)
+    por_paquete: dict[str, list[int]] = defaultdict(list)
+    cargados: set[str] = set()
+
+    for _ in range(args.repeticiones):
+        propio, acumulado, total, preparar = _perfil(args.modulo, env, esquema)
+        totales.append(total)
+        preparaciones.append(preparar)
+        cargados |= set(propio)
+        for nombre, us in acumulado.items():
+            acumulados[nombre].append(us)
+        paquetes: dict[str, int] = defaultdict(int)
+        for nombre, us in propio.items():
+            paquetes[nombre.split(".")[0]] += us
+        for paquete, us in paquetes.items():
+            por_paquete[paquete].append(us)
+
+    print(f"import {args.modulo}: p50 {statistics.median(totales) / 1000:.1f} ms "
+          f"(min {min(totales) / 1000:.1f}, max {max(totales) / 1000:.1f}) en {args.repeticiones} procesos")
+    if esquema:
+        print(f"preparar_esquema (verificar): p50 {statistics.median(preparaciones) / 1000:.1f} ms "
+              f"(max {max(preparaciones) / 1000:.1f})")
+    print()
+
+    print(f"Top {args.top} módulos por tiempo acumulado (ms):")
+    top = sorted(acumulados.items(), key=lambda x: statistics.median(x[1]), reverse=True)
+    for nombre, valores in [t for t in top if t[0] != args.modulo][:args.top]:
+        print(f"  {statistics.median(valores) / 1000:8.1f}  {nombre}")
+
+    print(f"\nTop {args.top} paquetes por tiempo propio (ms):")
+    for paquete, valores in sorted(por_paquete.items(), key=lambda x: statistics.median(x[1]), reverse=True)[:args.top]:
+        print(f"  {statistics.median(valores) / 1000:8.1f}  {paquete}")
+
+    presentes = [m for m in DIFERIDOS if m in cargados]
+    print("\nMódulos diferidos cargados al arrancar:", ", ".join(presentes) or "ninguno")
+    if presentes:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
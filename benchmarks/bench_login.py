@@ -0,0 +1,79 @@
+"""
+Benchmark de /auth/login bajo carga concurrente.
+
+Uso (con la API corriendo, p. ej. `uvicorn main:app --workers 2`):
+
+    python benchmarks/bench_login.py --url http://127.0.0.1:8000 \\
+        --correo admin@ejemplo.com --contrasena secreto \\
+        --concurrencia 20 --total 400
+
+Reporta logins/s y latencias p50/p95/p99 por código de respuesta.
+Para medir el costo de bcrypt, arrancar la API con límites altos
+(LOGIN_LIMITE_POR_CORREO / LOGIN_LIMITE_POR_IP) o simular varias IPs con
+--ips (vía X-Forwarded-For; uvicorn con --forwarded-allow-ips='*').
+Con los límites por defecto se ve al limitador responder 429 sin tocar bcrypt.
+Requiere httpx.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+
+async def _trabajador(cliente, args, cola, resultados):
+    while True:
+        try:
+            i = cola.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        headers = {"X-Forwarded-For": f"10.0.{(i % args.ips) // 256}.{(i % args.ips) % 256}"}
+        inicio = time.perf_counter()
+        r = await cliente.post(
+            "/auth/login",
+            json={"correo": args.correo, "contrasena": args.contrasena},
+            headers=headers,
+        )
+        resultados.append((r.status_code, time.perf_counter() - inicio))
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--correo", required=True)
+    parser.add_argument("--contrasena", required=True)
+    parser.add_argument("--concurrencia", type=int, default=10)
+    parser.add_argument("--total", type=int, default=200)
+    parser.add_argument("--ips", type=int, default=1, help="IPs de origen simuladas vía X-Forwarded-For")
+    args = parser.parse_args()
+
+    cola: asyncio.Queue = asyncio.Queue()
+    for i in range(args.total):
+        cola.put_nowait(i)
+
+    resultados: list[tuple[int, float]] = []
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as cliente:
+        inicio = time.perf_counter()
+        await asyncio.gather(*[
+            _trabajador(cliente, args, cola, resultados) for _ in range(args.concurrencia)
+        ])
+        duracion = time.perf_counter() - inicio
+
+    print(f"{len(resultados)} peticiones en {duracion:.2f}s -> {len(resultados) / duracion:.1f} req/s")
+    for codigo, n in sorted(Counter(c for c, _ in resultados).items()):
+        latencias = [t * 1000 for c, t in resultados if c == codigo]
+        print(
+            f"  {codigo}: {n:5d}  p50={statistics.median(latencias):7.1f}ms"
+            f"  p95={_percentil(latencias, 95):7.1f}ms  p99={_percentil(latencias, 99):7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
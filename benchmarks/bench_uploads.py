@@ -0,0 +1,114 @@
+"""
+Benchmark del guardado de archivos subidos.
+
+Compara la copia anterior (shutil.copyfileobj dentro del event loop) con
+el camino de routers/personal.py: utils.almacen.recibir_blob (bloques +
+SHA-256 en el threadpool) y luego registrar_blob + commit en un solo
+hilo. Reporta throughput en MB/s y el retraso máximo que sufre el event
+loop mientras se guarda, medido con un "latido" cada 5 ms.
+
+Corre en un directorio temporal (uploads/blobs es relativo) con una BD
+SQLite temporal para archivos_blob:
+
+    python benchmarks/bench_uploads.py --mb 20 --repeticiones 5
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import UploadFile  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+
+from database.base import Base  # noqa: E402
+from database.esquema import importar_modelos  # noqa: E402
+
+importar_modelos()
+
+
+async def _latido(detener: asyncio.Event, retrasos: list[float]):
+    while not detener.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(0.005)
+        retrasos.append(time.perf_counter() - inicio - 0.005)
+
+
+def _upload(mb: int) -> UploadFile:
+    archivo = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    archivo.write(os.urandom(mb * 1024 * 1024))
+    archivo.seek(0)
+    return UploadFile(archivo, filename="cv.pdf", size=mb * 1024 * 1024)
+
+
+async def _copia_bloqueante(file: UploadFile, i: int, _max_bytes: int):
+    with Path(f"bloqueante_{i}.bin").open("wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+
+def _almacen(Sesion):
+    from utils.almacen import recibir_blob, registrar_blob
+
+    async def guardar(file: UploadFile, _i: int, max_bytes: int):
+        recibido = await recibir_blob(file, max_bytes)
+
+        def registrar():
+            with Sesion() as db:
+                ruta = registrar_blob(db, recibido)
+                db.commit()
+            return ruta
+
+        return await run_in_threadpool(registrar)
+
+    return guardar
+
+
+async def _medir(nombre: str, guardar, mb: int, repeticiones: int):
+    duraciones, peor_retraso = [], 0.0
+    for i in range(repeticiones):
+        file = _upload(mb)
+        detener, retrasos = asyncio.Event(), []
+        latido = asyncio.create_task(_latido(detener, retrasos))
+        await asyncio.sleep(0.02)
+
+        inicio = time.perf_counter()
+        await guardar(file, i, (mb + 1) * 1024 * 1024)
+        duraciones.append(time.perf_counter() - inicio)
+
+        detener.set()
+        await latido
+        peor_retraso = max(peor_retraso, max(retrasos, default=0.0))
+        file.file.close()
+
+    promedio = sum(duraciones) / len(duraciones)
+    print(
+        f"{nombre:12s} {mb / promedio:8.1f} MB/s   "
+        f"retraso máx. del event loop: {peor_retraso * 1000:7.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        engine = create_engine(f"sqlite:///{tmp}/uploads.db")
+        Base.metadata.create_all(engine)
+
+        await _medir("bloqueante", _copia_bloqueante, args.mb, args.repeticiones)
+        await _medir("almacen", _almacen(sessionmaker(bind=engine)), args.mb, args.repeticiones)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,322 @@
+"""
+Prueba de punta a punta del outbox de correos contra un servidor SMTP local.
+
+Levanta un servidor SMTP de prueba (stdlib, en un hilo; guarda lo recibido
+en memoria), crea una BD SQLite temporal con las migraciones y llama a
+utils.correos_outbox.procesar_lote tal cual. Verifica:
+
+  - cada correo sale una sola vez y queda "enviado";
+  - un destinatario rechazado (550) se reintenta con backoff sin afectar al resto;
+  - un recordatorio de una cita cancelada o reprogramada se descarta sin enviarse;
+  - las citas con estado NULL sí reciben recordatorio;
+  - si la BD falla a mitad del lote, lo ya registrado no se reenvía y lo
+    demás sale cuando vence el plazo de envío.
+
+Y sobre utils.smtp_pool: una sesión cortada antes del MAIL FROM se
+reconecta y envía una vez; un corte después de DATA o un 550 no se
+reintentan (no duplican correos).
+
+    python benchmarks/prueba_outbox.py
+
+Termina con exit 1 si alguna verificación falla.
+"""
+import os
+import re
+import socketserver
+import sys
+import tempfile
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from datetime import time as hora
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# ===========================================================
+# 📡 Servidor SMTP de prueba
+# ===========================================================
+class _ManejadorSMTP(socketserver.StreamRequestHandler):
+    def _responder(self, linea: str):
+        self.wfile.write(f"{linea}\r\n".encode())
+
+    def handle(self):
+        servidor: ServidorSMTPPrueba = self.server
+        self._responder("220 prueba ESMTP")
+        remitente, destinatarios = None, []
+        while linea := self.rfile.readline():
+            comando = linea.decode("utf-8", "replace").strip()
+            verbo = comando[:4].upper()
+            if verbo in ("EHLO", "HELO"):
+                self._responder("250 prueba")
+            elif verbo == "MAIL":
+                if servidor.cortar == "mail":
+                    # Como un servidor que cerró la sesión ociosa
+                    servidor.cortar = None
+                    return
+                remitente, destinatarios = comando, []
+                self._responder("250 OK")
+            elif verbo == "RCPT":
+                correo = re.search(r"<([^>]*)>", comando).group(1)
+                if correo in servidor.rechazar:
+                    self._responder("550 Buzón no disponible")
+                else:
+                    destinatarios.append(correo)
+                    self._responder("250 OK")
+            elif verbo == "DATA":
+                self._responder("354 Terminar con .")
+                datos = []
+                while (parte := self.rfile.readline()) not in (b".\r\n", b""):
+                    datos.append(parte)
+                with servidor.lock:
+                    servidor.mensajes.append((remitente, list(destinatarios), b"".join(datos)))
+                if servidor.cortar == "data":
+                    # Recibido, pero el cliente no ve la respuesta (timeout tras DATA)
+                    servidor.cortar = None
+                    return
+                self._responder("250 OK")
+            elif verbo in ("RSET", "NOOP"):
+                self._responder("250 OK")
+            elif verbo == "QUIT":
+                self._responder("221 Adiós")
+                return
+            else:
+                self._responder("502 No implementado")
+
+
+class ServidorSMTPPrueba(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _ManejadorSMTP)
+        self.lock = threading.Lock()
+        self.mensajes: list[tuple[str, list[str], bytes]] = []
+        self.rechazar: set[str] = set()
+        self.cortar: str | None = None   # "mail" | "data": cortar una vez en ese punto
+
+    def por_destinatario(self) -> Counter:
+        with self.lock:
+            return Counter(d for _, destinatarios, _ in self.mensajes for d in destinatarios)
+
+    def limpiar(self):
+        with self.lock:
+            self.mensajes.clear()
+
+
+# ===========================================================
+# 🧪 Escenarios
+# ===========================================================
+class Verificacion:
+    def __init__(self):
+        self.fallas = 0
+
+    def __call__(self, descripcion: str, condicion: bool, detalle=""):
+        print(f"[{'ok' if condicion else 'FALLA':5s}] {descripcion}" + ("" if condicion else f": {detalle}"))
+        self.fallas += not condicion
+
+
+def main():
+    smtp = ServidorSMTPPrueba()
+    threading.Thread(target=smtp.serve_forever, daemon=True).start()
+
+    # Antes de importar config.settings: el pool SMTP lee estos valores
+    os.environ.update({
+        "SMTP_HOST": "127.0.0.1", "SMTP_PORT": str(smtp.server_address[1]),
+        "SMTP_STARTTLS": "false", "SMTP_USER": "", "SMTP_PASSWORD": "",
+        "SMTP_FROM_EMAIL": "citas@prueba.local", "SMTP_TIMEOUT_SEGUNDOS": "5",
+    })
+
+    from sqlalchemy import create_engine, insert, update
+    from sqlalchemy.orm import Session
+
+    from database.esquema import importar_modelos, migrar
+    importar_modelos()
+
+    import utils.correos_outbox as outbox
+    from utils.recordatorios import programar_recordatorios
+    from models.citas import Cita
+    from models.correos_outbox import CorreoOutbox
+    from models.personal import Personal
+    from models.roles import Rol
+    from models.usuarios import Usuario
+
+    verificar = Verificacion()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/outbox.db")
+        migrar(engine)
+
+        # Una cita por terapeuta: cada correo tiene un destinatario distinto
+        n = 6
+        correo = lambda i: f"terapeuta{i}@prueba.local"  # noqa: E731
+        with engine.begin() as conn:
+            conn.execute(insert(Rol), [{"id_rol": 1, "nombre_rol": "Terapeuta"}])
+            conn.execute(insert(Usuario), [{"id_usuario": i, "nombre": f"Terapeuta{i}", "correo": correo(i),
+                                            "contrasena_hash": "x", "id_rol": 1} for i in range(1, n + 1)])
+            conn.execute(insert(Personal), [{"id_personal": i, "id_usuario": i} for i in range(1, n + 1)])
+            conn.execute(insert(Cita), [{"id_cita": i, "id_personal": i, "nombre_nino_libre": f"Niño {i}",
+                                         "fecha": date.today() + timedelta(days=1), "hora": hora(10),
+                                         "estado": "Programada"} for i in range(1, n + 1)])
+
+        def encolar(ids: list[int], evento: str = "cita_creada"):
+            with Session(engine) as db:
+                for id_cita in ids:
+                    outbox.encolar_correo(db, id_cita, evento)
+                db.commit()
+
+        def procesar() -> int:
+            with Session(engine) as db:
+                return outbox.procesar_lote(db)
+
+        def estados() -> Counter:
+            with Session(engine) as db:
+                return Counter(e for (e,) in db.query(CorreoOutbox.estado))
+
+        def vaciar_outbox():
+            with engine.begin() as conn:
+                conn.execute(CorreoOutbox.__table__.delete())
+            smtp.limpiar()
+
+        # 1. Envío normal
+        encolar([1, 2, 3])
+        procesar()
+        procesar()
+        enviados = smtp.por_destinatario()
+        verificar("cada correo sale una vez", enviados == Counter({correo(1): 1, correo(2): 1, correo(3): 1}),
+                  enviados)
+        verificar("todos quedan 'enviado'", estados() == Counter({"enviado": 3}), estados())
+        vaciar_outbox()
+
+        # 2. Destinatario rechazado: reintento con backoff, el resto sale
+        smtp.rechazar = {correo(2)}
+        encolar([1, 2, 3])
+        procesar()
+        smtp.rechazar = set()
+        with Session(engine) as db:
+            rechazado = db.query(CorreoOutbox).filter(CorreoOutbox.id_cita == 2).one()
+        verificar("el rechazado vuelve a 'pendiente' con un intento",
+                  (rechazado.estado, rechazado.intentos) == ("pendiente", 1),
+                  (rechazado.estado, rechazado.intentos))
+        verificar("el rechazado espera su backoff", rechazado.proximo_intento > datetime.now(),
+                  rechazado.proximo_intento)
+        enviados = smtp.por_destinatario()
+        verificar("los demás se envían una vez", enviados == Counter({correo(1): 1, correo(3): 1}), enviados)
+        vaciar_outbox()
+
+        # 3. Recordatorio de una cita cancelada
+        with engine.begin() as conn:
+            conn.execute(update(Cita).where(Cita.id_cita == 4).values(estado="Cancelada"))
+        encolar([4], "recordatorio_24h")
+        procesar()
+        verificar("recordatorio de cita cancelada descartado sin enviar",
+                  estados() == Counter({"descartado": 1}) and not smtp.por_destinatario(), estados())
+        vaciar_outbox()
+
+        # 3b. Recordatorio de una cita reprogramada después de encolarlo; una
+        # cita con estado NULL sí recibe el suyo
+        manana = datetime.combine(date.today() + timedelta(days=1), hora(10))
+        with engine.begin() as conn:
+            conn.execute(update(Cita).where(Cita.id_cita == 5).values(estado=None))
+        with Session(engine) as db:
+            encolados = programar_recordatorios(db, ahora=manana - timedelta(hours=1))
+        verificar("cita con estado NULL recibe recordatorio", encolados == 5, encolados)
+        with engine.begin() as conn:
+            conn.execute(update(Cita).where(Cita.id_cita == 6).values(hora=hora(12)))
+        procesar()
+        with Session(engine) as db:
+            reprogramado = db.query(CorreoOutbox).filter(CorreoOutbox.id_cita == 6).one()
+        enviados = smtp.por_destinatario()
+        verificar("recordatorio de cita reprogramada descartado sin enviar",
+                  reprogramado.estado == "descartado" and correo(6) not in enviados, reprogramado.ultimo_error)
+        verificar("los demás recordatorios salen", enviados[correo(5)] == 1 and enviados[correo(1)] == 1, enviados)
+        with engine.begin() as conn:
+            conn.execute(update(Cita).where(Cita.id_cita.in_((5, 6))).values(estado="Programada", hora=hora(10)))
+        vaciar_outbox()
+
+        # 4. La BD falla a mitad del lote (al registrar el 3er resultado)
+        registrar = outbox._registrar
+        registros = 0
+
+        def registrar_con_falla(db, id_correo, **valores):
+            nonlocal registros
+            registros += 1
+            if registros == 3:
+                raise RuntimeError("falla simulada de la BD")
+            registrar(db, id_correo, **valores)
+
+        encolar([1, 2, 3, 5, 6])
+        outbox._registrar = registrar_con_falla
+        try:
+            procesar()
+            verificar("la falla simulada se propaga", False)
+        except RuntimeError:
+            pass
+        finally:
+            outbox._registrar = registrar
+        verificar("lo registrado antes de la falla se conserva",
+                  estados() == Counter({"enviado": 2, "enviando": 3}), estados())
+        verificar("con el plazo vigente nada se vuelve a reclamar", procesar() == 0)
+
+        # Vence el plazo de envío: el resto se reclama de nuevo
+        with engine.begin() as conn:
+            conn.execute(update(CorreoOutbox).where(CorreoOutbox.estado == "enviando")
+                         .values(proximo_intento=datetime.now() - timedelta(seconds=1)))
+        procesar()
+        enviados = smtp.por_destinatario()
+        verificar("los ya registrados no se reenvían", enviados[correo(1)] == 1 and enviados[correo(2)] == 1,
+                  enviados)
+        verificar("los no enviados salen al vencer el plazo", enviados[correo(5)] == 1 and enviados[correo(6)] == 1,
+                  enviados)
+        # El que estaba en vuelo al fallar la BD sale dos veces: al menos una vez, no exactamente una
+        verificar("el que estaba en vuelo sale de nuevo", enviados[correo(3)] == 2, enviados)
+        verificar("todos quedan 'enviado'", estados() == Counter({"enviado": 5}), estados())
+
+        engine.dispose()
+
+    # 5. Pool SMTP: cuándo reintenta y cuándo no
+    import smtplib
+    from utils.smtp_pool import PoolSMTP
+
+    pool = PoolSMTP(1)
+    conexion = pool.estadisticas
+    mensaje = "Subject: prueba\r\n\r\nhola"
+
+    smtp.limpiar()
+    pool.enviar("citas@prueba.local", [correo(1)], mensaje)
+    smtp.cortar = "mail"
+    pool.enviar("citas@prueba.local", [correo(1)], mensaje)
+    verificar("sesión cortada antes de MAIL FROM: reconecta y envía una vez",
+              smtp.por_destinatario()[correo(1)] == 2 and conexion()[0]["reconexiones"] == 1, conexion())
+
+    smtp.limpiar()
+    smtp.cortar = "data"
+    try:
+        pool.enviar("citas@prueba.local", [correo(2)], mensaje)
+        verificar("corte tras DATA se reporta al outbox", False)
+    except smtplib.SMTPServerDisconnected:
+        pass
+    verificar("corte tras DATA no se reenvía", smtp.por_destinatario()[correo(2)] == 1, smtp.por_destinatario())
+
+    pool.enviar("citas@prueba.local", [correo(1)], mensaje)
+    handshakes = conexion()[0]["handshakes"]
+    smtp.rechazar = {correo(3)}
+    try:
+        pool.enviar("citas@prueba.local", [correo(3)], mensaje)
+        verificar("550 se reporta al outbox", False)
+    except smtplib.SMTPRecipientsRefused:
+        pass
+    smtp.rechazar = set()
+    pool.enviar("citas@prueba.local", [correo(4)], mensaje)
+    verificar("550 no reconecta ni reintenta",
+              conexion()[0]["handshakes"] == handshakes and smtp.por_destinatario()[correo(4)] == 1, conexion())
+    pool.cerrar()
+
+    smtp.shutdown()
+    print(f"\n{verificar.fallas} verificación(es) fallida(s)" if verificar.fallas else "\nTodo en orden")
+    sys.exit(1 if verificar.fallas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# core/cache_roles.py
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from config.settings import settings
+from models.roles import Rol
+from models.usuarios import Usuario
+
+
+class UsuarioActual(NamedTuple):
+    """Lo mínimo que necesitan las dependencias de autorización."""
+    id_usuario: int
+    id_rol: int | None
+    nombre_rol: str | None
+    activo: bool
+
+
+# ============================
+# 🧠 CACHE TTL + LRU
+# ============================
+class CacheRoles:
+    def __init__(self, ttl: float, max_items: int):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._datos: OrderedDict[int, tuple[float, UsuarioActual]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, id_usuario: int) -> UsuarioActual | None:
+        with self._lock:
+            item = self._datos.get(id_usuario)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._datos[id_usuario]
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(id_usuario)
+            self.aciertos += 1
+            return item[1]
+
+    def guardar(self, usuario: UsuarioActual):
+        with self._lock:
+            self._datos[usuario.id_usuario] = (time.monotonic() + self.ttl, usuario)
+            self._datos.move_to_end(usuario.id_usuario)
+            while len(self._datos) > self.max_items:
+                self._datos.popitem(last=False)
+
+    def invalidar(self, id_usuario: int | None = None):
+        """Sin id: vacía todo (p. ej. cuando cambia un rol)."""
+        with self._lock:
+            if id_usuario is None:
+                self._datos.clear()
+            else:
+                self._datos.pop(id_usuario, None)
+
+
+cache_roles = CacheRoles(settings.AUTH_CACHE_TTL_SEGUNDOS, settings.AUTH_CACHE_MAX_USUARIOS)
+
+
+def cargar_usuario_actual(db: Session, id_usuario: int) -> UsuarioActual | None:
+    """Usuario + rol en una sola consulta, pasando por el cache."""
+    usuario = cache_roles.obtener(id_usuario)
+    if usuario is not None:
+        return usuario
+
+    fila = (
+        db.query(Usuario.id_usuario, Usuario.id_rol, Rol.nombre_rol, Usuario.activo)
+        .outerjoin(Rol, Rol.id_rol == Usuario.id_rol)
+        .filter(Usuario.id_usuario == id_usuario)
+        .first()
+    )
+    if fila is None:
+        return None
+
+    usuario = UsuarioActual(fila.id_usuario, fila.id_rol, fila.nombre_rol, bool(fila.activo))
+    cache_roles.guardar(usuario)
+    return usuario
+
+
+# ============================
+# 🔄 INVALIDACIÓN
+#   Se anota en la sesión al hacer flush y se invalida al confirmar,
+#   para que una petición concurrente no vuelva a cachear el valor viejo.
+# ============================
+_PENDIENTES = "cache_roles_pendientes"
+
+
+def _marcar(target, id_usuario: int | None):
+    session = object_session(target)
+    if session is None:
+        cache_roles.invalidar(id_usuario)
+        return
+    session.info.setdefault(_PENDIENTES, set()).add(id_usuario)
+
+
+@event.listens_for(Usuario, "after_update")
+@event.listens_for(Usuario, "after_delete")
+def _usuario_modificado(mapper, connection, target):
+    _marcar(target, target.id_usuario)
+
+
+@event.listens_for(Rol, "after_update")
+@event.listens_for(Rol, "after_delete")
+def _rol_modificado(mapper, connection, target):
+    _marcar(target, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_al_confirmar(session):
+    pendientes = session.info.pop(_PENDIENTES, None)
+    if not pendientes:
+        return
+    if None in pendientes:
+        cache_roles.invalidar()
+        return
+    for id_usuario in pendientes:
+        cache_roles.invalidar(id_usuario)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session):
+    session.info.pop(_PENDIENTES, None)
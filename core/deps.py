@@ -1,59 +1,34 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
 
-from database import get_db
-from models.usuarios import Usuario
-from config.settings import settings
-from core.security import ALGORITHM
+from core.security import get_current_user, get_usuario_actual, get_usuario_actual_lectura  # noqa: F401
+from core.cache_roles import UsuarioActual
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# get_current_user (Usuario completo) es el mismo de core/security.py;
+# require_role(solo_lectura=True) usa el camino sin consulta con AUTH_TOKEN_SIN_ESTADO
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Usuario:
-    """
-    📦 Obtiene el usuario autenticado a partir del token JWT.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="No se pudo validar las credenciales.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(Usuario).filter(Usuario.id_usuario == user_id).first()
-    if user is None:
-        raise credentials_exception
-
-    return user
 
-
-def require_role(roles_permitidos: list[str]):
+def require_role(roles_permitidos: list[str], solo_lectura: bool = False):
     """
     🧠 Dependencia que verifica si el usuario tiene uno de los roles permitidos.
+    Usa el cache de roles (core/cache_roles.py) en lugar de cargar current_user.rol.
+    solo_lectura=True: solo en endpoints que no modifican datos.
     """
+    dependencia = get_usuario_actual_lectura if solo_lectura else get_usuario_actual
 
-    def role_checker(
-        current_user: Usuario = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ):
+    def role_checker(current_user: UsuarioActual = Depends(dependencia)):
         if not current_user.id_rol:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="El usuario no tiene un rol asignado."
             )
 
-        rol = current_user.rol.nombre_rol if hasattr(current_user, "rol") else None
+        if not current_user.activo:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="El usuario está inactivo."
+            )
+
+        rol = current_user.nombre_rol
 
         if rol not in roles_permitidos:
             raise HTTPException(
@@ -0,0 +1,72 @@
+# core/logs.py
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Atributos estándar de LogRecord: todo lo demás viene de `extra=`
+_ATRIBUTOS_RECORD = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por evento, con los campos pasados en `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_RECORD:
+                datos[clave] = valor
+        if record.exc_info:
+            datos["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+_listener: QueueListener | None = None
+_handler: logging.Handler | None = None
+
+# Paquetes de la app: desde `nivel`. Todo lo demás (sqlalchemy, passlib,
+# Pillow, ...) pasa por el mismo handler del root, desde WARNING
+PAQUETES_APP = ("auth", "config", "core", "database", "models", "routers", "schemas", "utils", "main")
+
+
+def configurar_logging(nivel: int = logging.INFO):
+    """
+    Un QueueHandler en el root: cualquier logger escribe a una cola y un
+    hilo aparte formatea (JSON) y escribe a stderr, así registrar un evento
+    no bloquea la petición en I/O.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    cola: queue.Queue = queue.Queue(-1)
+    salida = logging.StreamHandler()
+    salida.setFormatter(FormatoJSON())
+
+    _listener = QueueListener(cola, salida, respect_handler_level=True)
+    _listener.start()
+
+    _handler = QueueHandler(cola)
+    logging.getLogger().addHandler(_handler)
+    for nombre in PAQUETES_APP:
+        logging.getLogger(nombre).setLevel(nivel)
+
+
+def detener_logging():
+    """Quita el handler de configurar_logging y vacía la cola (apagado o recarga)."""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    for nombre in PAQUETES_APP:
+        logging.getLogger(nombre).setLevel(logging.NOTSET)
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,89 @@
+# core/pool_hash.py
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from config.settings import settings
+
+
+# ============================
+# 🧵 POOL ACOTADO PARA BCRYPT
+#   bcrypt libera el GIL, así que un pool de hilos basta. El límite de
+#   cola rechaza con 503 en vez de acumular trabajo durante una ráfaga.
+# ============================
+class PoolHash:
+    def __init__(self, workers: int, max_cola: int):
+        self.workers = workers
+        self.max_cola = max_cola
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._cupos = threading.BoundedSemaphore(workers + max_cola)
+        self._lock = threading.Lock()
+
+        # Métricas
+        self.en_curso = 0
+        self.completados = 0
+        self.rechazados = 0
+        self.tiempo_total = 0.0
+        self.espera_total = 0.0
+
+    def _reservar(self):
+        if not self._cupos.acquire(blocking=False):
+            with self._lock:
+                self.rechazados += 1
+            raise HTTPException(503, "Servidor ocupado, intenta de nuevo en unos segundos")
+        with self._lock:
+            self.en_curso += 1
+
+    def _liberar(self):
+        with self._lock:
+            self.en_curso -= 1
+        self._cupos.release()
+
+    def _medir(self, fn, encolado: float, *args):
+        inicio = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            fin = time.perf_counter()
+            with self._lock:
+                self.completados += 1
+                self.espera_total += inicio - encolado
+                self.tiempo_total += fin - inicio
+            self._liberar()
+
+    def _enviar(self, fn, *args) -> Future:
+        """Reserva un cupo y encola; el cupo se devuelve aunque submit falle o se cancele antes de correr."""
+        self._reservar()
+        try:
+            futuro = self._executor.submit(self._medir, fn, time.perf_counter(), *args)
+        except BaseException:
+            self._liberar()
+            raise
+        futuro.add_done_callback(lambda f: f.cancelled() and self._liberar())
+        return futuro
+
+    def ejecutar(self, fn, *args):
+        """Para endpoints `def` (ya corren en el threadpool de Starlette)."""
+        return self._enviar(fn, *args).result()
+
+    async def ejecutar_async(self, fn, *args):
+        """Para endpoints `async def`: no bloquea el event loop."""
+        return await asyncio.wrap_future(self._enviar(fn, *args))
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_cola": self.max_cola,
+                "en_curso": self.en_curso,
+                "completados": self.completados,
+                "rechazados": self.rechazados,
+                "hash_promedio_ms": round(self.tiempo_total * 1000 / self.completados, 2) if self.completados else 0.0,
+                "espera_promedio_ms": round(self.espera_total * 1000 / self.completados, 2) if self.completados else 0.0,
+            }
+
+
+pool_hash = PoolHash(settings.HASH_POOL_WORKERS, settings.HASH_POOL_MAX_COLA)
@@ -0,0 +1,121 @@
+# core/rate_limit.py
+import math
+import threading
+import time
+from collections import deque
+from typing import Protocol
+
+from fastapi import HTTPException
+
+from config.settings import settings
+
+
+# ============================
+# 🧱 BACKEND (pluggable)
+# ============================
+class BackendLimite(Protocol):
+    def espera(self, clave: str, limite: int, ventana: float) -> float:
+        """
+        Sin registrar nada: 0 si quedan intentos en la ventana, o los
+        segundos que faltan para que se libere un lugar.
+        """
+
+    def registrar(self, clave: str, ventana: float):
+        """Registra un intento (fallido) en la ventana."""
+
+    def limpiar(self, clave: str):
+        ...
+
+
+class BackendMemoria:
+    """Ventana deslizante en memoria del proceso (default)."""
+
+    def __init__(self, max_claves: int = 100_000):
+        self.max_claves = max_claves
+        self._intentos: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def espera(self, clave: str, limite: int, ventana: float) -> float:
+        ahora = time.monotonic()
+        with self._lock:
+            intentos = self._intentos.get(clave)
+            if not intentos:
+                return 0.0
+
+            while intentos and intentos[0] <= ahora - ventana:
+                intentos.popleft()
+
+            if len(intentos) >= limite:
+                return intentos[0] + ventana - ahora
+            return 0.0
+
+    def registrar(self, clave: str, ventana: float):
+        ahora = time.monotonic()
+        with self._lock:
+            intentos = self._intentos.get(clave)
+            if intentos is None:
+                if len(self._intentos) >= self.max_claves:
+                    self._purgar(ahora, ventana)
+                intentos = self._intentos[clave] = deque()
+
+            while intentos and intentos[0] <= ahora - ventana:
+                intentos.popleft()
+            intentos.append(ahora)
+
+    def limpiar(self, clave: str):
+        with self._lock:
+            self._intentos.pop(clave, None)
+
+    def _purgar(self, ahora: float, ventana: float):
+        vencidas = [c for c, d in self._intentos.items() if not d or d[-1] <= ahora - ventana]
+        for clave in vencidas:
+            del self._intentos[clave]
+
+
+# ============================
+# 🚦 LIMITADOR DE LOGIN
+#   Solo cuentan los intentos FALLIDOS (por correo y por IP): un login
+#   correcto no gasta la ventana de la IP (p. ej. una oficina detrás de NAT).
+# ============================
+class LimitadorLogin:
+    def __init__(self, backend: BackendLimite, limite_correo: int, limite_ip: int, ventana: float):
+        self.backend = backend
+        self.limite_correo = limite_correo
+        self.limite_ip = limite_ip
+        self.ventana = ventana
+
+    @staticmethod
+    def _clave_correo(correo: str) -> str:
+        return f"correo:{correo.strip().lower()}"
+
+    def verificar(self, correo: str, ip: str | None):
+        """Se llama ANTES de tocar la BD o bcrypt; lanza 429 si excede. No registra nada."""
+        esperas = [self.backend.espera(self._clave_correo(correo), self.limite_correo, self.ventana)]
+        if ip:
+            esperas.append(self.backend.espera(f"ip:{ip}", self.limite_ip, self.ventana))
+
+        espera = max(esperas)
+        if espera > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Demasiados intentos de inicio de sesión. Intenta más tarde.",
+                headers={"Retry-After": str(math.ceil(espera))},
+            )
+
+    def fallo(self, correo: str, ip: str | None):
+        """Correo inexistente o contraseña incorrecta."""
+        self.backend.registrar(self._clave_correo(correo), self.ventana)
+        if ip:
+            self.backend.registrar(f"ip:{ip}", self.ventana)
+
+    def exito(self, correo: str):
+        """Un login correcto reinicia el contador del correo (no el de la IP)."""
+        self.backend.limpiar(self._clave_correo(correo))
+
+
+limitador_login = LimitadorLogin(
+    BackendMemoria(),
+    limite_correo=settings.LOGIN_LIMITE_POR_CORREO,
+    limite_ip=settings.LOGIN_LIMITE_POR_IP,
+    ventana=settings.LOGIN_VENTANA_SEGUNDOS,
+)
@@ -0,0 +1,148 @@
+# core/revocacion_tokens.py
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session, object_session
+
+from config.settings import settings
+from models.roles import Rol
+from models.usuarios import Usuario
+
+
+# ============================
+# 🚫 VERSIONES MÍNIMAS DE TOKEN
+#   Solo guarda usuarios revocados dentro de la vigencia de un token
+#   (token_revocado_en): un token emitido antes de una revocación más
+#   vieja ya expiró, así que el conjunto no crece con el tiempo.
+#   Los usuarios borrados (sin fila que consultar) van a `_eliminados`,
+#   también solo durante la vigencia de un token.
+# ============================
+class RevocacionTokens:
+    def __init__(self, refresco: float, vigencia: timedelta):
+        self.refresco = refresco
+        self.vigencia = vigencia
+        self._minimas: dict[int, int] = {}
+        self._eliminados: dict[int, float] = {}   # id_usuario -> monotonic al detectarlo
+        self._vistos: set[int] = set()            # ids validados desde el último refresco
+        self._ultimo_refresco = 0.0
+        self._lock = threading.Lock()
+
+    def necesita_refresco(self) -> bool:
+        return time.monotonic() - self._ultimo_refresco >= self.refresco
+
+    def refrescar(self, db: Session):
+        """
+        Recarga las versiones desde la BD (una consulta cada
+        AUTH_REVOCACION_REFRESCO_SEGUNDOS) para ver revocaciones
+        hechas por otros workers. Los ids vistos desde el refresco anterior
+        que ya no existen se marcan como eliminados.
+        """
+        filas = (
+            db.query(Usuario.id_usuario, Usuario.version_token)
+            .filter(Usuario.token_revocado_en >= datetime.now() - self.vigencia)
+            .all()
+        )
+        with self._lock:
+            vistos, self._vistos = self._vistos, set()
+        existentes = set()
+        if vistos:
+            existentes = {
+                id_ for (id_,) in db.query(Usuario.id_usuario).filter(Usuario.id_usuario.in_(vistos))
+            }
+
+        ahora = time.monotonic()
+        with self._lock:
+            self._minimas = {f.id_usuario: f.version_token for f in filas}
+            for id_usuario in vistos - existentes:
+                self._eliminados.setdefault(id_usuario, ahora)
+            limite = ahora - self.vigencia.total_seconds()
+            self._eliminados = {i: t for i, t in self._eliminados.items() if t > limite}
+            self._ultimo_refresco = ahora
+
+    def vigente(self, id_usuario: int, version: int) -> bool:
+        if id_usuario in self._eliminados:
+            return False
+        self._vistos.add(id_usuario)
+        return version >= self._minimas.get(id_usuario, 0)
+
+    def revocar(self, id_usuario: int, version: int):
+        with self._lock:
+            if version > self._minimas.get(id_usuario, 0):
+                self._minimas[id_usuario] = version
+
+    def eliminar(self, id_usuario: int):
+        with self._lock:
+            self._eliminados[id_usuario] = time.monotonic()
+
+    def revocar_todo(self):
+        """Fuerza a refrescar en la siguiente petición (p. ej. cambio de rol)."""
+        with self._lock:
+            self._ultimo_refresco = 0.0
+
+
+revocacion_tokens = RevocacionTokens(
+    settings.AUTH_REVOCACION_REFRESCO_SEGUNDOS,
+    timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+)
+
+
+# ============================
+# 🔄 SUBIR VERSIÓN AL CAMBIAR ROL / ACTIVO / CONTRASEÑA (O BORRAR)
+#   Se aplica en este worker al confirmar; los demás lo ven al refrescar.
+# ============================
+_CAMPOS_QUE_REVOCAN = ("id_rol", "activo", "contrasena_hash")
+_PENDIENTES = "tokens_revocados_pendientes"
+
+
+@event.listens_for(Usuario, "before_update")
+def _subir_version_usuario(mapper, connection, target):
+    atributos = inspect(target).attrs
+    if any(atributos[campo].history.has_changes() for campo in _CAMPOS_QUE_REVOCAN):
+        target.version_token = (target.version_token or 0) + 1
+        target.token_revocado_en = datetime.now()
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_PENDIENTES, {})[target.id_usuario] = target.version_token
+
+
+@event.listens_for(Usuario, "after_delete")
+def _revocar_usuario_eliminado(mapper, connection, target):
+    # None = eliminado (ver _aplicar_revocaciones)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDIENTES, {})[target.id_usuario] = None
+
+
+@event.listens_for(Rol, "after_update")
+@event.listens_for(Rol, "after_delete")
+def _subir_version_rol(mapper, connection, target):
+    # El nombre del rol viaja en el token: se revoca a todos los que lo tienen
+    connection.execute(
+        update(Usuario)
+        .where(Usuario.id_rol == target.id_rol)
+        .values(version_token=Usuario.version_token + 1, token_revocado_en=datetime.now())
+    )
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDIENTES, {})[None] = 0
+
+
+@event.listens_for(Session, "after_commit")
+def _aplicar_revocaciones(session):
+    pendientes = session.info.pop(_PENDIENTES, None)
+    if not pendientes:
+        return
+    for id_usuario, version in pendientes.items():
+        if id_usuario is None:
+            revocacion_tokens.revocar_todo()
+        elif version is None:
+            revocacion_tokens.eliminar(id_usuario)
+        else:
+            revocacion_tokens.revocar(id_usuario, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_revocaciones(session):
+    session.info.pop(_PENDIENTES, None)
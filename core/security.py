@@ -1,21 +1,38 @@
 # core/security.py
 from datetime import datetime, timedelta
+from functools import cache
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from database.session import get_db
 from models.usuarios import Usuario
-from models.roles import Rol
 from config.settings import settings
+from core.cache_roles import UsuarioActual, cargar_usuario_actual
+from core.revocacion_tokens import revocacion_tokens
+from core.pool_hash import pool_hash
 
 # ============================
 # 🔐 CONFIGURACIÓN
 # ============================
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib se importa en el primer uso (login / alta de usuario), no al
+# arrancar el worker. min/max = default: si cambia BCRYPT_ROUNDS, los
+# hashes viejos se marcan para actualizar y se re-hashean en el siguiente login
+@cache
+def pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -23,10 +40,18 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 # 🔑 HASH CONTRASEÑA
 # ============================
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return pwd_context().verify(plain, hashed)
+
+# Versiones que corren en el pool acotado de bcrypt (core/pool_hash.py)
+async def hash_password_async(password: str) -> str:
+    return await pool_hash.ejecutar_async(pwd_context().hash, password)
+
+def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """(válida, hash nuevo si la política de costo cambió)"""
+    return pool_hash.ejecutar(pwd_context().verify_and_update, plain, hashed)
 
 # ============================
 # 🔑 CREAR TOKEN
@@ -38,47 +63,118 @@ def create_access_token(data: dict, expires: timedelta | None = None):
 
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
 
+
+def claims_usuario(user: Usuario) -> dict:
+    """
+    Rol, estado y versión del token para el modo AUTH_TOKEN_SIN_ESTADO.
+    """
+    return {
+        "sub": str(user.id_usuario),
+        "id_rol": user.id_rol,
+        "rol": user.rol.nombre_rol if user.rol else None,
+        "act": bool(user.activo),
+        "ver": user.version_token or 0,
+    }
+
 # ============================
 # 👤 USUARIO ACTUAL
 # ============================
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    cred_exc = HTTPException(
+def _credenciales_invalidas() -> HTTPException:
+    return HTTPException(
         status_code=401,
         detail="Token inválido",
         headers={"WWW-Authenticate": "Bearer"}
     )
 
+
+def _decodificar_token(token: str) -> tuple[int, dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
         if not user_id:
-            raise cred_exc
-    except JWTError:
-        raise cred_exc
+            raise _credenciales_invalidas()
+        return int(user_id), payload
+    except (JWTError, ValueError):
+        raise _credenciales_invalidas()
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    user_id, _ = _decodificar_token(token)
 
-    user = db.query(Usuario).filter(Usuario.id_usuario == int(user_id)).first()
+    user = db.query(Usuario).filter(Usuario.id_usuario == user_id).first()
     if not user:
-        raise cred_exc
+        raise _credenciales_invalidas()
 
     return user
 
+
+def get_usuario_actual(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> UsuarioActual:
+    """
+    Versión ligera de get_current_user para autorización: id, rol y activo
+    desde el cache (cero consultas si ya está cacheado).
+    """
+    user_id, _ = _decodificar_token(token)
+
+    usuario = cargar_usuario_actual(db, user_id)
+    if not usuario:
+        raise _credenciales_invalidas()
+
+    return usuario
+
+
+def get_usuario_actual_lectura(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> UsuarioActual:
+    """
+    Para endpoints de solo lectura: con AUTH_TOKEN_SIN_ESTADO se confía en
+    los claims firmados del token y solo se va a la BD si su versión quedó
+    revocada (o el token no trae claims).
+    """
+    user_id, payload = _decodificar_token(token)
+
+    if settings.AUTH_TOKEN_SIN_ESTADO and "ver" in payload:
+        if revocacion_tokens.necesita_refresco():
+            revocacion_tokens.refrescar(db)
+
+        if revocacion_tokens.vigente(user_id, payload["ver"]):
+            return UsuarioActual(
+                id_usuario=user_id,
+                id_rol=payload.get("id_rol"),
+                nombre_rol=payload.get("rol"),
+                activo=bool(payload.get("act")),
+            )
+
+    usuario = cargar_usuario_actual(db, user_id)
+    if not usuario:
+        raise _credenciales_invalidas()
+
+    return usuario
+
 # ============================
 # 🔒 VALIDACIÓN DE ROLES
 # ============================
-def require_role(roles: list[str] | None = None):
-    def checker(
-        current_user: Usuario = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ):
-        rol = db.query(Rol).filter(Rol.id_rol == current_user.id_rol).first()
-
-        if not rol:
+def require_role(roles: list[str] | None = None, solo_lectura: bool = False):
+    """
+    solo_lectura=True permite el camino sin consulta de get_usuario_actual_lectura;
+    usarlo solo en endpoints que no modifican datos.
+    """
+    dependencia = get_usuario_actual_lectura if solo_lectura else get_usuario_actual
+
+    def checker(current_user: UsuarioActual = Depends(dependencia)):
+        if not current_user.activo:
+            raise HTTPException(403, "Usuario inactivo")
+
+        if not current_user.nombre_rol:
             raise HTTPException(403, "El usuario no tiene rol asignado")
 
-        if roles and rol.nombre_rol not in roles:
+        if roles and current_user.nombre_rol not in roles:
             raise HTTPException(
                 status_code=403,
                 detail=f"Acceso denegado. Rol requerido: {roles}"
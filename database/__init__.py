@@ -1,2 +1,2 @@
 # database/__init__.py
-from .session import get_db, engine, SessionLocal
+from .session import get_db, get_db_lectura, engine, SessionLocal
@@ -0,0 +1,58 @@
+# database/async_session.py
+# Solo se importa con DB_ASYNC=true: requiere sqlalchemy[asyncio] y el driver async.
+from fastapi import Request
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import settings
+from database.replicas import SesionRuteada
+from database.session import _opciones_pool, enrutador_replicas, leer_del_primario
+
+# Driver async equivalente al de DATABASE_URL
+_DRIVERS_ASYNC = {"mysql": "mysql+asyncmy", "sqlite": "sqlite+aiosqlite"}
+
+
+def url_async(url: str) -> str:
+    u = make_url(url)
+    drivername = _DRIVERS_ASYNC.get(u.get_backend_name(), u.drivername)
+    return u.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+_url = settings.DATABASE_ASYNC_URL or url_async(settings.DATABASE_URL)
+
+engine_async = create_async_engine(_url, **_opciones_pool(_url, medir=False))
+# Sin expire_on_commit: los objetos se serializan después del commit sin volver a la BD.
+# SesionRuteada: las sesiones de lectura usan la réplica de info["replica"]
+AsyncSessionLocal = async_sessionmaker(
+    engine_async, class_=AsyncSession, sync_session_class=SesionRuteada, expire_on_commit=False, autoflush=False,
+)
+
+# Un engine async por réplica; la salud y el retraso los decide el mismo
+# enrutador de get_db_lectura (con sus engines síncronos)
+_replicas_async: dict[Engine, AsyncEngine] = {
+    r.engine: create_async_engine(url_async(r.url), **_opciones_pool(r.url, medir=False))
+    for r in enrutador_replicas.replicas
+}
+
+
+async def get_db_async():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_db_lectura_async(request: Request):
+    """Como get_db_lectura: réplica sana salvo que el cliente haya escrito hace poco."""
+    async with AsyncSessionLocal() as db:
+        if enrutador_replicas.activo and not leer_del_primario(request):
+            # elegir() puede medir el retraso de una réplica: fuera del event loop
+            replica = await run_in_threadpool(enrutador_replicas.elegir)
+            if replica is not None:
+                db.sync_session.info["replica"] = _replicas_async[replica].sync_engine
+        yield db
+
+
+async def cerrar_engines_async():
+    await engine_async.dispose()
+    for engine in _replicas_async.values():
+        await engine.dispose()
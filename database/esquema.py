@@ -0,0 +1,94 @@
+# database/esquema.py
+import importlib
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from config.settings import settings
+from database.base import Base
+from migraciones.cabeza import CABEZA
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Necesario para que Base.metadata conozca TODAS las tablas (env.py / modo "crear")
+MODELOS = (
+    "models.usuarios",
+    "models.roles",
+    "models.personal",
+    "models.ninos",
+    "models.tutores",
+    "models.terapias",
+    "models.citas",
+    "models.citas_resumen",
+    "models.ninos_prospecto",
+    "models.cita_tipos",
+    "models.correos_outbox",
+    "models.archivos_blob",
+    "models.grados_academicos",
+    "models.permisos",
+)
+
+
+def importar_modelos():
+    for modulo in MODELOS:
+        importlib.import_module(modulo)
+
+
+def config_alembic():
+    # Alembic tarda más en importarse que el resto de la app: se carga
+    # dentro de las funciones que lo usan (arranque / migraciones), no al importar
+    from alembic.config import Config
+
+    cfg = Config(str(RAIZ / "alembic.ini"))
+    cfg.set_main_option("script_location", str(RAIZ / "migraciones"))
+    return cfg
+
+
+def migrar(engine: Engine, revision: str = "head"):
+    """`alembic upgrade` sobre `engine` (no necesariamente el de DATABASE_URL)."""
+    from alembic import command
+
+    cfg = config_alembic()
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, revision)
+
+
+def versiones_actuales(engine: Engine) -> set[str]:
+    """
+    Versiones en alembic_version; vacío si la BD nunca se migró. Un error
+    de conexión se propaga: una caída no es "esquema sin versión".
+    """
+    with engine.connect() as conn:
+        if not inspect(conn).has_table("alembic_version"):
+            return set()
+        return set(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+
+
+def preparar_esquema(engine: Engine, modo: str | None = None):
+    """
+    Al arrancar cada worker:
+      - "verificar" (default): solo compara la versión de la BD con la última
+        migración; no toca tablas. Las migraciones se aplican antes del
+        despliegue con `alembic upgrade head`.
+      - "migrar": aplica las migraciones pendientes (un solo proceso).
+      - "crear": create_all como antes (desarrollo local / SQLite).
+    """
+    modo = modo or settings.DB_ESQUEMA_MODO
+
+    if modo == "crear":
+        importar_modelos()
+        Base.metadata.create_all(bind=engine)
+    elif modo == "migrar":
+        migrar(engine)
+    elif modo == "verificar":
+        # Contra la constante de migraciones/cabeza.py: sin importar Alembic en cada worker
+        actuales = versiones_actuales(engine)
+        if actuales != {CABEZA}:
+            raise RuntimeError(
+                f"Esquema de la BD en versión {sorted(actuales) or None}, se esperaba {CABEZA}: "
+                "ejecutar `alembic upgrade head`"
+            )
+    else:
+        raise ValueError(f"DB_ESQUEMA_MODO inválido: {modo!r}")
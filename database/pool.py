@@ -0,0 +1,151 @@
+# database/pool.py
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+class EstadisticasPool:
+    """
+    Contadores del pool de conexiones, alimentados por los eventos de
+    SQLAlchemy (connect/checkout/checkin/invalidate) y por QueuePoolMedido
+    (tiempo hasta obtener una conexión).
+    """
+
+    def __init__(self, muestras: int = 1000):
+        self._lock = threading.Lock()
+        self._esperas: deque[float] = deque(maxlen=muestras)
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self.conexiones_creadas = 0
+            self.checkouts = 0
+            self.checkouts_overflow = 0
+            self.checkins = 0
+            self.invalidaciones = 0
+            self.timeouts = 0
+            self.max_en_uso = 0
+            self.esperas = 0
+            self.espera_total = 0.0
+            self.espera_max = 0.0
+            self._esperas.clear()
+
+    # --- registros -------------------------------------------------
+    def conexion_creada(self):
+        with self._lock:
+            self.conexiones_creadas += 1
+
+    def checkout(self, en_uso: int, en_overflow: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.checkouts_overflow += en_overflow
+            self.max_en_uso = max(self.max_en_uso, en_uso)
+
+    def checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def invalidacion(self):
+        with self._lock:
+            self.invalidaciones += 1
+
+    def espera(self, segundos: float, timeout: bool = False):
+        with self._lock:
+            self.esperas += 1
+            self.espera_total += segundos
+            self.espera_max = max(self.espera_max, segundos)
+            self._esperas.append(segundos)
+            if timeout:
+                self.timeouts += 1
+
+    # --- lectura ---------------------------------------------------
+    def resumen(self) -> dict:
+        with self._lock:
+            esperas = sorted(self._esperas)
+            n = len(esperas)
+            return {
+                "conexiones_creadas": self.conexiones_creadas,
+                "checkouts": self.checkouts,
+                "checkouts_overflow": self.checkouts_overflow,
+                "checkins": self.checkins,
+                "invalidaciones": self.invalidaciones,
+                "timeouts": self.timeouts,
+                "max_en_uso": self.max_en_uso,
+                "espera_ms": {
+                    "promedio": round(self.espera_total / self.esperas * 1000, 3) if self.esperas else 0.0,
+                    "p95": round(esperas[min(n - 1, int(n * 0.95))] * 1000, 3) if n else 0.0,
+                    "max": round(self.espera_max * 1000, 3),
+                },
+            }
+
+
+estadisticas_pool = EstadisticasPool()
+
+
+class QueuePoolMedido(QueuePool):
+    """
+    QueuePool que mide cuánto tarda cada checkout en obtener una conexión
+    (espera por una libre + abrir una nueva o el pre-ping). Envuelve
+    Pool.connect(), que es lo que llama Engine al pedir una conexión.
+    """
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super().connect()
+        except PoolTimeoutError:
+            estadisticas_pool.espera(time.perf_counter() - inicio, timeout=True)
+            raise
+        estadisticas_pool.espera(time.perf_counter() - inicio)
+        return conexion
+
+
+def instrumentar(engine: Engine, estadisticas: EstadisticasPool = estadisticas_pool):
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, registro):
+        estadisticas.conexion_creada()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, registro, proxy):
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            # overflow() > 0: ya se usan conexiones por encima de pool_size
+            estadisticas.checkout(pool.checkedout(), en_overflow=pool.overflow() > 0)
+        else:
+            estadisticas.checkout(0)
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_conn, registro):
+        estadisticas.checkin()
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_conn, registro, excepcion):
+        estadisticas.invalidacion()
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _soft_invalidate(dbapi_conn, registro, excepcion):
+        estadisticas.invalidacion()
+
+
+def estado_pool(
+    engine: Engine, max_overflow: int | None = None, estadisticas: EstadisticasPool = estadisticas_pool,
+) -> dict:
+    """Foto actual del pool + contadores acumulados. `max_overflow`: el configurado al crear el engine."""
+    pool = engine.pool
+    estado = {"clase": type(pool).__name__, "estado": pool.status()}
+    if isinstance(pool, QueuePool):
+        estado.update(
+            tamano=pool.size(),
+            en_uso=pool.checkedout(),
+            libres=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=max_overflow,
+            timeout_segundos=pool.timeout(),
+        )
+    estado["contadores"] = estadisticas.resumen()
+    return estado
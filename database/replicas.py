@@ -0,0 +1,158 @@
+# database/replicas.py
+import hashlib
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class SesionRuteada(Session):
+    """
+    Session que lee de la réplica asignada en `info["replica"]` (ver
+    get_db_lectura). Todo flush —y toda sesión sin réplica— va al primario.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None and not self._flushing:
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+# ===========================================================
+# 🩺 Réplicas y su retraso
+# ===========================================================
+def medir_retraso(engine: Engine) -> float:
+    """Segundos de retraso de la réplica; inf si la replicación está detenida."""
+    with engine.connect() as conn:
+        if conn.dialect.name != "mysql":
+            # SQLite / otros (pruebas locales): solo se verifica que responda
+            conn.exec_driver_sql("SELECT 1")
+            return 0.0
+
+        try:
+            fila = conn.exec_driver_sql("SHOW REPLICA STATUS").mappings().first()
+        except Exception:
+            # MySQL < 8.0.22 / MariaDB
+            fila = conn.exec_driver_sql("SHOW SLAVE STATUS").mappings().first()
+
+    if fila is None:
+        return 0.0  # no está configurada como réplica (p. ej. dos instancias locales)
+    retraso = fila.get("Seconds_Behind_Source", fila.get("Seconds_Behind_Master"))
+    return math.inf if retraso is None else float(retraso)
+
+
+class Replica:
+    def __init__(self, url: str, engine: Engine):
+        self.url = url
+        self.engine = engine
+        self.retraso = math.inf
+        self.error: str | None = None
+        self.revisada_en = 0.0
+        self._revisando = threading.Lock()
+
+
+class EnrutadorReplicas:
+    """
+    Elige una réplica sana (round-robin) para las sesiones de lectura.
+    El retraso de cada réplica se revisa como máximo cada `intervalo`
+    segundos, dentro de la petición que la necesite; si ninguna está
+    dentro de `max_retraso`, la lectura se hace en el primario.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        crear_engine: Callable[[str], Engine],
+        max_retraso: float,
+        intervalo: float,
+    ):
+        self.replicas = [Replica(url, crear_engine(url)) for url in urls]
+        self.max_retraso = max_retraso
+        self.intervalo = intervalo
+        self._turno = itertools.count()
+
+    @property
+    def activo(self) -> bool:
+        return bool(self.replicas)
+
+    def _revisar(self, replica: Replica):
+        # Si otra petición ya la está revisando, usar el último dato
+        if not replica._revisando.acquire(blocking=False):
+            return
+        try:
+            replica.retraso = medir_retraso(replica.engine)
+            replica.error = None
+        except Exception as exc:
+            if replica.error is None:
+                logger.warning("Réplica %s no disponible: %s", replica.engine.url, exc)
+            replica.retraso = math.inf
+            replica.error = str(exc)
+        finally:
+            replica.revisada_en = time.monotonic()
+            replica._revisando.release()
+
+    def elegir(self) -> Engine | None:
+        if not self.replicas:
+            return None
+
+        ahora = time.monotonic()
+        inicio = next(self._turno)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(inicio + i) % len(self.replicas)]
+            if ahora - replica.revisada_en >= self.intervalo:
+                self._revisar(replica)
+            if replica.retraso <= self.max_retraso:
+                return replica.engine
+        return None
+
+    def estado(self) -> list[dict]:
+        return [
+            {
+                "url": r.engine.url.render_as_string(hide_password=True),
+                "retraso_segundos": None if math.isinf(r.retraso) else r.retraso,
+                "disponible": r.retraso <= self.max_retraso,
+                "error": r.error,
+            }
+            for r in self.replicas
+        ]
+
+
+# ===========================================================
+# ✍️ Leer lo propio después de escribir
+# ===========================================================
+class EscriturasRecientes:
+    """
+    Clientes que escribieron hace poco: sus lecturas van al primario
+    durante `ventana` segundos. En memoria del proceso (por worker).
+    """
+
+    def __init__(self, ventana: float, max_clientes: int = 10_000):
+        self.ventana = ventana
+        self.max_clientes = max_clientes
+        self._hasta: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def marcar(self, clave: str):
+        ahora = time.monotonic()
+        with self._lock:
+            if len(self._hasta) >= self.max_clientes:
+                self._hasta = {k: v for k, v in self._hasta.items() if v > ahora}
+            self._hasta[clave] = ahora + self.ventana
+
+    def reciente(self, clave: str) -> bool:
+        with self._lock:
+            return self._hasta.get(clave, 0.0) > time.monotonic()
+
+
+def clave_cliente(authorization: str | None, host: str | None) -> str:
+    """Identifica al cliente por su token (o su IP si no trae token)."""
+    base = authorization or f"ip:{host}"
+    return hashlib.sha256(base.encode()).hexdigest()[:32]
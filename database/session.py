@@ -1,9 +1,50 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from config.settings import settings
+from database.pool import QueuePoolMedido, instrumentar
+from database.replicas import EnrutadorReplicas, EscriturasRecientes, SesionRuteada, clave_cliente
+from database import texto  # noqa: F401  (registra sin_acentos en las conexiones SQLite)
+
+
+def _opciones_pool(url: str, medir: bool = True) -> dict:
+    # SQLite (pruebas locales) usa su propio pool; el tamaño no aplica
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    opciones = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SEGUNDOS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SEGUNDOS,
+    }
+    if medir:
+        opciones["poolclass"] = QueuePoolMedido
+    return opciones
+
+
+engine = create_engine(settings.DATABASE_URL, **_opciones_pool(settings.DATABASE_URL))
+instrumentar(engine)
+SessionLocal = sessionmaker(class_=SesionRuteada, autocommit=False, autoflush=False, bind=engine)
+
+
+# Réplicas de solo lectura (DATABASE_REPLICAS vacío = todo al primario)
+enrutador_replicas = EnrutadorReplicas(
+    [url.strip() for url in settings.DATABASE_REPLICAS.split(",") if url.strip()],
+    lambda url: create_engine(url, **_opciones_pool(url, medir=False)),
+    max_retraso=settings.DB_REPLICA_MAX_RETRASO_SEGUNDOS,
+    intervalo=settings.DB_REPLICA_CHEQUEO_SEGUNDOS,
+)
+escrituras_recientes = EscriturasRecientes(settings.DB_LEER_PRIMARIO_TRAS_ESCRITURA_SEGUNDOS)
+
+
+def leer_del_primario(request: Request) -> bool:
+    if request.headers.get("x-leer-primario", "").lower() in ("1", "true", "si"):
+        return True
+    host = request.client.host if request.client else None
+    return escrituras_recientes.reciente(clave_cliente(request.headers.get("authorization"), host))
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
     db = SessionLocal()
@@ -11,3 +52,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_db_lectura(request: Request):
+    """
+    Sesión para endpoints GET: lee de una réplica sana, salvo que el
+    cliente haya escrito hace poco (o mande `X-Leer-Primario: 1`).
+    """
+    db = SessionLocal()
+    if enrutador_replicas.activo and not leer_del_primario(request):
+        replica = enrutador_replicas.elegir()
+        if replica is not None:
+            db.info["replica"] = replica
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,64 @@
+# database/texto.py
+"""
+Comparación de texto sin acentos ni mayúsculas, igual en MySQL y SQLite.
+
+    filtro = sin_acentos(Usuario.nombre).contains(normalizar(q), autoescape=True)
+
+- MySQL: la columna se compara con una colación *_ci acento-insensible
+  (utf8mb4_unicode_ci: "José" = "jose", "Peña" = "pena").
+- SQLite: no tiene colaciones así; se registra la función `sin_acentos`
+  (la misma `normalizar` de Python) en cada conexión nueva.
+
+También `nombre_completo`, el "nombre apellido apellido" armado en SQL.
+"""
+import unicodedata
+
+from sqlalchemy import String, event, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+
+
+def normalizar(texto: str | None) -> str | None:
+    """Minúsculas y sin marcas diacríticas ("Peña Núñez" -> "pena nunez")."""
+    if texto is None:
+        return None
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+class sin_acentos(GenericFunction):
+    type = String()
+    inherit_cache = True
+
+
+@compiles(sin_acentos)
+def _sin_acentos_generico(elemento, compilador, **kw):
+    return f"lower({compilador.process(elemento.clauses, **kw)})"
+
+
+@compiles(sin_acentos, "sqlite")
+def _sin_acentos_sqlite(elemento, compilador, **kw):
+    return f"sin_acentos({compilador.process(elemento.clauses, **kw)})"
+
+
+@compiles(sin_acentos, "mysql")
+def _sin_acentos_mysql(elemento, compilador, **kw):
+    # CONVERT por si alguna tabla vieja quedó en latin1/utf8mb3
+    return f"(CONVERT({compilador.process(elemento.clauses, **kw)} USING utf8mb4) COLLATE utf8mb4_unicode_ci)"
+
+
+@event.listens_for(Engine, "connect")
+def _registrar_en_sqlite(dbapi_conn, _):
+    crear = getattr(dbapi_conn, "create_function", None)
+    if crear is not None and type(dbapi_conn).__module__.startswith(("sqlite3", "sqlalchemy.dialects.sqlite")):
+        crear("sin_acentos", 1, normalizar, deterministic=True)
+
+
+def nombre_completo(nombre, apellido_paterno, apellido_materno):
+    """Expresión SQL "nombre apellido_paterno apellido_materno" (NULL cuenta como vacío)."""
+    return func.trim(
+        nombre
+        + " " + func.coalesce(apellido_paterno, "")
+        + " " + func.coalesce(apellido_materno, "")
+    )
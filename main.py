@@ -1,11 +1,15 @@
+import sys
+
 import fastapi
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from database.session import engine
-from database.base import Base
+from database.session import engine, enrutador_replicas, escrituras_recientes
+from database.replicas import clave_cliente
+from database.esquema import preparar_esquema
 from config.settings import settings
+from core.logs import configurar_logging, detener_logging
+from utils.estaticos import EstaticosCacheables
 
 # ===============================
 # 📌 IMPORTACIÓN DE MODELOS
@@ -18,8 +22,11 @@ import models.ninos
 import models.tutores
 import models.terapias
 import models.citas
+import models.citas_resumen
 import models.ninos_prospecto
 import models.cita_tipos
+import models.correos_outbox
+import models.archivos_blob
 
 
 # ===============================
@@ -34,12 +41,26 @@ from routers.citas import router as citas_router
 
 # ===============================
 # 📌 Routers nuevos completos
+#   (con DB_ASYNC=true: versiones AsyncSession de los CRUD simples)
 # ===============================
-from routers.tutores import router as tutores_router
-from routers.ninos import router as ninos_router
-from routers.terapias import router as terapias_router
-from routers.ninos_prospecto import router as prospectos_router
-from routers.cita_tipos import router as cita_tipos_router
+if settings.DB_ASYNC:
+    from routers.asincronos.tutores import router as tutores_router
+    from routers.asincronos.ninos import router as ninos_router
+    from routers.asincronos.terapias import router as terapias_router
+    from routers.asincronos.ninos_prospecto import router as prospectos_router
+    from routers.asincronos.cita_tipos import router as cita_tipos_router
+else:
+    from routers.tutores import router as tutores_router
+    from routers.ninos import router as ninos_router
+    from routers.terapias import router as terapias_router
+    from routers.ninos_prospecto import router as prospectos_router
+    from routers.cita_tipos import router as cita_tipos_router
+from routers.busqueda import router as busqueda_router
+from routers.dashboard import router as dashboard_router
+from routers.admin import router as admin_router
+
+from utils.correos_outbox import despachador
+from utils.recordatorios import programador_recordatorios
 
 
 # ================================================================
@@ -49,9 +70,71 @@ app = FastAPI(title=settings.PROJECT_NAME)
 
 
 # ================================================================
-# 🗂️ Crear todas las tablas automáticamente
+# 🗂️ Esquema de la BD: solo se verifica la versión (ver alembic.ini)
+# ================================================================
+@app.on_event("startup")
+def verificar_esquema():
+    preparar_esquema(engine)
+
+
+# ================================================================
+# 🪵 Logs estructurados (JSON) escritos desde un hilo aparte
+# ================================================================
+@app.on_event("startup")
+def iniciar_logging():
+    configurar_logging()
+
+
+@app.on_event("shutdown")
+def terminar_logging():
+    detener_logging()
+
+
+# ================================================================
+# 📤 Despachador del outbox de correos y recordatorios (segundo plano)
+# ================================================================
+@app.on_event("startup")
+def iniciar_tareas_correo():
+    if settings.OUTBOX_HABILITADO:
+        despachador.iniciar()
+    if settings.RECORDATORIOS_HABILITADO:
+        programador_recordatorios.iniciar()
+
+
+@app.on_event("shutdown")
+def detener_tareas_correo():
+    programador_recordatorios.detener()
+    despachador.detener()
+    # El pool SMTP solo existe si ya se envió algún correo (import diferido)
+    smtp = sys.modules.get("utils.smtp_pool")
+    if smtp is not None:
+        smtp.pool_smtp.cerrar()
+
+
+# ================================================================
+# 🔌 Engine async (solo con DB_ASYNC=true)
+# ================================================================
+@app.on_event("shutdown")
+async def cerrar_engine_async():
+    if settings.DB_ASYNC:
+        from database.async_session import cerrar_engines_async
+        await cerrar_engines_async()
+
+
+# ================================================================
+# ✍️ Leer lo propio: tras una escritura, ese cliente lee del primario
 # ================================================================
-Base.metadata.create_all(bind=engine)
+@app.middleware("http")
+async def marcar_escrituras(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        enrutador_replicas.activo
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        host = request.client.host if request.client else None
+        escrituras_recientes.marcar(clave_cliente(request.headers.get("authorization"), host))
+    return response
 
 
 # ================================================================
@@ -73,8 +156,9 @@ app.add_middleware(
 
 # ================================================================
 # 📁 Archivos estáticos (/static -> carpeta uploads)
+#   ETag + Cache-Control inmutable para blobs/miniaturas, Range para PDFs
 # ================================================================
-app.mount("/static", StaticFiles(directory="uploads"), name="static")
+app.mount("/static", EstaticosCacheables(directory="uploads"), name="static")
 
 
 # ================================================================
@@ -101,6 +185,15 @@ app.include_router(cita_tipos_router)
 # 📅 Citas completas (con niño, prospecto o nombre libre)
 app.include_router(citas_router)
 
+# 🔎 Búsqueda unificada
+app.include_router(busqueda_router)
+
+# 📊 Dashboard
+app.include_router(dashboard_router)
+
+# 🛠 Diagnóstico (solo Administrador)
+app.include_router(admin_router)
+
 
 # ================================================================
 # 🏠 Ruta principal
@@ -0,0 +1,5 @@
+# migraciones/cabeza.py
+# Última revisión de migraciones/versions. El arranque (DB_ESQUEMA_MODO=verificar)
+# la compara con alembic_version sin importar Alembic; env.py falla si no
+# coincide con las heads reales, así que se actualiza junto con cada migración.
+CABEZA = "0008"
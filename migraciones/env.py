@@ -0,0 +1,53 @@
+# migraciones/env.py
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import make_url
+
+from config.settings import settings
+from database.base import Base
+from database.esquema import importar_modelos
+from migraciones.cabeza import CABEZA
+
+importar_modelos()
+target_metadata = Base.metadata
+
+# El arranque verifica contra migraciones/cabeza.py: que no se quede atrás
+_HEADS = set(context.script.get_heads())
+if _HEADS != {CABEZA}:
+    raise RuntimeError(f"migraciones/cabeza.py dice {CABEZA!r} pero las heads son {sorted(_HEADS)}: actualizarla")
+
+URL = settings.DATABASE_URL
+# SQLite no soporta la mayoría de ALTER TABLE: Alembic recrea la tabla
+BATCH = make_url(URL).get_backend_name() == "sqlite"
+
+# database.esquema.migrar() pasa su propia conexión (benchmarks, BD temporales)
+CONEXION = context.config.attributes.get("connection")
+
+
+def run_migrations_offline():
+    context.configure(url=URL, target_metadata=target_metadata, literal_binds=True, render_as_batch=BATCH)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    if CONEXION is not None:
+        context.configure(
+            connection=CONEXION, target_metadata=target_metadata,
+            render_as_batch=CONEXION.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(URL, poolclass=pool.NullPool)
+    with engine.connect() as conn:
+        context.configure(connection=conn, target_metadata=target_metadata, render_as_batch=BATCH)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
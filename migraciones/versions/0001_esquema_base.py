@@ -0,0 +1,245 @@
+"""esquema base (tablas existentes antes de las migraciones)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Las tablas tal como las definían los modelos antes de Alembic, escritas a
+mano: esta revisión no debe cambiar cuando cambien los modelos (lo nuevo
+va en 0002+). En una BD que ya las tenía (creadas por create_all o por el
+dump original) cada tabla existente se salta.
+
+Dos FKs de los modelos de entonces apuntaban a algo que no definían:
+ninos.id_escuela -> escuelas y citas.id_nino_prospecto ->
+ninos_prospecto.id_nino_prospecto. Aquí quedan como columnas sin FK.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _roles():
+    op.create_table(
+        "roles",
+        sa.Column("id_rol", sa.Integer(), primary_key=True),
+        sa.Column("nombre_rol", sa.String(100), nullable=False, unique=True),
+        sa.Column("descripcion", sa.Text()),
+    )
+    op.create_index("ix_roles_id_rol", "roles", ["id_rol"])
+
+
+def _permisos():
+    op.create_table(
+        "permisos",
+        sa.Column("id_permiso", sa.Integer(), primary_key=True),
+        sa.Column("nombre_permiso", sa.String(100), nullable=False, unique=True),
+        sa.Column("descripcion", sa.Text()),
+    )
+    op.create_index("ix_permisos_id_permiso", "permisos", ["id_permiso"])
+
+
+def _grados_academicos():
+    op.create_table(
+        "grados_academicos",
+        sa.Column("id_grado", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(150), nullable=False, unique=True),
+    )
+    op.create_index("ix_grados_academicos_id_grado", "grados_academicos", ["id_grado"])
+
+
+def _usuarios():
+    op.create_table(
+        "usuarios",
+        sa.Column("id_usuario", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(50), nullable=False),
+        sa.Column("apellido_paterno", sa.String(50)),
+        sa.Column("apellido_materno", sa.String(50)),
+        sa.Column("correo", sa.String(100), nullable=False, unique=True),
+        sa.Column("contrasena_hash", sa.String(255), nullable=False),
+        sa.Column("telefono", sa.String(20)),
+        sa.Column("foto_perfil", sa.String(255)),
+        sa.Column("id_rol", sa.Integer(), sa.ForeignKey("roles.id_rol"), nullable=False),
+        sa.Column("activo", sa.Boolean()),
+        sa.Column("ultimo_login", sa.DateTime()),
+        sa.Column("creado_en", sa.DateTime()),
+        sa.Column("actualizado_en", sa.DateTime()),
+    )
+    op.create_index("ix_usuarios_id_usuario", "usuarios", ["id_usuario"])
+
+
+def _personal():
+    op.create_table(
+        "personal",
+        sa.Column("id_personal", sa.Integer(), primary_key=True),
+        sa.Column("id_usuario", sa.Integer(), sa.ForeignKey("usuarios.id_usuario"), nullable=False, unique=True),
+        sa.Column("fecha_nacimiento", sa.Date()),
+        sa.Column("fecha_ingreso", sa.Date()),
+        sa.Column("id_grado", sa.Integer(), sa.ForeignKey("grados_academicos.id_grado", ondelete="SET NULL")),
+        sa.Column("especialidades", sa.Text()),
+        sa.Column("telefono_personal", sa.String(20)),
+        sa.Column("correo_personal", sa.String(100)),
+        sa.Column("rfc", sa.String(25)),
+        sa.Column("ine", sa.String(25)),
+        sa.Column("curp", sa.String(25)),
+        sa.Column("domicilio_calle", sa.String(100)),
+        sa.Column("domicilio_colonia", sa.String(100)),
+        sa.Column("domicilio_cp", sa.String(10)),
+        sa.Column("domicilio_municipio", sa.String(100)),
+        sa.Column("domicilio_estado", sa.String(100)),
+        sa.Column("cv_archivo", sa.String(255)),
+        sa.Column("comprobante_domicilio", sa.String(255)),
+        sa.Column("experiencia", sa.Text()),
+    )
+    op.create_index("ix_personal_id_personal", "personal", ["id_personal"])
+
+
+def _tutores():
+    op.create_table(
+        "tutores",
+        sa.Column("id_tutor", sa.Integer(), primary_key=True),
+        sa.Column(
+            "id_usuario", sa.Integer(),
+            sa.ForeignKey("usuarios.id_usuario", onupdate="CASCADE", ondelete="CASCADE"), unique=True,
+        ),
+        sa.Column("ine", sa.String(25)),
+        sa.Column("curp", sa.String(25)),
+        sa.Column("parentesco", sa.String(50)),
+        sa.Column("calle", sa.String(100)),
+        sa.Column("numero_exterior", sa.String(10)),
+        sa.Column("colonia", sa.String(100)),
+        sa.Column("codigo_postal", sa.String(10)),
+        sa.Column("municipio", sa.String(100)),
+        sa.Column("estado", sa.String(100)),
+        sa.Column("comprobante_domicilio", sa.String(255)),
+        sa.Column("telefono_emergencia", sa.String(20)),
+        sa.Column("creado_en", sa.TIMESTAMP()),
+    )
+    op.create_index("ix_tutores_id_tutor", "tutores", ["id_tutor"])
+
+
+def _ninos():
+    op.create_table(
+        "ninos",
+        sa.Column("id_nino", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(50), nullable=False),
+        sa.Column("apellido_paterno", sa.String(50)),
+        sa.Column("apellido_materno", sa.String(50)),
+        sa.Column("fecha_nacimiento", sa.Date()),
+        sa.Column("edad", sa.Integer()),
+        sa.Column("sexo", sa.String(20)),
+        sa.Column("id_tutor", sa.Integer(), sa.ForeignKey("tutores.id_tutor", onupdate="CASCADE", ondelete="CASCADE")),
+        sa.Column(
+            "id_usuario_responsable", sa.Integer(),
+            sa.ForeignKey("usuarios.id_usuario", onupdate="CASCADE", ondelete="SET NULL"),
+        ),
+        sa.Column("id_escuela", sa.Integer()),
+        sa.Column("grado_escolar", sa.String(50)),
+        sa.Column("diagnostico_principal", sa.String(255)),
+        sa.Column("diagnostico_archivo", sa.String(255)),
+        sa.Column("alergias", sa.Text()),
+        sa.Column("observaciones_generales", sa.Text()),
+        sa.Column("fotografia", sa.String(255)),
+        sa.Column("activo", sa.Integer()),
+    )
+    op.create_index("ix_ninos_id_nino", "ninos", ["id_nino"])
+
+
+def _ninos_prospecto():
+    op.create_table(
+        "ninos_prospecto",
+        sa.Column("id_prospecto", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("nombre", sa.String(100), nullable=False),
+        sa.Column("apellido_paterno", sa.String(100)),
+        sa.Column("apellido_materno", sa.String(100)),
+        sa.Column("edad_aproximada", sa.Integer()),
+        sa.Column("fecha_nacimiento", sa.Date()),
+        sa.Column("sexo", sa.String(20)),
+        sa.Column("telefono_contacto", sa.String(20)),
+        sa.Column("nombre_tutor", sa.String(150)),
+        sa.Column("notas", sa.Text()),
+        sa.Column("activo", sa.Boolean()),
+    )
+
+
+def _terapias():
+    op.create_table(
+        "terapias",
+        sa.Column("id_terapia", sa.Integer(), primary_key=True),
+        sa.Column("nombre_terapia", sa.String(150), nullable=False),
+        sa.Column("descripcion", sa.Text()),
+        sa.Column("duracion_minutos", sa.Integer()),
+        sa.Column("costo", sa.DECIMAL(10, 2)),
+        sa.Column("creado_en", sa.TIMESTAMP()),
+    )
+    op.create_index("ix_terapias_id_terapia", "terapias", ["id_terapia"])
+
+
+def _cita_tipos():
+    op.create_table(
+        "cita_tipos",
+        sa.Column("id_tipo", sa.Integer(), primary_key=True),
+        sa.Column("nombre_tipo", sa.String(150), nullable=False, unique=True),
+        sa.Column("descripcion", sa.Text()),
+        sa.Column("creado_en", sa.TIMESTAMP(), server_default=sa.func.current_timestamp()),
+    )
+    op.create_index("ix_cita_tipos_id_tipo", "cita_tipos", ["id_tipo"])
+
+
+def _citas():
+    op.create_table(
+        "citas",
+        sa.Column("id_cita", sa.Integer(), primary_key=True),
+        sa.Column("id_nino", sa.Integer(), sa.ForeignKey("ninos.id_nino", onupdate="CASCADE", ondelete="SET NULL")),
+        sa.Column("id_nino_prospecto", sa.Integer()),
+        sa.Column("nombre_nino_libre", sa.String(150)),
+        sa.Column(
+            "id_personal", sa.Integer(),
+            sa.ForeignKey("personal.id_personal", onupdate="CASCADE", ondelete="SET NULL"),
+        ),
+        sa.Column(
+            "id_terapia", sa.Integer(),
+            sa.ForeignKey("terapias.id_terapia", onupdate="CASCADE", ondelete="SET NULL"),
+        ),
+        sa.Column(
+            "id_tipo", sa.Integer(),
+            sa.ForeignKey("cita_tipos.id_tipo", onupdate="CASCADE", ondelete="SET NULL"),
+        ),
+        sa.Column("fecha", sa.Date()),
+        sa.Column("hora", sa.Time()),
+        sa.Column("tipo", sa.String(50)),
+        sa.Column("notas", sa.Text()),
+        sa.Column("estado", sa.String(50)),
+    )
+    op.create_index("ix_citas_id_cita", "citas", ["id_cita"])
+
+
+# En orden de creación (las FKs apuntan a tablas anteriores)
+TABLAS = {
+    "roles": _roles,
+    "permisos": _permisos,
+    "grados_academicos": _grados_academicos,
+    "usuarios": _usuarios,
+    "personal": _personal,
+    "tutores": _tutores,
+    "ninos": _ninos,
+    "ninos_prospecto": _ninos_prospecto,
+    "terapias": _terapias,
+    "cita_tipos": _cita_tipos,
+    "citas": _citas,
+}
+
+
+def upgrade():
+    existentes = set(sa.inspect(op.get_bind()).get_table_names())
+    for nombre, crear in TABLAS.items():
+        if nombre not in existentes:
+            crear()
+
+
+def downgrade():
+    for nombre in reversed(TABLAS):
+        op.drop_table(nombre)
@@ -0,0 +1,97 @@
+"""outbox de correos, almacén de archivos, version_token e índices de citas
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Idempotente: en una BD creada con create_all antes de las migraciones
+varias de estas piezas ya existen.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columnas) — los índices de las consultas calientes
+INDICES_CITAS = [
+    ("ix_citas_fecha_hora_id", [sa.text("fecha DESC"), "hora", "id_cita"]),
+    ("ix_citas_personal_fecha_hora", ["id_personal", sa.text("fecha DESC"), "hora", "id_cita"]),
+    ("ix_citas_estado_fecha_hora", ["estado", sa.text("fecha DESC"), "hora", "id_cita"]),
+]
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _existe_tabla(tabla: str) -> bool:
+    return _inspector().has_table(tabla)
+
+
+def _existe_columna(tabla: str, columna: str) -> bool:
+    return any(c["name"] == columna for c in _inspector().get_columns(tabla))
+
+
+def _existe_indice(tabla: str, indice: str) -> bool:
+    return any(i["name"] == indice for i in _inspector().get_indexes(tabla))
+
+
+def upgrade():
+    # 🔐 Revocación de tokens
+    if not _existe_columna("usuarios", "version_token"):
+        op.add_column(
+            "usuarios",
+            sa.Column("version_token", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # 📤 Outbox de correos
+    if not _existe_tabla("correos_outbox"):
+        op.create_table(
+            "correos_outbox",
+            sa.Column("id_correo", sa.Integer(), primary_key=True),
+            sa.Column("id_cita", sa.Integer(), nullable=False),
+            sa.Column("evento", sa.String(50), nullable=False),
+            sa.Column("clave", sa.String(120), unique=True),
+            sa.Column("estado", sa.String(20), nullable=False),
+            sa.Column("intentos", sa.Integer(), nullable=False),
+            sa.Column("proximo_intento", sa.DateTime(), nullable=False),
+            sa.Column("ultimo_error", sa.Text()),
+            sa.Column("creado_en", sa.DateTime(), server_default=sa.func.now()),
+            sa.Column("enviado_en", sa.DateTime()),
+        )
+        op.create_index("ix_correos_outbox_id_correo", "correos_outbox", ["id_correo"])
+        op.create_index("ix_correos_outbox_estado_proximo", "correos_outbox", ["estado", "proximo_intento"])
+
+    # 💾 Almacén de archivos por contenido
+    if not _existe_tabla("archivos_blob"):
+        op.create_table(
+            "archivos_blob",
+            sa.Column("sha256", sa.String(64), primary_key=True),
+            sa.Column("extension", sa.String(16), nullable=False),
+            sa.Column("tamano", sa.BigInteger(), nullable=False),
+            sa.Column("referencias", sa.Integer(), nullable=False),
+            sa.Column("creado_en", sa.DateTime(), server_default=sa.func.now()),
+            sa.Column("actualizado_en", sa.DateTime()),
+        )
+        op.create_index("ix_archivos_blob_referencias", "archivos_blob", ["referencias", "actualizado_en"])
+
+    # 📅 Listado / agenda de citas (paginación por cursor)
+    for nombre, columnas in INDICES_CITAS:
+        if not _existe_indice("citas", nombre):
+            op.create_index(nombre, "citas", columnas)
+
+
+def downgrade():
+    for nombre, _ in INDICES_CITAS:
+        if _existe_indice("citas", nombre):
+            op.drop_index(nombre, table_name="citas")
+    if _existe_tabla("archivos_blob"):
+        op.drop_table("archivos_blob")
+    if _existe_tabla("correos_outbox"):
+        op.drop_table("correos_outbox")
+    if _existe_columna("usuarios", "version_token"):
+        with op.batch_alter_table("usuarios") as batch:
+            batch.drop_column("version_token")
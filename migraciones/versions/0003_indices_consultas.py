@@ -0,0 +1,42 @@
+"""índices para las consultas de login, personal, niños y citas sin niño formal
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Plan de índices (ver benchmarks/auditoria_indices.py):
+  usuarios.correo            UNIQUE existente        login
+  personal.id_usuario        UNIQUE existente        listar_personal
+  usuarios.id_rol            ix_usuarios_id_rol      listar_personal, revocación por rol
+  ninos.id_tutor             ix_ninos_id_tutor       notificaciones (tutor -> niño)
+  citas (id_nino, fecha, hora) ix_citas_nino_fecha_hora  /citas/nino/{id}, /citas/prospectos
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDICES = [
+    ("ix_usuarios_id_rol", "usuarios", ["id_rol"]),
+    ("ix_ninos_id_tutor", "ninos", ["id_tutor"]),
+    ("ix_citas_nino_fecha_hora", "citas", ["id_nino", sa.text("fecha DESC"), "hora"]),
+]
+
+
+def _existe_indice(tabla: str, indice: str) -> bool:
+    return any(i["name"] == indice for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def upgrade():
+    for nombre, tabla, columnas in INDICES:
+        if not _existe_indice(tabla, nombre):
+            op.create_index(nombre, tabla, columnas)
+
+
+def downgrade():
+    for nombre, tabla, _ in INDICES:
+        if _existe_indice(tabla, nombre):
+            op.drop_index(nombre, table_name=tabla)
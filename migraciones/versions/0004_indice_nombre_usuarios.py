@@ -0,0 +1,29 @@
+"""índice para el listado de personal ordenado por nombre
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+GET /personal/ pagina por cursor sobre (usuarios.nombre, usuarios.id_usuario).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def _existe_indice(tabla: str, indice: str) -> bool:
+    return any(i["name"] == indice for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def upgrade():
+    if not _existe_indice("usuarios", "ix_usuarios_nombre_id"):
+        op.create_index("ix_usuarios_nombre_id", "usuarios", ["nombre", "id_usuario"])
+
+
+def downgrade():
+    if _existe_indice("usuarios", "ix_usuarios_nombre_id"):
+        op.drop_index("ix_usuarios_nombre_id", table_name="usuarios")
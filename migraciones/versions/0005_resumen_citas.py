@@ -0,0 +1,46 @@
+"""conteos diarios de citas para el dashboard
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Crea citas_resumen_diario (si no existe) y la vuelve a llenar con las
+citas existentes. A partir de aquí la mantiene utils/resumen_citas.py
+con cada cambio de Cita.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+LLENAR = """
+INSERT INTO citas_resumen_diario (fecha, id_personal, id_terapia, estado, total)
+SELECT fecha, COALESCE(id_personal, 0), COALESCE(id_terapia, 0), COALESCE(estado, ''), COUNT(*)
+FROM citas
+WHERE fecha IS NOT NULL
+GROUP BY fecha, COALESCE(id_personal, 0), COALESCE(id_terapia, 0), COALESCE(estado, '')
+"""
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table("citas_resumen_diario"):
+        op.create_table(
+            "citas_resumen_diario",
+            sa.Column("fecha", sa.Date(), primary_key=True),
+            sa.Column("id_personal", sa.Integer(), primary_key=True),
+            sa.Column("id_terapia", sa.Integer(), primary_key=True),
+            sa.Column("estado", sa.String(50), primary_key=True),
+            sa.Column("total", sa.Integer(), nullable=False),
+        )
+    # Aunque la tabla ya existiera (p. ej. creada con create_all), los
+    # conteos se rehacen desde citas
+    op.execute("DELETE FROM citas_resumen_diario")
+    op.execute(LLENAR)
+
+
+def downgrade():
+    if sa.inspect(op.get_bind()).has_table("citas_resumen_diario"):
+        op.drop_table("citas_resumen_diario")
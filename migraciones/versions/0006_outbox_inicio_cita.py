@@ -0,0 +1,32 @@
+"""fecha/hora de la cita en el outbox de correos
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+correos_outbox.inicio_cita guarda la fecha/hora de la cita al encolar un
+recordatorio; el despachador descarta el correo si la cita se reprogramó.
+Las filas anteriores quedan en NULL y se envían como antes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def _existe_columna(tabla: str, columna: str) -> bool:
+    return any(c["name"] == columna for c in sa.inspect(op.get_bind()).get_columns(tabla))
+
+
+def upgrade():
+    if not _existe_columna("correos_outbox", "inicio_cita"):
+        op.add_column("correos_outbox", sa.Column("inicio_cita", sa.DateTime()))
+
+
+def downgrade():
+    if _existe_columna("correos_outbox", "inicio_cita"):
+        with op.batch_alter_table("correos_outbox") as batch:
+            batch.drop_column("inicio_cita")
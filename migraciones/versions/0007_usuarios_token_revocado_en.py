@@ -0,0 +1,56 @@
+"""fecha de la última revocación de tokens por usuario
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+usuarios.token_revocado_en: el refresco de revocaciones solo carga las
+de la última vigencia de token (ACCESS_TOKEN_EXPIRE_MINUTES). Los usuarios
+ya revocados (version_token > 0) se marcan con la hora de la migración,
+así sus tokens viejos siguen rechazándose hasta que expiran.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _existe_columna(tabla: str, columna: str) -> bool:
+    return any(c["name"] == columna for c in _inspector().get_columns(tabla))
+
+
+def _existe_indice(tabla: str, indice: str) -> bool:
+    return any(i["name"] == indice for i in _inspector().get_indexes(tabla))
+
+
+def upgrade():
+    if not _existe_columna("usuarios", "token_revocado_en"):
+        op.add_column("usuarios", sa.Column("token_revocado_en", sa.DateTime()))
+    if not _existe_indice("usuarios", "ix_usuarios_token_revocado_en"):
+        op.create_index("ix_usuarios_token_revocado_en", "usuarios", ["token_revocado_en"])
+
+    usuarios = sa.table(
+        "usuarios", sa.column("version_token", sa.Integer()), sa.column("token_revocado_en", sa.DateTime()),
+    )
+    op.execute(
+        usuarios.update()
+        .where(usuarios.c.version_token > 0, usuarios.c.token_revocado_en.is_(None))
+        .values(token_revocado_en=datetime.now())
+    )
+
+
+def downgrade():
+    if _existe_indice("usuarios", "ix_usuarios_token_revocado_en"):
+        op.drop_index("ix_usuarios_token_revocado_en", table_name="usuarios")
+    if _existe_columna("usuarios", "token_revocado_en"):
+        with op.batch_alter_table("usuarios") as batch:
+            batch.drop_column("token_revocado_en")
@@ -0,0 +1,49 @@
+"""FK de citas.id_nino_prospecto a ninos_prospecto
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+0001 creó la columna sin FK; el modelo la declara con ON DELETE SET NULL
+(igual que id_nino). Las citas que apuntan a un prospecto que ya no existe
+quedan en NULL antes de crearla, que es lo que haría la FK al borrarlo.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+FK = "fk_citas_id_nino_prospecto"
+
+
+def _fk_prospecto():
+    """La FK existente (con o sin nombre), o None; create_all ya la crea."""
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys("citas"):
+        if fk["constrained_columns"] == ["id_nino_prospecto"]:
+            return fk
+    return None
+
+
+def upgrade():
+    if _fk_prospecto() is not None:
+        return
+    op.execute(
+        "UPDATE citas SET id_nino_prospecto = NULL "
+        "WHERE id_nino_prospecto IS NOT NULL "
+        "AND id_nino_prospecto NOT IN (SELECT id_prospecto FROM ninos_prospecto)"
+    )
+    with op.batch_alter_table("citas") as batch:
+        batch.create_foreign_key(
+            FK, "ninos_prospecto", ["id_nino_prospecto"], ["id_prospecto"],
+            onupdate="CASCADE", ondelete="SET NULL",
+        )
+
+
+def downgrade():
+    fk = _fk_prospecto()
+    if fk is not None and fk["name"]:
+        with op.batch_alter_table("citas") as batch:
+            batch.drop_constraint(fk["name"], type_="foreignkey")
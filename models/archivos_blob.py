@@ -0,0 +1,27 @@
+# models/archivos_blob.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index
+from sqlalchemy.sql import func
+from database.base import Base
+
+
+class ArchivoBlob(Base):
+    """
+    Archivo subido guardado una sola vez, identificado por su SHA-256.
+    `referencias` cuenta cuántas columnas (foto_perfil, cv_archivo, ...)
+    apuntan a él; con 0 lo borra la recolección de basura (utils/almacen.py).
+    """
+    __tablename__ = "archivos_blob"
+
+    sha256 = Column(String(64), primary_key=True)
+    extension = Column(String(16), nullable=False, default="")
+    tamano = Column(BigInteger, nullable=False)
+    referencias = Column(Integer, nullable=False, default=0)
+
+    creado_en = Column(DateTime, server_default=func.now())
+    # Hora de Python (no de la BD): la compara la recolección de basura
+    actualizado_en = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+# La recolección de basura busca "sin referencias desde hace tiempo"
+Index("ix_archivos_blob_referencias", ArchivoBlob.referencias, ArchivoBlob.actualizado_en)
@@ -1,5 +1,5 @@
 # models/citas.py
-from sqlalchemy import Column, Integer, Date, Time, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, Date, Time, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database.base import Base
 
@@ -15,7 +15,7 @@ class Cita(Base):
     # Niño prospecto
     id_nino_prospecto = Column(
         Integer,
-        ForeignKey("ninos_prospecto.id_nino_prospecto", onupdate="CASCADE", ondelete="SET NULL")
+        ForeignKey("ninos_prospecto.id_prospecto", onupdate="CASCADE", ondelete="SET NULL")
     )
 
     # Nombre libre (cuando no quieres ni nino formal ni prospecto)
@@ -42,3 +42,16 @@ class Cita(Base):
     personal = relationship("Personal", backref="citas")
     terapia = relationship("Terapia", backref="citas")
     tipo_cita = relationship("CitaTipo", backref="citas")
+
+
+# ===========================================================
+# Índices compuestos para el listado paginado por cursor
+#   (mismo orden que GET /citas/: fecha desc, hora, id_cita)
+# ===========================================================
+Index("ix_citas_fecha_hora_id", Cita.fecha.desc(), Cita.hora, Cita.id_cita)
+Index("ix_citas_personal_fecha_hora", Cita.id_personal, Cita.fecha.desc(), Cita.hora, Cita.id_cita)
+Index("ix_citas_estado_fecha_hora", Cita.estado, Cita.fecha.desc(), Cita.hora, Cita.id_cita)
+
+# Citas de un niño (GET /citas/nino/{id}, notificaciones) y citas sin niño
+# formal (GET /citas/prospectos: id_nino IS NULL ordenado por fecha desc, hora)
+Index("ix_citas_nino_fecha_hora", Cita.id_nino, Cita.fecha.desc(), Cita.hora)
@@ -0,0 +1,22 @@
+# models/citas_resumen.py
+from sqlalchemy import Column, Integer, Date, String
+from database.base import Base
+
+
+class CitaResumenDiario(Base):
+    """
+    Conteo de citas por día × terapeuta × terapia × estado para el
+    dashboard. Se mantiene con cada alta/cambio/baja de Cita
+    (utils/resumen_citas.py); se puede recalcular desde /admin.
+
+    Sin terapeuta / terapia / estado se guarda 0 / 0 / "" para que la
+    llave primaria (y el upsert) funcione igual que con valores.
+    """
+    __tablename__ = "citas_resumen_diario"
+
+    fecha = Column(Date, primary_key=True)
+    id_personal = Column(Integer, primary_key=True, default=0)
+    id_terapia = Column(Integer, primary_key=True, default=0)
+    estado = Column(String(50), primary_key=True, default="")
+
+    total = Column(Integer, nullable=False, default=0)
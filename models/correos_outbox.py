@@ -0,0 +1,46 @@
+# models/correos_outbox.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from database.base import Base
+
+
+class CorreoOutbox(Base):
+    """
+    Bandeja de salida de notificaciones por correo.
+    Se escribe en la misma transacción que el cambio de la Cita y
+    un despachador en segundo plano la vacía (utils/correos_outbox.py).
+    """
+    __tablename__ = "correos_outbox"
+
+    id_correo = Column(Integer, primary_key=True, index=True)
+
+    # Cita a la que se refiere la notificación (sin FK: si la cita se
+    # elimina antes del envío, el despachador descarta el mensaje)
+    id_cita = Column(Integer, nullable=False)
+
+    # cita_creada, cita_cancelada, recordatorio_24h, ...
+    evento = Column(String(50), nullable=False)
+
+    # Llave de idempotencia (p. ej. recordatorios): la restricción única
+    # evita duplicados entre reinicios y entre varios workers
+    clave = Column(String(120), unique=True)
+
+    # Fecha/hora de la cita cuando se encoló (recordatorios): si ya no
+    # coincide al enviar, la cita se reprogramó y el correo se descarta
+    inicio_cita = Column(DateTime)
+
+    # pendiente -> enviando -> enviado | fallido | descartado (o de vuelta
+    # a pendiente para reintentar). Mientras está "enviando",
+    # proximo_intento es el plazo para volver a reclamarla.
+    estado = Column(String(20), nullable=False, default="pendiente")
+    intentos = Column(Integer, nullable=False, default=0)
+    proximo_intento = Column(DateTime, nullable=False, default=datetime.now)
+    ultimo_error = Column(Text)
+
+    creado_en = Column(DateTime, server_default=func.now())
+    enviado_en = Column(DateTime)
+
+
+# El despachador busca siempre "pendientes cuyo próximo intento ya venció"
+Index("ix_correos_outbox_estado_proximo", CorreoOutbox.estado, CorreoOutbox.proximo_intento)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database.base import Base
 
@@ -14,7 +14,8 @@ class Nino(Base):
     sexo = Column(String(20))
     id_tutor = Column(Integer, ForeignKey("tutores.id_tutor", onupdate="CASCADE", ondelete="CASCADE"))
     id_usuario_responsable = Column(Integer, ForeignKey("usuarios.id_usuario", onupdate="CASCADE", ondelete="SET NULL"))
-    id_escuela = Column(Integer, ForeignKey("escuelas.id_escuela", onupdate="CASCADE", ondelete="SET NULL"))
+    # Sin FK: no hay modelo de escuelas (la tabla solo existe en BDs del dump original)
+    id_escuela = Column(Integer)
     grado_escolar = Column(String(50))
     diagnostico_principal = Column(String(255))
     diagnostico_archivo = Column(String(255))
@@ -23,6 +24,10 @@ class Nino(Base):
     fotografia = Column(String(255))
     activo = Column(Integer, default=1)
 
-    tutor = relationship("Tutor", backref="ninos")
+    tutor = relationship("Tutor", back_populates="ninos")
     usuario_responsable = relationship("Usuario", backref="ninos_responsables", foreign_keys=[id_usuario_responsable])
-    escuela = relationship("Escuela", backref="ninos")
+
+
+# Niños de un tutor (join Tutor -> Nino en las notificaciones). MySQL crea
+# un índice por cada FK, SQLite no: se declara explícito
+Index("ix_ninos_id_tutor", Nino.id_tutor)
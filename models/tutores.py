@@ -25,4 +25,4 @@ class Tutor(Base):
     usuario = relationship("Usuario", backref="tutor", uselist=False)
 
     # Relación con niños
-    ninos = relationship("Nino", back_populates="tutor_rel")
+    ninos = relationship("Nino", back_populates="tutor")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from database.base import Base
 
@@ -24,6 +24,13 @@ class Usuario(Base):
     activo = Column(Boolean, default=True)
     ultimo_login = Column(DateTime, nullable=True)
 
+    # Se incrementa al cambiar rol, activo o contraseña: invalida los
+    # tokens "sin estado" emitidos antes (core/revocacion_tokens.py)
+    version_token = Column(Integer, nullable=False, default=0, server_default="0")
+    # Cuándo se subió version_token por última vez: solo las revocaciones
+    # más recientes que la vigencia de un token pueden rechazar alguno
+    token_revocado_en = Column(DateTime, nullable=True)
+
     creado_en = Column(DateTime, nullable=True)
     actualizado_en = Column(DateTime, nullable=True)
 
@@ -46,3 +53,14 @@ class Usuario(Base):
     # ================================
     def __repr__(self):
         return f"<Usuario(id={self.id_usuario}, nombre='{self.nombre}', correo='{self.correo}')>"
+
+
+# `correo` ya es UNIQUE (índice del login). Usuarios de un rol: join de
+# listar_personal y el UPDATE masivo de version_token al cambiar un rol
+Index("ix_usuarios_id_rol", Usuario.id_rol)
+
+# Revocaciones recientes (refresco de core/revocacion_tokens.py)
+Index("ix_usuarios_token_revocado_en", Usuario.token_revocado_en)
+
+# Orden por nombre del listado de personal (keyset sobre nombre, id_usuario)
+Index("ix_usuarios_nombre_id", Usuario.nombre, Usuario.id_usuario)
@@ -0,0 +1,98 @@
+# ============================================================
+# 🛠 Administración – diagnóstico de la API
+# ============================================================
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from core.security import require_role
+from database.pool import estadisticas_pool, estado_pool
+from database.session import engine, enrutador_replicas, get_db
+from utils.busqueda import indice_busqueda
+from utils.resumen_citas import recalcular_resumen
+
+router = APIRouter(prefix="/admin", tags=["Administración"])
+
+
+# ============================================================
+# GET – Estado del pool de conexiones a la BD
+# ============================================================
+
+@router.get("/pool-db")
+def obtener_estado_pool(
+    _: dict = Depends(require_role(["Administrador"]))
+):
+    """
+    Tamaño, conexiones en uso / overflow y contadores acumulados
+    (checkouts, espera por conexión, timeouts, invalidaciones).
+    """
+    return estado_pool(engine, settings.DB_MAX_OVERFLOW)
+
+
+# ============================================================
+# POST – Poner en cero los contadores del pool
+# ============================================================
+
+@router.post("/pool-db/reiniciar")
+def reiniciar_contadores_pool(
+    _: dict = Depends(require_role(["Administrador"]))
+):
+    """Regresa el estado con los contadores hasta ahora y los pone en cero."""
+    estado = estado_pool(engine, settings.DB_MAX_OVERFLOW)
+    estadisticas_pool.reiniciar()
+    return estado
+
+
+# ============================================================
+# GET – Réplicas de lectura y su retraso
+# ============================================================
+
+@router.get("/replicas")
+def obtener_estado_replicas(
+    _: dict = Depends(require_role(["Administrador"]))
+):
+    return {
+        "max_retraso_segundos": enrutador_replicas.max_retraso,
+        "replicas": enrutador_replicas.estado(),
+    }
+
+
+# ============================================================
+# GET – Índice de búsqueda en memoria
+# ============================================================
+
+@router.get("/busqueda")
+def obtener_estado_busqueda(
+    _: dict = Depends(require_role(["Administrador"]))
+):
+    """Documentos y antigüedad del índice de /buscar."""
+    return indice_busqueda.estado()
+
+
+# ============================================================
+# POST – Reconstruir el índice de búsqueda ya
+# ============================================================
+
+@router.post("/busqueda/reconstruir")
+def reconstruir_indice_busqueda(
+    _: dict = Depends(require_role(["Administrador"]))
+):
+    """Recarga el índice completo desde la BD (p. ej. tras un UPDATE masivo) y regresa su estado."""
+    indice_busqueda.reconstruir(engine)
+    return indice_busqueda.estado()
+
+
+# ============================================================
+# POST – Recalcular los conteos del dashboard
+# ============================================================
+
+@router.post("/resumen-citas/recalcular")
+def recalcular_resumen_citas(
+    db: Session = Depends(get_db),
+    _: dict = Depends(require_role(["Administrador"]))
+):
+    """Rehace citas_resumen_diario desde citas (p. ej. tras un UPDATE masivo)."""
+    filas = recalcular_resumen(db)
+    db.commit()
+    return {"filas": filas}
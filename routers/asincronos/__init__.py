@@ -0,0 +1,2 @@
+# routers/asincronos/__init__.py
+# Versiones async (AsyncSession) de los CRUD simples; main.py las monta con DB_ASYNC=true.
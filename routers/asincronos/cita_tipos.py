@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_session import get_db_async
+from models.cita_tipos import CitaTipo
+from schemas.cita_tipos import CitaTipoCreate, CitaTipoUpdate, CitaTipoResponse
+
+router = APIRouter(prefix="/cita-tipos", tags=["Cita Tipos"])
+
+# Obtener todos
+@router.get("/", response_model=list[CitaTipoResponse])
+async def listar_tipos(db: AsyncSession = Depends(get_db_async)):
+    return (await db.scalars(select(CitaTipo))).all()
+
+# Crear
+@router.post("/", response_model=CitaTipoResponse)
+async def crear_tipo(data: CitaTipoCreate, db: AsyncSession = Depends(get_db_async)):
+
+    existe = await db.scalar(select(CitaTipo).where(CitaTipo.nombre_tipo == data.nombre_tipo))
+    if existe:
+        raise HTTPException(status_code=400, detail="Este tipo ya existe.")
+
+    nuevo = CitaTipo(**data.dict())
+    db.add(nuevo)
+    await db.commit()
+    await db.refresh(nuevo)
+    return nuevo
+
+# Actualizar
+@router.put("/{id_tipo}", response_model=CitaTipoResponse)
+async def actualizar_tipo(id_tipo: int, data: CitaTipoUpdate, db: AsyncSession = Depends(get_db_async)):
+    tipo = await db.get(CitaTipo, id_tipo)
+
+    if not tipo:
+        raise HTTPException(status_code=404, detail="No encontrado")
+
+    for field, value in data.dict(exclude_unset=True).items():
+        setattr(tipo, field, value)
+
+    await db.commit()
+    await db.refresh(tipo)
+    return tipo
+
+# Eliminar
+@router.delete("/{id_tipo}")
+async def eliminar_tipo(id_tipo: int, db: AsyncSession = Depends(get_db_async)):
+    tipo = await db.get(CitaTipo, id_tipo)
+
+    if not tipo:
+        raise HTTPException(status_code=404, detail="No encontrado")
+
+    await db.delete(tipo)
+    await db.commit()
+    return {"message": "Tipo eliminado"}
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_session import get_db_async, get_db_lectura_async
+
+from models.ninos import Nino
+from schemas.ninos import NinoCreate, NinoUpdate, NinoResponse
+
+router = APIRouter(
+    prefix="/ninos",
+    tags=["Niños"]
+)
+
+@router.get("/", response_model=list[NinoResponse])
+async def get_all(db: AsyncSession = Depends(get_db_lectura_async)):
+    return (await db.scalars(select(Nino))).all()
+
+@router.get("/{id_nino}", response_model=NinoResponse)
+async def get(id_nino: int, db: AsyncSession = Depends(get_db_async)):
+    nino = await db.get(Nino, id_nino)
+    if not nino:
+        raise HTTPException(404, "Niño no encontrado")
+    return nino
+
+@router.post("/", response_model=NinoResponse, status_code=status.HTTP_201_CREATED)
+async def crear(data: NinoCreate, db: AsyncSession = Depends(get_db_async)):
+    nuevo = Nino(**data.dict())
+    db.add(nuevo)
+    await db.commit()
+    await db.refresh(nuevo)
+    return nuevo
+
+@router.put("/{id_nino}", response_model=NinoResponse)
+async def actualizar(id_nino: int, data: NinoUpdate, db: AsyncSession = Depends(get_db_async)):
+    nino = await db.get(Nino, id_nino)
+    if not nino:
+        raise HTTPException(404, "Niño no encontrado")
+
+    for k, v in data.dict(exclude_unset=True).items():
+        setattr(nino, k, v)
+
+    await db.commit()
+    await db.refresh(nino)
+    return nino
+
+@router.delete("/{id_nino}", status_code=204)
+async def eliminar(id_nino: int, db: AsyncSession = Depends(get_db_async)):
+    nino = await db.get(Nino, id_nino)
+    if not nino:
+        raise HTTPException(404, "Niño no encontrado")
+    await db.delete(nino)
+    await db.commit()
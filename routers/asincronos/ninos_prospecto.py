@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_session import get_db_async
+from models.ninos_prospecto import NinoProspecto
+from schemas.ninos_prospecto import (
+    ProspectoCreate,
+    ProspectoUpdate,
+    ProspectoResponse
+)
+
+router = APIRouter(prefix="/prospectos", tags=["Niños Prospecto"])
+
+
+# ============================================================
+# GET — Lista completa
+# ============================================================
+@router.get("/", response_model=list[ProspectoResponse])
+async def listar_prospectos(db: AsyncSession = Depends(get_db_async)):
+    return (await db.scalars(select(NinoProspecto))).all()
+
+
+# ============================================================
+# POST — Crear
+# ============================================================
+@router.post("/", response_model=ProspectoResponse)
+async def crear_prospecto(data: ProspectoCreate, db: AsyncSession = Depends(get_db_async)):
+    prospecto = NinoProspecto(**data.dict())
+    db.add(prospecto)
+    await db.commit()
+    await db.refresh(prospecto)
+    return prospecto
+
+
+# ============================================================
+# PUT — Actualizar
+# ============================================================
+@router.put("/{id_prospecto}", response_model=ProspectoResponse)
+async def actualizar_prospecto(id_prospecto: int, data: ProspectoUpdate, db: AsyncSession = Depends(get_db_async)):
+    prospecto = await db.get(NinoProspecto, id_prospecto)
+    if not prospecto:
+        raise HTTPException(status_code=404, detail="Prospecto no encontrado")
+
+    for campo, valor in data.dict(exclude_unset=True).items():
+        setattr(prospecto, campo, valor)
+
+    await db.commit()
+    await db.refresh(prospecto)
+    return prospecto
+
+
+# ============================================================
+# DELETE — Eliminar
+# ============================================================
+@router.delete("/{id_prospecto}")
+async def eliminar_prospecto(id_prospecto: int, db: AsyncSession = Depends(get_db_async)):
+    prospecto = await db.get(NinoProspecto, id_prospecto)
+    if not prospecto:
+        raise HTTPException(status_code=404, detail="Prospecto no encontrado")
+
+    prospecto.activo = False   # 👈 NO se elimina
+    await db.commit()
+
+    return {"mensaje": "Prospecto dado de baja correctamente"}
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_session import get_db_async
+
+from models.terapias import Terapia
+from schemas.terapias import TerapiaCreate, TerapiaUpdate, TerapiaResponse
+
+router = APIRouter(
+    prefix="/terapias",
+    tags=["Terapias"]
+)
+
+# ============================
+# ✔ Obtener todas
+# ============================
+@router.get("/", response_model=list[TerapiaResponse])
+async def get_terapias(db: AsyncSession = Depends(get_db_async)):
+    return (await db.scalars(select(Terapia))).all()
+
+
+# ============================
+# ✔ Obtener por ID
+# ============================
+@router.get("/{id_terapia}", response_model=TerapiaResponse)
+async def get_terapia(id_terapia: int, db: AsyncSession = Depends(get_db_async)):
+    terapia = await db.get(Terapia, id_terapia)
+    if not terapia:
+        raise HTTPException(404, "Terapia no encontrada")
+    return terapia
+
+
+# ============================
+# ✔ Crear
+# ============================
+@router.post("/", response_model=TerapiaResponse, status_code=status.HTTP_201_CREATED)
+async def crear_terapia(data: TerapiaCreate, db: AsyncSession = Depends(get_db_async)):
+    nueva = Terapia(**data.dict())
+    db.add(nueva)
+    await db.commit()
+    await db.refresh(nueva)
+    return nueva
+
+
+# ============================
+# ✔ Modificar
+# ============================
+@router.put("/{id_terapia}", response_model=TerapiaResponse)
+async def actualizar_terapia(id_terapia: int, data: TerapiaUpdate, db: AsyncSession = Depends(get_db_async)):
+    terapia = await db.get(Terapia, id_terapia)
+    if not terapia:
+        raise HTTPException(404, "Terapia no encontrada")
+
+    for k, v in data.dict(exclude_unset=True).items():
+        setattr(terapia, k, v)
+
+    await db.commit()
+    await db.refresh(terapia)
+    return terapia
+
+
+# ============================
+# ✔ Eliminar
+# ============================
+@router.delete("/{id_terapia}", status_code=204)
+async def eliminar_terapia(id_terapia: int, db: AsyncSession = Depends(get_db_async)):
+    terapia = await db.get(Terapia, id_terapia)
+    if not terapia:
+        raise HTTPException(404, "Terapia no encontrada")
+    await db.delete(terapia)
+    await db.commit()
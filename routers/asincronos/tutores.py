@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_session import get_db_async, get_db_lectura_async
+
+from models.tutores import Tutor
+from schemas.tutores import TutorCreate, TutorUpdate, TutorResponse
+
+router = APIRouter(
+    prefix="/tutores",
+    tags=["Tutores"]
+)
+
+@router.get("/", response_model=list[TutorResponse])
+async def listar(db: AsyncSession = Depends(get_db_lectura_async)):
+    return (await db.scalars(select(Tutor))).all()
+
+@router.get("/{id_tutor}", response_model=TutorResponse)
+async def obtener(id_tutor: int, db: AsyncSession = Depends(get_db_async)):
+    tutor = await db.get(Tutor, id_tutor)
+    if not tutor:
+        raise HTTPException(404, "Tutor no encontrado")
+    return tutor
+
+@router.post("/", response_model=TutorResponse, status_code=status.HTTP_201_CREATED)
+async def crear(data: TutorCreate, db: AsyncSession = Depends(get_db_async)):
+    nuevo = Tutor(**data.dict())
+    db.add(nuevo)
+    await db.commit()
+    await db.refresh(nuevo)
+    return nuevo
+
+@router.put("/{id_tutor}", response_model=TutorResponse)
+async def actualizar(id_tutor: int, data: TutorUpdate, db: AsyncSession = Depends(get_db_async)):
+    tutor = await db.get(Tutor, id_tutor)
+    if not tutor:
+        raise HTTPException(404, "Tutor no encontrado")
+
+    for k, v in data.dict(exclude_unset=True).items():
+        setattr(tutor, k, v)
+
+    await db.commit()
+    await db.refresh(tutor)
+    return tutor
+
+@router.delete("/{id_tutor}", status_code=204)
+async def eliminar(id_tutor: int, db: AsyncSession = Depends(get_db_async)):
+    tutor = await db.get(Tutor, id_tutor)
+    if not tutor:
+        raise HTTPException(404, "Tutor no encontrado")
+    await db.delete(tutor)
+    await db.commit()
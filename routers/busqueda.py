@@ -0,0 +1,38 @@
+# ============================================================
+# 🔎 Búsqueda unificada – niños, prospectos, tutores y personal
+# ============================================================
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from core.security import require_role
+from database.session import get_db_lectura
+from schemas.busqueda import ResultadoBusqueda
+from utils.busqueda import indice_busqueda
+
+router = APIRouter(prefix="/buscar", tags=["Búsqueda"])
+
+TipoBusqueda = Literal["nino", "prospecto", "tutor", "personal", "usuario"]
+
+
+@router.get("", response_model=list[ResultadoBusqueda])
+def buscar(
+    q: str = Query(..., min_length=2, max_length=100),
+    tipo: Optional[list[TipoBusqueda]] = Query(None),
+    limite: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_lectura),
+    _: dict = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True))
+):
+    """
+    Busca por nombre (niños, prospectos, tutores, personal), correo, CURP
+    del tutor y nombre/teléfono de contacto del prospecto. No importan
+    acentos ni mayúsculas y tolera errores de dedo ("jose peres").
+    `tipo` se puede repetir para limitar: ?q=ana&tipo=nino&tipo=prospecto
+    """
+    indice_busqueda.asegurar(db.get_bind())
+    return [
+        ResultadoBusqueda(tipo=doc.tipo, id=doc.id, titulo=doc.titulo, detalle=doc.detalle, puntaje=round(puntaje, 3))
+        for doc, puntaje in indice_busqueda.buscar(q, limite, set(tipo) if tipo else None)
+    ]
@@ -1,18 +1,32 @@
 # routers/citas.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import date
-
-from database.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session, aliased, noload, selectinload
+from datetime import date, time
+from typing import Literal, Optional
+import base64
+
+from core.security import require_role
+from database.session import get_db, get_db_lectura
+from database.texto import nombre_completo
 from models.citas import Cita
+from models.cita_tipos import CitaTipo
+from models.ninos import Nino
 from models.ninos_prospecto import NinoProspecto
-from schemas.citas import CitaCreate, CitaUpdate, CitaResponse
-
-from utils.email_notificaciones import (
-    enviar_notificacion_cita_creada,
-    enviar_notificacion_cita_cancelada,
+from models.personal import Personal
+from models.terapias import Terapia
+from models.usuarios import Usuario
+from schemas.citas import (
+    CitaCreate, CitaUpdate, CitaResponse, CitaExpandida, CitaPagina,
+    DisponibilidadResponse, EspacioLibre,
 )
 
+from utils.correos_outbox import encolar_correo
+from utils.disponibilidad import validar_disponibilidad, espacios_libres
+from utils import resumen_citas  # noqa: F401  (mantiene citas_resumen_diario)
+from utils.exportacion import MAX_FILAS_XLSX, XLSX_DISPONIBLE, csv_por_partes, xlsx_por_partes
+
 router = APIRouter(
     prefix="/citas",
     tags=["Citas"]
@@ -30,39 +44,273 @@ def _validar_nino_fuente(data: CitaCreate | CitaUpdate):
 
 
 # ===========================================================
-# 🟢 Obtener todas las citas
+# 🔹 Helpers: cursor (keyset) sobre (fecha desc, hora, id_cita)
 # ===========================================================
-@router.get("/", response_model=list[CitaResponse])
-def get_citas(db: Session = Depends(get_db)):
-    return db.query(Cita).order_by(Cita.fecha.desc(), Cita.hora).all()
+def _codificar_cursor(cita: Cita) -> str:
+    partes = [
+        cita.fecha.isoformat() if cita.fecha else "",
+        cita.hora.isoformat() if cita.hora else "",
+        str(cita.id_cita),
+    ]
+    return base64.urlsafe_b64encode("|".join(partes).encode()).decode()
+
+
+def _decodificar_cursor(cursor: str) -> tuple[date | None, time | None, int]:
+    try:
+        fecha, hora, id_cita = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return (
+            date.fromisoformat(fecha) if fecha else None,
+            time.fromisoformat(hora) if hora else None,
+            int(id_cita),
+        )
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(400, "Cursor inválido")
+
+
+def _despues_del_cursor(fecha: date | None, hora: time | None, id_cita: int):
+    """
+    Condición "fila posterior al cursor" respetando el orden del listado.
+    MySQL y SQLite ponen los NULL al final en DESC y al inicio en ASC.
+    """
+    # fecha DESC (NULL al final)
+    if fecha is None:
+        fecha_despues, fecha_igual = None, Cita.fecha.is_(None)
+    else:
+        fecha_despues = or_(Cita.fecha < fecha, Cita.fecha.is_(None))
+        fecha_igual = Cita.fecha == fecha
+
+    # hora ASC (NULL al inicio)
+    if hora is None:
+        hora_despues, hora_igual = Cita.hora.is_not(None), Cita.hora.is_(None)
+    else:
+        hora_despues, hora_igual = Cita.hora > hora, Cita.hora == hora
+
+    misma_fecha = and_(
+        fecha_igual,
+        or_(hora_despues, and_(hora_igual, Cita.id_cita > id_cita)),
+    )
+    return misma_fecha if fecha_despues is None else or_(fecha_despues, misma_fecha)
 
 
 # ===========================================================
-# 🟢 Obtener cita por ID
+# 🔹 Helper: filtros del listado (y de la exportación)
 # ===========================================================
-@router.get("/{id_cita}", response_model=CitaResponse)
-def get_cita(id_cita: int, db: Session = Depends(get_db)):
-    cita = db.query(Cita).filter(Cita.id_cita == id_cita).first()
-    if not cita:
-        raise HTTPException(404, "Cita no encontrada")
-    return cita
+def _filtrar_citas(query, estado, id_personal, id_terapia, id_tipo, desde, hasta):
+    if estado:
+        query = query.filter(Cita.estado == estado)
+    if id_personal:
+        query = query.filter(Cita.id_personal == id_personal)
+    if id_terapia:
+        query = query.filter(Cita.id_terapia == id_terapia)
+    if id_tipo:
+        query = query.filter(Cita.id_tipo == id_tipo)
+    if desde:
+        query = query.filter(Cita.fecha >= desde)
+    if hasta:
+        query = query.filter(Cita.fecha <= hasta)
+    return query
+
+
+# ===========================================================
+# 🔹 Helper: ?expand=nino,personal,terapia,tipo
+#   Cada relación pedida es una consulta más (selectinload) para
+#   toda la lista, no una por cita. Las no pedidas no se cargan.
+# ===========================================================
+_EXPANSIONES = {
+    "nino": Cita.nino,
+    "personal": Cita.personal,
+    "terapia": Cita.terapia,
+    "tipo": Cita.tipo_cita,
+}
+
+
+def _expansiones(
+    expand: Optional[str] = Query(None, description="Relaciones a incluir, separadas por coma: nino,personal,terapia,tipo"),
+) -> set[str]:
+    pedidas = {e.strip() for e in (expand or "").split(",") if e.strip()}
+    desconocidas = pedidas - _EXPANSIONES.keys()
+    if desconocidas:
+        raise HTTPException(
+            400,
+            f"expand no válido: {', '.join(sorted(desconocidas))} (opciones: {', '.join(_EXPANSIONES)})"
+        )
+    return pedidas
+
+
+def _expandir(query, expand: set[str]):
+    opciones = []
+    for nombre, relacion in _EXPANSIONES.items():
+        if nombre not in expand:
+            opciones.append(noload(relacion))
+        elif nombre == "personal":
+            # El nombre del terapeuta está en su usuario: misma consulta
+            opciones.append(selectinload(relacion).joinedload(Personal.usuario, innerjoin=True))
+        else:
+            opciones.append(selectinload(relacion))
+    return query.options(*opciones)
+
+
+# ===========================================================
+# 🟢 Obtener citas (paginado por cursor + filtros)
+# ===========================================================
+@router.get("/", response_model=CitaPagina)
+def get_citas(
+    estado: Optional[str] = None,
+    id_personal: Optional[int] = None,
+    id_terapia: Optional[int] = None,
+    id_tipo: Optional[int] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limite: int = Query(50, ge=1, le=200),
+    expand: set[str] = Depends(_expansiones),
+    db: Session = Depends(get_db_lectura),
+):
+    query = _filtrar_citas(_expandir(db.query(Cita), expand), estado, id_personal, id_terapia, id_tipo, desde, hasta)
+    if cursor:
+        query = query.filter(_despues_del_cursor(*_decodificar_cursor(cursor)))
+
+    # Se pide una fila extra para saber si hay página siguiente
+    citas = (
+        query.order_by(Cita.fecha.desc(), Cita.hora, Cita.id_cita)
+        .limit(limite + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(citas) > limite:
+        citas = citas[:limite]
+        next_cursor = _codificar_cursor(citas[-1])
+
+    return CitaPagina(items=citas, next_cursor=next_cursor)
+
+
+# ===========================================================
+# 🟢 Disponibilidad de un terapeuta (espacios libres)
+# ===========================================================
+@router.get("/disponibilidad", response_model=DisponibilidadResponse)
+def disponibilidad(
+    id_personal: int,
+    desde: date,
+    hasta: date,
+    duracion_minima: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    if hasta < desde:
+        raise HTTPException(400, "'hasta' debe ser posterior a 'desde'")
+    if (hasta - desde).days > 62:
+        raise HTTPException(400, "El rango máximo es de 62 días")
+
+    espacios = espacios_libres(db, id_personal, desde, hasta, duracion_minima)
+
+    return DisponibilidadResponse(
+        id_personal=id_personal,
+        desde=desde,
+        hasta=hasta,
+        espacios=[EspacioLibre(inicio=i, fin=f) for i, f in espacios],
+    )
+
+
+# ===========================================================
+# 🟢 Exportar citas (CSV / XLSX en streaming)
+# ===========================================================
+_ENCABEZADOS_EXPORT = [
+    "ID", "Fecha", "Hora", "Estado", "Paciente", "Tipo de paciente",
+    "Terapeuta", "Terapia", "Tipo de cita", "Notas",
+]
+
+
+def _consulta_export(db: Session):
+    """Una fila por cita con los nombres ya resueltos en SQL (mismo orden que el listado)."""
+    UsuarioTerapeuta = aliased(Usuario)
+    return (
+        db.query(
+            Cita.id_cita,
+            Cita.fecha,
+            Cita.hora,
+            Cita.estado,
+            func.coalesce(
+                nombre_completo(Nino.nombre, Nino.apellido_paterno, Nino.apellido_materno),
+                nombre_completo(NinoProspecto.nombre, NinoProspecto.apellido_paterno, NinoProspecto.apellido_materno),
+                Cita.nombre_nino_libre,
+            ),
+            case(
+                (Cita.id_nino.is_not(None), "Niño"),
+                (Cita.id_nino_prospecto.is_not(None), "Prospecto"),
+                else_="Nombre libre",
+            ),
+            nombre_completo(UsuarioTerapeuta.nombre, UsuarioTerapeuta.apellido_paterno, UsuarioTerapeuta.apellido_materno),
+            Terapia.nombre_terapia,
+            CitaTipo.nombre_tipo,
+            Cita.notas,
+        )
+        .outerjoin(Nino, Nino.id_nino == Cita.id_nino)
+        .outerjoin(NinoProspecto, NinoProspecto.id_prospecto == Cita.id_nino_prospecto)
+        .outerjoin(Personal, Personal.id_personal == Cita.id_personal)
+        .outerjoin(UsuarioTerapeuta, UsuarioTerapeuta.id_usuario == Personal.id_usuario)
+        .outerjoin(Terapia, Terapia.id_terapia == Cita.id_terapia)
+        .outerjoin(CitaTipo, CitaTipo.id_tipo == Cita.id_tipo)
+    )
+
+
+@router.get("/export")
+def exportar_citas(
+    formato: Literal["csv", "xlsx"] = "csv",
+    estado: Optional[str] = None,
+    id_personal: Optional[int] = None,
+    id_terapia: Optional[int] = None,
+    id_tipo: Optional[int] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    db: Session = Depends(get_db_lectura),
+    _: dict = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True)),
+):
+    """
+    Historial de citas con los mismos filtros que GET /citas/. Las filas
+    se leen con cursor del lado del servidor (yield_per) y se escriben al
+    vuelo, así que la memoria no depende del número de citas.
+    """
+    if formato == "xlsx" and not XLSX_DISPONIBLE:
+        raise HTTPException(400, "La exportación a XLSX requiere XlsxWriter; usa formato=csv")
+
+    query = _filtrar_citas(_consulta_export(db), estado, id_personal, id_terapia, id_tipo, desde, hasta)
+    if formato == "xlsx" and _filtrar_citas(
+        db.query(func.count(Cita.id_cita)), estado, id_personal, id_terapia, id_tipo, desde, hasta
+    ).scalar() >= MAX_FILAS_XLSX:
+        raise HTTPException(400, "Demasiadas citas para una hoja de Excel; usa formato=csv o acota las fechas")
+
+    filas = query.order_by(Cita.fecha.desc(), Cita.hora, Cita.id_cita).yield_per(1000)
+
+    nombre = f"citas_{date.today():%Y%m%d}.{formato}"
+    if formato == "xlsx":
+        contenido = xlsx_por_partes(_ENCABEZADOS_EXPORT, filas, hoja="Citas")
+        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    else:
+        contenido = csv_por_partes(_ENCABEZADOS_EXPORT, filas)
+        media_type = "text/csv; charset=utf-8"
+
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nombre}"'},
+    )
 
 
 # ===========================================================
 # 🟢 Citas de hoy
 # ===========================================================
-@router.get("/hoy", response_model=list[CitaResponse])
-def citas_de_hoy(db: Session = Depends(get_db)):
-    return db.query(Cita).filter(Cita.fecha == date.today()).all()
+@router.get("/hoy", response_model=list[CitaExpandida])
+def citas_de_hoy(expand: set[str] = Depends(_expansiones), db: Session = Depends(get_db)):
+    return _expandir(db.query(Cita), expand).filter(Cita.fecha == date.today()).all()
 
 
 # ===========================================================
 # 🟢 Citas sin niño formal (prospectos o solo nombre)
 # ===========================================================
-@router.get("/prospectos", response_model=list[CitaResponse])
-def citas_prospectos(db: Session = Depends(get_db)):
+@router.get("/prospectos", response_model=list[CitaExpandida])
+def citas_prospectos(expand: set[str] = Depends(_expansiones), db: Session = Depends(get_db)):
     return (
-        db.query(Cita)
+        _expandir(db.query(Cita), expand)
         .filter(Cita.id_nino.is_(None))
         .filter((Cita.id_nino_prospecto.is_not(None)) | (Cita.nombre_nino_libre.is_not(None)))
         .order_by(Cita.fecha.desc(), Cita.hora)
@@ -70,6 +318,19 @@ def citas_prospectos(db: Session = Depends(get_db)):
     )
 
 
+# ===========================================================
+# 🟢 Obtener cita por ID
+#   Después de las rutas fijas (/hoy, /prospectos, /export, ...): si no,
+#   "/{id_cita}" las atrapa y responde 422
+# ===========================================================
+@router.get("/{id_cita}", response_model=CitaExpandida)
+def get_cita(id_cita: int, expand: set[str] = Depends(_expansiones), db: Session = Depends(get_db)):
+    cita = _expandir(db.query(Cita), expand).filter(Cita.id_cita == id_cita).first()
+    if not cita:
+        raise HTTPException(404, "Cita no encontrada")
+    return cita
+
+
 # ===========================================================
 # 🟢 Crear nueva cita (niño formal, prospecto o solo nombre)
 # ===========================================================
@@ -77,19 +338,19 @@ def citas_prospectos(db: Session = Depends(get_db)):
 def crear_cita(data: CitaCreate, db: Session = Depends(get_db)):
 
     _validar_nino_fuente(data)
+    validar_disponibilidad(db, data.id_personal, data.fecha, data.hora, data.id_terapia)
 
     nueva = Cita(**data.dict(exclude_unset=True))
     db.add(nueva)
+    db.flush()
+
+    # Notificación por correo: se encola en la misma transacción y
+    # el despachador en segundo plano la envía (la respuesta no espera SMTP)
+    encolar_correo(db, nueva.id_cita, "cita_creada")
+
     db.commit()
     db.refresh(nueva)
 
-    # Notificación por correo (solo si hay niño formal o prospecto con correo)
-    try:
-        enviar_notificacion_cita_creada(nueva, db)
-    except Exception:
-        # no rompemos la API por falla de correo
-        pass
-
     return nueva
 
 
@@ -114,6 +375,13 @@ def actualizar_cita(id_cita: int, data: CitaUpdate, db: Session = Depends(get_db
     for key, value in data.dict(exclude_unset=True).items():
         setattr(cita, key, value)
 
+    # Con los valores ya combinados (payload + lo que tenía la cita)
+    if cita.estado != "Cancelada":
+        validar_disponibilidad(
+            db, cita.id_personal, cita.fecha, cita.hora, cita.id_terapia,
+            excluir_id_cita=cita.id_cita,
+        )
+
     db.commit()
     db.refresh(cita)
 
@@ -131,14 +399,10 @@ def cancelar_cita(id_cita: int, db: Session = Depends(get_db)):
         raise HTTPException(404, "Cita no encontrada")
 
     cita.estado = "Cancelada"
+    encolar_correo(db, cita.id_cita, "cita_cancelada")
     db.commit()
     db.refresh(cita)
 
-    try:
-        enviar_notificacion_cita_cancelada(cita, db)
-    except Exception:
-        pass
-
     return cita
 
 
@@ -182,14 +446,14 @@ def asociar_nino_definitivo(id_cita: int, id_nino: int, db: Session = Depends(ge
 # ===========================================================
 # 🟢 Citas por terapeuta
 # ===========================================================
-@router.get("/terapeuta/{id_personal}", response_model=list[CitaResponse])
-def citas_por_terapeuta(id_personal: int, db: Session = Depends(get_db)):
-    return db.query(Cita).filter(Cita.id_personal == id_personal).all()
+@router.get("/terapeuta/{id_personal}", response_model=list[CitaExpandida])
+def citas_por_terapeuta(id_personal: int, expand: set[str] = Depends(_expansiones), db: Session = Depends(get_db)):
+    return _expandir(db.query(Cita), expand).filter(Cita.id_personal == id_personal).all()
 
 
 # ===========================================================
 # 🟢 Citas por niño formal
 # ===========================================================
-@router.get("/nino/{id_nino}", response_model=list[CitaResponse])
-def citas_por_nino(id_nino: int, db: Session = Depends(get_db)):
-    return db.query(Cita).filter(Cita.id_nino == id_nino).all()
+@router.get("/nino/{id_nino}", response_model=list[CitaExpandida])
+def citas_por_nino(id_nino: int, expand: set[str] = Depends(_expansiones), db: Session = Depends(get_db)):
+    return _expandir(db.query(Cita), expand).filter(Cita.id_nino == id_nino).all()
@@ -6,6 +6,7 @@ from database import get_db
 from models import usuarios, roles
 from schemas import usuarios as usuarios_schema
 from core.deps import get_current_user, require_role
+from core.cache_roles import UsuarioActual
 
 router = APIRouter(
     prefix="/coordinadores",
@@ -15,7 +16,7 @@ router = APIRouter(
 @router.get("/", response_model=List[usuarios_schema.UsuarioOut])
 def listar_coordinadores(
     db: Session = Depends(get_db),
-    _: usuarios.Usuario = Depends(require_role(["Administrador"]))
+    _: UsuarioActual = Depends(require_role(["Administrador"], solo_lectura=True))
 ):
     """
     Devuelve la lista de usuarios con rol 'Coordinador'.
@@ -33,7 +34,7 @@ def listar_coordinadores(
 def obtener_coordinador(
     id_coordinador: int,
     db: Session = Depends(get_db),
-    _: usuarios.Usuario = Depends(require_role(["Administrador", "Coordinador"]))
+    _: UsuarioActual = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True))
 ):
     """
     Obtiene un coordinador por su ID.
@@ -49,7 +50,7 @@ def actualizar_coordinador(
     id_coordinador: int,
     datos_actualizados: usuarios_schema.UsuarioUpdate,
     db: Session = Depends(get_db),
-    _: usuarios.Usuario = Depends(require_role(["Administrador"]))
+    _: UsuarioActual = Depends(require_role(["Administrador"]))
 ):
     """
     Actualiza los datos de un coordinador.
@@ -71,7 +72,7 @@ def actualizar_coordinador(
 def eliminar_coordinador(
     id_coordinador: int,
     db: Session = Depends(get_db),
-    _: usuarios.Usuario = Depends(require_role(["Administrador"]))
+    _: UsuarioActual = Depends(require_role(["Administrador"]))
 ):
     """
     Elimina un coordinador por su ID.
@@ -0,0 +1,122 @@
+# ============================================================
+# 📊 Dashboard – resumen de citas, niños y personal
+# ============================================================
+
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.security import require_role
+from database.session import get_db_lectura
+from database.texto import nombre_completo
+from models.citas_resumen import CitaResumenDiario as Resumen
+from models.ninos import Nino
+from models.personal import Personal
+from models.terapias import Terapia
+from models.usuarios import Usuario
+from schemas.dashboard import ConteoEstado, ConteoTerapeuta, ConteoTerapia, ResumenDashboard
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+def _por_estado(db: Session, *filtros) -> list[ConteoEstado]:
+    filas = (
+        db.query(Resumen.estado, func.sum(Resumen.total).label("total"))
+        .filter(*filtros)
+        .group_by(Resumen.estado)
+        .having(func.sum(Resumen.total) > 0)
+        .order_by(Resumen.estado)
+        .all()
+    )
+    return [ConteoEstado(estado=f.estado, total=f.total) for f in filas]
+
+
+# ============================================================
+# GET – Resumen
+# ============================================================
+
+@router.get("/resumen", response_model=ResumenDashboard)
+def obtener_resumen(
+    fecha: Optional[date] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    db: Session = Depends(get_db_lectura),
+    _: dict = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True))
+):
+    """
+    Citas del día (`fecha`, default hoy) y del rango `desde`..`hasta`
+    (default: los 30 días que terminan en `fecha`), más niños y personal
+    activos. Las citas salen de citas_resumen_diario: cada consulta lee a
+    lo más días × terapeutas × terapias × estados filas, no la tabla citas.
+    """
+    hoy = fecha or date.today()
+    hasta = hasta or hoy
+    desde = desde or hasta - timedelta(days=29)
+    if hasta < desde:
+        raise HTTPException(400, "'hasta' debe ser posterior a 'desde'")
+
+    en_rango = Resumen.fecha.between(desde, hasta)
+    citas_hoy_por_estado = _por_estado(db, Resumen.fecha == hoy)
+
+    cancelaciones = (
+        db.query(Resumen.id_personal, func.sum(Resumen.total).label("total"))
+        .filter(en_rango, Resumen.estado == "Cancelada")
+        .group_by(Resumen.id_personal)
+        .having(func.sum(Resumen.total) > 0)
+        .subquery()
+    )
+    filas_cancelaciones = (
+        db.query(
+            cancelaciones.c.id_personal,
+            nombre_completo(Usuario.nombre, Usuario.apellido_paterno, Usuario.apellido_materno).label("nombre"),
+            cancelaciones.c.total,
+        )
+        .outerjoin(Personal, Personal.id_personal == cancelaciones.c.id_personal)
+        .outerjoin(Usuario, Usuario.id_usuario == Personal.id_usuario)
+        .order_by(cancelaciones.c.total.desc())
+        .all()
+    )
+
+    por_terapia = (
+        db.query(Resumen.id_terapia, func.sum(Resumen.total).label("total"))
+        .filter(en_rango)
+        .group_by(Resumen.id_terapia)
+        .having(func.sum(Resumen.total) > 0)
+        .subquery()
+    )
+    filas_terapia = (
+        db.query(por_terapia.c.id_terapia, Terapia.nombre_terapia, por_terapia.c.total)
+        .outerjoin(Terapia, Terapia.id_terapia == por_terapia.c.id_terapia)
+        .order_by(por_terapia.c.total.desc())
+        .all()
+    )
+
+    ninos_activos = db.query(func.count(Nino.id_nino)).filter(Nino.activo == 1).scalar()
+    personal_activo = (
+        db.query(func.count(Personal.id_personal))
+        .join(Usuario, Usuario.id_usuario == Personal.id_usuario)
+        .filter(Usuario.activo.is_(True))
+        .scalar()
+    )
+
+    return ResumenDashboard(
+        fecha=hoy,
+        desde=desde,
+        hasta=hasta,
+        citas_hoy=sum(c.total for c in citas_hoy_por_estado),
+        citas_hoy_por_estado=citas_hoy_por_estado,
+        citas_por_estado=_por_estado(db, en_rango),
+        cancelaciones_por_terapeuta=[
+            ConteoTerapeuta(id_personal=f.id_personal or None, nombre=f.nombre, total=f.total)
+            for f in filas_cancelaciones
+        ],
+        citas_por_terapia=[
+            ConteoTerapia(id_terapia=f.id_terapia or None, nombre=f.nombre_terapia, total=f.total)
+            for f in filas_terapia
+        ],
+        ninos_activos=ninos_activos,
+        personal_activo=personal_activo,
+    )
@@ -16,6 +16,6 @@ router = APIRouter(
 @router.get("/", response_model=List[GradoAcademicoOut])
 def listar_grados(
     db: Session = Depends(get_db),
-    _: dict = Depends(require_role(["Administrador", "Coordinador"]))
+    _: dict = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True))
 ):
     return db.query(GradoAcademico).order_by(GradoAcademico.nombre).all()
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from database.session import get_db
+from database.session import get_db, get_db_lectura
 
 from models.ninos import Nino
 from schemas.ninos import NinoCreate, NinoUpdate, NinoResponse
@@ -11,7 +11,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=list[NinoResponse])
-def get_all(db: Session = Depends(get_db)):
+def get_all(db: Session = Depends(get_db_lectura)):
     return db.query(Nino).all()
 
 @router.get("/{id_nino}", response_model=NinoResponse)
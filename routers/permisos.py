@@ -16,7 +16,7 @@ router = APIRouter(
 @router.get("/", response_model=List[PermisoBase])
 def listar_permisos(
     db: Session = Depends(get_db),
-    _: dict = Depends(require_role(["Administrador"]))
+    _: dict = Depends(require_role(["Administrador"], solo_lectura=True))
 ):
     permisos = db.query(Permiso).all()
     return permisos
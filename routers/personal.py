@@ -3,24 +3,31 @@
 # ============================================================
 
 from fastapi import (
-    APIRouter, Depends, Form, UploadFile, File, HTTPException
+    APIRouter, Depends, Form, UploadFile, File, HTTPException, Query
 )
 from pydantic import BaseModel
+from sqlalchemy import Boolean, String, and_, func, or_, type_coerce
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 from pathlib import Path
-import shutil
+import base64
+import json
 
-from database.session import get_db
-from core.security import require_role, hash_password
+from config.settings import settings
+from database.session import get_db, get_db_lectura
+from database.texto import nombre_completo, normalizar, sin_acentos
+from core.security import require_role, hash_password_async
 
 from models.usuarios import Usuario
 from models.personal import Personal
 from models.roles import Rol
 from models.grados_academicos import GradoAcademico
 
-from schemas.personal import PersonalListItem, PersonalDetalle
+from schemas.personal import PersonalDetalle, PersonalPagina
+from utils.almacen import BlobRecibido, liberar_blob, recibir_blob, registrar_blob
+from utils.miniaturas import programar_derivados, ruta_miniatura
 
 
 # ============================================================
@@ -36,20 +43,100 @@ for d in (FOTOS_DIR, CV_DIR, COMP_DIR):
     d.mkdir(parents=True, exist_ok=True)
 
 
-def save_upload_file(file: UploadFile, folder: Path, prefix: str) -> str:
-    """Guarda un archivo subido y regresa la ruta accesible por /static"""
+# Tamaño máximo por tipo de archivo
+MAX_BYTES_POR_CARPETA = {
+    FOTOS_DIR: settings.MAX_FOTO_MB * 1024 * 1024,
+    CV_DIR: settings.MAX_CV_MB * 1024 * 1024,
+    COMP_DIR: settings.MAX_COMPROBANTE_MB * 1024 * 1024,
+}
+
+
+async def recibir_upload(file: UploadFile | None, folder: Path) -> BlobRecibido | None:
+    """
+    Copia un archivo subido a un temporal del almacén por contenido
+    (utils/almacen.py); `folder` define el tamaño máximo. La referencia se
+    registra después con registrar_blob, en el mismo hilo que el commit.
+    """
     if not file:
-        return ""
+        return None
+    return await recibir_blob(file, MAX_BYTES_POR_CARPETA[folder])
+
+
+def _descartar(*recibidos: BlobRecibido | None):
+    for recibido in recibidos:
+        if recibido:
+            recibido.descartar()
+
+
+def _validar_catalogos(db: Session, id_rol: int, id_grado: Optional[int], correo: str, id_usuario: Optional[int] = None):
+    """Rol, grado y correo único (excepto el mismo usuario al editar)."""
+    if not db.query(Rol).filter(Rol.id_rol == id_rol).first():
+        raise HTTPException(400, "Rol inválido")
+
+    if id_grado and not db.query(GradoAcademico).filter(GradoAcademico.id_grado == id_grado).first():
+        raise HTTPException(400, "Grado académico inválido")
 
-    ext = Path(file.filename).suffix
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{prefix}_{timestamp}{ext}"
-    destination = folder / filename
+    duplicado = db.query(Usuario).filter(Usuario.correo == correo)
+    if id_usuario is not None:
+        duplicado = duplicado.filter(Usuario.id_usuario != id_usuario)
+    if duplicado.first():
+        raise HTTPException(400, "Ya existe un usuario con ese correo")
 
-    with destination.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
 
-    return f"/static/{folder.name}/{filename}"
+def parse_date(value):
+    try:
+        return datetime.fromisoformat(value).date() if value else None
+    except ValueError:
+        return None
+
+
+# ============================================================
+# Listado: columnas calculadas en SQL y cursor (keyset)
+# ============================================================
+
+_NOMBRE_COMPLETO = nombre_completo(Usuario.nombre, Usuario.apellido_paterno, Usuario.apellido_materno)
+_INICIALES = func.upper(
+    func.substr(Usuario.nombre, 1, 1, type_=String)
+    + func.substr(func.coalesce(Usuario.apellido_paterno, ""), 1, 1, type_=String)
+)
+_ACTIVO = type_coerce(func.coalesce(Usuario.activo, False), Boolean)
+
+# Mismos nombres que PersonalListItem
+_COLUMNAS_LISTA = (
+    Personal.id_personal,
+    _NOMBRE_COMPLETO.label("nombre"),
+    Usuario.correo.label("email"),
+    func.coalesce(Usuario.telefono, "").label("telefono"),
+    Rol.nombre_rol.label("rol"),
+    GradoAcademico.nombre.label("grado_academico"),
+    _ACTIVO.label("activo"),
+    Usuario.foto_perfil.label("foto"),
+    _INICIALES.label("iniciales"),
+)
+_CAMPOS_LISTA = [c.key for c in _COLUMNAS_LISTA]
+
+# Desempate por id_usuario (índice ix_usuarios_nombre_id)
+_ORDENES = {"nombre": Usuario.nombre, "correo": Usuario.correo}
+
+
+def _codificar_cursor(orden: str, valor: str, id_usuario: int) -> str:
+    return base64.urlsafe_b64encode(f"{orden}|{id_usuario}|{valor}".encode()).decode()
+
+
+def _decodificar_cursor(cursor: str, orden: str) -> tuple[str, int]:
+    try:
+        orden_cursor, id_usuario, valor = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 2)
+        if orden_cursor != orden:
+            raise ValueError
+        return valor, int(id_usuario)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(400, "Cursor inválido")
+
+
+def _item_lista(fila) -> dict:
+    item = {campo: getattr(fila, campo) for campo in _CAMPOS_LISTA}
+    item["foto"] = ruta_miniatura(item["foto"])
+    return item
 
 
 # ============================================================
@@ -63,53 +150,68 @@ router = APIRouter(prefix="/personal", tags=["Personal"])
 # GET – LISTA DE PERSONAL
 # ============================================================
 
-@router.get("/", response_model=List[PersonalListItem])
+@router.get("/", response_model=PersonalPagina)
 def listar_personal(
-    db: Session = Depends(get_db),
-    _: dict = Depends(require_role(["Administrador", "Coordinador"]))
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
+    id_rol: Optional[int] = None,
+    id_grado: Optional[int] = None,
+    activo: Optional[bool] = None,
+    orden: str = Query("nombre", pattern="^-?(nombre|correo)$"),
+    cursor: Optional[str] = None,
+    limite: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db_lectura),
+    _: dict = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True))
 ):
+    """
+    Página de personal ordenada por nombre o correo ("-" = descendente).
+    `q` busca en nombre completo y correo sin importar acentos/mayúsculas.
+    Para la siguiente página se manda el `next_cursor` recibido.
+    """
+    descendente = orden.startswith("-")
+    orden = orden.lstrip("-")
+    clave = _ORDENES[orden]
+
     query = (
-        db.query(
-            Personal.id_personal,
-            Usuario.nombre,
-            Usuario.apellido_paterno,
-            Usuario.apellido_materno,
-            Usuario.correo,
-            Usuario.telefono,
-            Usuario.activo,
-            Usuario.foto_perfil,
-            Rol.nombre_rol.label("rol"),
-            GradoAcademico.nombre.label("grado_academico"),
-        )
+        db.query(*_COLUMNAS_LISTA, Usuario.id_usuario, clave.label("clave"))
         .join(Usuario, Personal.id_usuario == Usuario.id_usuario)
         .join(Rol, Usuario.id_rol == Rol.id_rol)
         .outerjoin(GradoAcademico, Personal.id_grado == GradoAcademico.id_grado)
-        .order_by(Usuario.nombre)
-        .all()
     )
 
-    salida = []
+    if q and q.strip():
+        termino = normalizar(q.strip())
+        query = query.filter(or_(
+            sin_acentos(_NOMBRE_COMPLETO).contains(termino, autoescape=True),
+            sin_acentos(Usuario.correo).contains(termino, autoescape=True),
+        ))
+    if id_rol:
+        query = query.filter(Usuario.id_rol == id_rol)
+    if id_grado:
+        query = query.filter(Personal.id_grado == id_grado)
+    if activo is not None:
+        query = query.filter(_ACTIVO == activo)
+    if cursor:
+        valor, id_usuario = _decodificar_cursor(cursor, orden)
+        if descendente:
+            query = query.filter(or_(clave < valor, and_(clave == valor, Usuario.id_usuario < id_usuario)))
+        else:
+            query = query.filter(or_(clave > valor, and_(clave == valor, Usuario.id_usuario > id_usuario)))
+
+    if descendente:
+        query = query.order_by(clave.desc(), Usuario.id_usuario.desc())
+    else:
+        query = query.order_by(clave, Usuario.id_usuario)
 
-    for r in query:
-        nombre_completo = f"{r.nombre} {r.apellido_paterno or ''} {r.apellido_materno or ''}".strip()
-        iniciales = ((r.nombre or "")[:1] + (r.apellido_paterno or "")[:1]).upper()
+    # Se pide una fila extra para saber si hay página siguiente
+    filas = query.limit(limite + 1).all()
 
-        salida.append(
-            PersonalListItem(
-                id_personal=r.id_personal,
-                nombre=nombre_completo,
-                email=r.correo,
-                telefono=r.telefono or "",
-                rol=r.rol,
-                iniciales=iniciales,
-                calificacion=0.0,
-                activo=bool(r.activo),
-                foto=r.foto_perfil,
-                grado_academico=r.grado_academico,
-            )
-        )
+    next_cursor = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        next_cursor = _codificar_cursor(orden, filas[-1].clave, filas[-1].id_usuario)
 
-    return salida
+    # Página acotada por `limite` (≤ 200 filas): se arma completa y pasa por PersonalPagina
+    return PersonalPagina(items=[_item_lista(f) for f in filas], next_cursor=next_cursor)
 
 
 # ============================================================
@@ -120,7 +222,7 @@ def listar_personal(
 def obtener_personal(
     id_personal: int,
     db: Session = Depends(get_db),
-    _: dict = Depends(require_role(["Administrador", "Coordinador"]))
+    _: dict = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True))
 ):
 
     result = (
@@ -214,22 +316,19 @@ async def crear_personal(
     _: dict = Depends(require_role(["Administrador", "Coordinador"]))
 ):
 
-    # Validar rol
-    if not db.query(Rol).filter(Rol.id_rol == id_rol).first():
-        raise HTTPException(400, "Rol inválido")
-
-    # Validar grado
-    if id_grado and not db.query(GradoAcademico).filter(GradoAcademico.id_grado == id_grado).first():
-        raise HTTPException(400, "Grado académico inválido")
+    # Las consultas corren en el threadpool: este handler es async por los archivos
+    await run_in_threadpool(_validar_catalogos, db, id_rol, id_grado, correo)
 
-    # Validar correo duplicado
-    if db.query(Usuario).filter(Usuario.correo == correo).first():
-        raise HTTPException(400, "Ya existe un usuario con ese correo")
-
-    # Guardar archivos
-    foto_path = save_upload_file(foto_perfil, FOTOS_DIR, f"foto_{correo}") if foto_perfil else ""
-    cv_path = save_upload_file(cv_archivo, CV_DIR, f"cv_{correo}") if cv_archivo else ""
-    comp_path = save_upload_file(comprobante_domicilio, COMP_DIR, f"comp_{correo}") if comprobante_domicilio else ""
+    # Archivos a temporales (sin tocar la BD)
+    foto = cv = comp = None
+    try:
+        foto = await recibir_upload(foto_perfil, FOTOS_DIR)
+        cv = await recibir_upload(cv_archivo, CV_DIR)
+        comp = await recibir_upload(comprobante_domicilio, COMP_DIR)
+        contrasena_hash = await hash_password_async(contrasena)
+    except BaseException:
+        _descartar(foto, cv, comp)
+        raise
 
     # Crear usuario
     user = Usuario(
@@ -239,24 +338,13 @@ async def crear_personal(
         correo=correo,
         telefono=telefono or None,
         id_rol=id_rol,
-        contrasena_hash=hash_password(contrasena),
+        contrasena_hash=contrasena_hash,
         activo=True,
-        foto_perfil=foto_path or None,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    # Parseo de fechas
-    def parse_date(value):
-        try:
-            return datetime.fromisoformat(value).date() if value else None
-        except:
-            return None
 
     # Crear personal
     personal = Personal(
-        id_usuario=user.id_usuario,
+        usuario=user,
         fecha_nacimiento=parse_date(fecha_nacimiento),
         fecha_ingreso=parse_date(fecha_ingreso),
         id_grado=id_grado,
@@ -271,16 +359,36 @@ async def crear_personal(
         domicilio_cp=domicilio_cp or None,
         domicilio_municipio=domicilio_municipio or None,
         domicilio_estado=domicilio_estado or None,
-        cv_archivo=cv_path or None,
-        comprobante_domicilio=comp_path or None,
         experiencia=experiencia or None,
     )
 
-    db.add(personal)
-    db.commit()
-    db.refresh(personal)
+    # Usuario, personal y referencias a los archivos en una sola transacción,
+    # en un solo hilo: los candados de archivos_blob duran hasta el commit
+    # Regresa valores simples: después del commit los objetos están expirados
+    # y leerlos en el event loop dispararía un SELECT
+    def guardar():
+        ruta_foto = None
+        try:
+            if foto:
+                user.foto_perfil = ruta_foto = registrar_blob(db, foto)
+            if cv:
+                personal.cv_archivo = registrar_blob(db, cv)
+            if comp:
+                personal.comprobante_domicilio = registrar_blob(db, comp)
+            db.add(personal)
+            db.commit()
+        except BaseException:
+            _descartar(foto, cv, comp)
+            raise
+        return personal.id_personal, ruta_foto
 
-    return {"mensaje": "Personal creado correctamente", "id_personal": personal.id_personal}
+    id_personal, ruta_foto = await run_in_threadpool(guardar)
+
+    if ruta_foto:
+        # Miniaturas en segundo plano; mientras tanto se sirve la original
+        programar_derivados(ruta_foto)
+
+    return {"mensaje": "Personal creado correctamente", "id_personal": id_personal}
 
 
 # ============================================================
@@ -326,6 +434,9 @@ def eliminar_personal(
     if not personal:
         raise HTTPException(404, "Personal no encontrado")
 
+    liberar_blob(db, personal.cv_archivo)
+    liberar_blob(db, personal.comprobante_domicilio)
+
     db.delete(personal)
     db.commit()
     return {"status": "ok"}
@@ -371,58 +482,33 @@ async def editar_personal(
     _: dict = Depends(require_role(["Administrador", "Coordinador"]))
 ):
 
-    personal = db.query(Personal).filter(Personal.id_personal == id_personal).first()
-    if not personal:
-        raise HTTPException(404, "Personal no encontrado")
+    # Las consultas corren en el threadpool: este handler es async por los archivos
+    def cargar_y_validar():
+        personal = db.query(Personal).filter(Personal.id_personal == id_personal).first()
+        if not personal:
+            raise HTTPException(404, "Personal no encontrado")
 
-    user = personal.usuario
+        user = personal.usuario
 
-    # ===========================================
-    # VALIDACIONES
-    # ===========================================
+        # ===========================================
+        # VALIDACIONES
+        # ===========================================
+        _validar_catalogos(db, id_rol, id_grado, correo, id_usuario=user.id_usuario)
+        return personal, user
 
-    # Validar rol
-    if not db.query(Rol).filter(Rol.id_rol == id_rol).first():
-        raise HTTPException(400, "Rol inválido")
-
-    # Validar grado académico
-    if id_grado:
-        if not db.query(GradoAcademico).filter(GradoAcademico.id_grado == id_grado).first():
-            raise HTTPException(400, "Grado académico inválido")
-
-    # Correo duplicado (excepto el mismo usuario)
-    correo_existente = db.query(Usuario).filter(
-        Usuario.correo == correo,
-        Usuario.id_usuario != user.id_usuario
-    ).first()
-
-    if correo_existente:
-        raise HTTPException(400, "Ya existe un usuario con ese correo")
+    personal, user = await run_in_threadpool(cargar_y_validar)
 
     # ===========================================
-    # GUARDAR ARCHIVOS SOLO SI LOS CAMBIA
+    # ARCHIVOS QUE CAMBIAN (a temporales, sin tocar la BD)
     # ===========================================
-
-    if foto_perfil:
-        user.foto_perfil = save_upload_file(foto_perfil, FOTOS_DIR, f"foto_{correo}")
-
-    if cv_archivo:
-        personal.cv_archivo = save_upload_file(cv_archivo, CV_DIR, f"cv_{correo}")
-
-    if comprobante_domicilio:
-        personal.comprobante_domicilio = save_upload_file(
-            comprobante_domicilio, COMP_DIR, f"comp_{correo}"
-        )
-
-    # ===========================================
-    # PARSEO SEGURO DE FECHAS
-    # ===========================================
-
-    def parse_date(value):
-        try:
-            return datetime.fromisoformat(value).date() if value else None
-        except:
-            return None
+    foto = cv = comp = None
+    try:
+        foto = await recibir_upload(foto_perfil, FOTOS_DIR)
+        cv = await recibir_upload(cv_archivo, CV_DIR)
+        comp = await recibir_upload(comprobante_domicilio, COMP_DIR)
+    except BaseException:
+        _descartar(foto, cv, comp)
+        raise
 
     # ===========================================
     # ACTUALIZAR USUARIO
@@ -455,6 +541,30 @@ async def editar_personal(
     personal.domicilio_estado = domicilio_estado or None
     personal.experiencia = experiencia or None
 
-    db.commit()
+    # El archivo anterior pierde una referencia (se borra en la recolección
+    # de basura). Referencias y commit en un solo hilo: los candados de
+    # archivos_blob no se mantienen a través de awaits
+    def guardar():
+        ruta_foto = None
+        try:
+            if foto:
+                liberar_blob(db, user.foto_perfil)
+                user.foto_perfil = ruta_foto = registrar_blob(db, foto)
+            if cv:
+                liberar_blob(db, personal.cv_archivo)
+                personal.cv_archivo = registrar_blob(db, cv)
+            if comp:
+                liberar_blob(db, personal.comprobante_domicilio)
+                personal.comprobante_domicilio = registrar_blob(db, comp)
+            db.commit()
+        except BaseException:
+            _descartar(foto, cv, comp)
+            raise
+        return ruta_foto
+
+    ruta_foto = await run_in_threadpool(guardar)
+
+    if ruta_foto:
+        programar_derivados(ruta_foto)
 
     return {"mensaje": "Personal actualizado correctamente"}
@@ -12,6 +12,6 @@ router = APIRouter(prefix="/roles", tags=["Roles"])
 @router.get("/", response_model=List[RolOut])
 def listar_roles(
     db: Session = Depends(get_db),
-    _: dict = Depends(require_role(["Administrador", "Coordinador"]))
+    _: dict = Depends(require_role(["Administrador", "Coordinador"], solo_lectura=True))
 ):
     return db.query(Rol).order_by(Rol.nombre_rol).all()
@@ -66,3 +66,5 @@ def eliminar_terapia(id_terapia: int, db: Session = Depends(get_db)):
     terapia = db.query(Terapia).filter(Terapia.id_terapia == id_terapia).first()
     if not terapia:
         raise HTTPException(404, "Terapia no encontrada")
+    db.delete(terapia)
+    db.commit()
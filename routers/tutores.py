@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from database.session import get_db
+from database.session import get_db, get_db_lectura
 
 from models.tutores import Tutor
 from schemas.tutores import TutorCreate, TutorUpdate, TutorResponse
@@ -11,7 +11,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=list[TutorResponse])
-def listar(db: Session = Depends(get_db)):
+def listar(db: Session = Depends(get_db_lectura)):
     return db.query(Tutor).all()
 
 @router.get("/{id_tutor}", response_model=TutorResponse)
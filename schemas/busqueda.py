@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class ResultadoBusqueda(BaseModel):
+    tipo: str              # nino | prospecto | tutor | personal | usuario
+    id: int                # id_nino, id_prospecto, id_tutor, id_personal o id_usuario
+    titulo: str
+    detalle: str | None = None
+    puntaje: float
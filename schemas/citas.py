@@ -1,6 +1,6 @@
 # schemas/citas.py
-from datetime import date, time
-from pydantic import BaseModel
+from datetime import date, time, datetime
+from pydantic import AliasPath, BaseModel, Field
 from typing import Optional
 
 
@@ -43,3 +43,64 @@ class CitaResponse(CitaBase):
     estado: str
 
     model_config = {"from_attributes": True}
+
+
+# ===========================================================
+# Resúmenes para ?expand= (nino, personal, terapia, tipo)
+# ===========================================================
+class NinoResumen(BaseModel):
+    id_nino: int
+    nombre: str
+    apellido_paterno: Optional[str] = None
+    apellido_materno: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class PersonalResumen(BaseModel):
+    id_personal: int
+    # El nombre vive en el usuario del terapeuta
+    nombre: str = Field(validation_alias=AliasPath("usuario", "nombre"))
+    apellido_paterno: Optional[str] = Field(None, validation_alias=AliasPath("usuario", "apellido_paterno"))
+    apellido_materno: Optional[str] = Field(None, validation_alias=AliasPath("usuario", "apellido_materno"))
+
+    model_config = {"from_attributes": True}
+
+
+class TerapiaResumen(BaseModel):
+    id_terapia: int
+    nombre_terapia: str
+
+    model_config = {"from_attributes": True}
+
+
+class CitaTipoResumen(BaseModel):
+    id_tipo: int
+    nombre_tipo: str
+
+    model_config = {"from_attributes": True}
+
+
+class CitaExpandida(CitaResponse):
+    # Solo vienen llenos los pedidos en ?expand=; los demás, null
+    nino: Optional[NinoResumen] = None
+    personal: Optional[PersonalResumen] = None
+    terapia: Optional[TerapiaResumen] = None
+    tipo_cita: Optional[CitaTipoResumen] = None
+
+
+class CitaPagina(BaseModel):
+    items: list[CitaExpandida]
+    next_cursor: Optional[str] = None
+
+
+class EspacioLibre(BaseModel):
+    inicio: datetime
+    fin: datetime
+
+
+class DisponibilidadResponse(BaseModel):
+    id_personal: int
+    desde: date
+    hasta: date
+    espacios: list[EspacioLibre]
@@ -0,0 +1,38 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ConteoEstado(BaseModel):
+    estado: str
+    total: int
+
+
+class ConteoTerapeuta(BaseModel):
+    id_personal: Optional[int]      # None = citas sin terapeuta asignado
+    nombre: Optional[str]
+    total: int
+
+
+class ConteoTerapia(BaseModel):
+    id_terapia: Optional[int]       # None = citas sin terapia
+    nombre: Optional[str]
+    total: int
+
+
+class ResumenDashboard(BaseModel):
+    fecha: date
+    desde: date
+    hasta: date
+
+    citas_hoy: int
+    citas_hoy_por_estado: list[ConteoEstado]
+
+    # Del rango desde..hasta
+    citas_por_estado: list[ConteoEstado]
+    cancelaciones_por_terapeuta: list[ConteoTerapeuta]
+    citas_por_terapia: list[ConteoTerapia]
+
+    ninos_activos: int
+    personal_activo: int
@@ -29,11 +29,17 @@ class PersonalListItem(BaseModel):
     telefono: Optional[str]
     activo: bool
     foto: Optional[str]
+    iniciales: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class PersonalPagina(BaseModel):
+    items: list[PersonalListItem]
+    next_cursor: Optional[str] = None
+
+
 class PersonalDetalle(BaseModel):
     id_personal: int
     id_usuario: int
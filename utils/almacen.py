@@ -0,0 +1,194 @@
+# utils/almacen.py
+import logging
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from fastapi import UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import settings
+from models.archivos_blob import ArchivoBlob
+from utils.archivos import ArchivoGuardado, copiar_a_temporal, validar_tamano
+
+logger = logging.getLogger(__name__)
+
+# Almacenamiento direccionado por contenido: uploads/blobs/ab/<sha256><ext>
+BLOBS_DIR = Path("uploads") / "blobs"
+PREFIJO_STATIC = f"/static/{BLOBS_DIR.name}/"
+BLOBS_DIR.mkdir(parents=True, exist_ok=True)
+
+_NOMBRE_BLOB = re.compile(r"^([0-9a-f]{64})(\.[A-Za-z0-9]{0,15})?$")
+
+
+def _ruta_blob(sha256: str, extension: str) -> Path:
+    return BLOBS_DIR / sha256[:2] / f"{sha256}{extension}"
+
+
+def _ruta_static(sha256: str, extension: str) -> str:
+    return f"{PREFIJO_STATIC}{sha256[:2]}/{sha256}{extension}"
+
+
+def sha_de_ruta(ruta: str | None) -> str | None:
+    """SHA-256 de una ruta /static/blobs/...; None para rutas de antes del almacén."""
+    if not ruta or not ruta.startswith(PREFIJO_STATIC):
+        return None
+    coincidencia = _NOMBRE_BLOB.match(ruta.rsplit("/", 1)[-1])
+    return coincidencia.group(1) if coincidencia else None
+
+
+def _sumar_referencia(db: Session, sha256: str, extension: str, tamano: int) -> str:
+    """Suma 1 a la referencia (o crea el blob). Regresa la extensión con la que quedó guardado."""
+    blob = db.query(ArchivoBlob).filter(ArchivoBlob.sha256 == sha256).with_for_update().first()
+    if blob is None:
+        try:
+            with db.begin_nested():
+                db.add(ArchivoBlob(sha256=sha256, extension=extension, tamano=tamano, referencias=1))
+            return extension
+        except IntegrityError:
+            # Otra petición subió el mismo contenido al mismo tiempo
+            blob = db.query(ArchivoBlob).filter(ArchivoBlob.sha256 == sha256).with_for_update().one()
+
+    blob.referencias += 1
+    return blob.extension
+
+
+# ===========================================================
+# 💾 Guardar / liberar
+#   1. recibir_blob (async): copia el archivo a un temporal del almacén
+#      en el threadpool y calcula su SHA-256. No toca la BD.
+#   2. registrar_blob (síncrono): suma la referencia con SELECT ... FOR
+#      UPDATE y mueve el archivo a su lugar. Se llama en el mismo hilo
+#      que el commit, así el candado no se mantiene a través de awaits.
+# ===========================================================
+class BlobRecibido(NamedTuple):
+    tmp: ArchivoGuardado
+    extension: str
+
+    def descartar(self):
+        """Borra el temporal si no llegó a registrarse (no-op si ya se movió)."""
+        self.tmp.ruta.unlink(missing_ok=True)
+
+
+async def recibir_blob(file: UploadFile, max_bytes: int) -> BlobRecibido:
+    """Copia el archivo a un temporal del almacén sin bloquear el event loop."""
+    validar_tamano(file, max_bytes)
+    await file.seek(0)
+
+    tmp = await run_in_threadpool(copiar_a_temporal, file.file, BLOBS_DIR, max_bytes)
+    return BlobRecibido(tmp, Path(file.filename or "").suffix.lower()[:16])
+
+
+def registrar_blob(db: Session, recibido: BlobRecibido) -> str:
+    """
+    Suma una referencia al contenido y deja el archivo en el almacén (una
+    sola copia por contenido). La referencia se confirma con el commit de
+    quien llama. Regresa la ruta accesible por /static.
+    """
+    tmp = recibido.tmp
+    try:
+        # Primero la fila (bloqueada hasta el commit) y luego el archivo:
+        # así la recolección de basura no puede borrarlo en medio
+        extension = _sumar_referencia(db, tmp.sha256, recibido.extension, tmp.tamano)
+        final = _ruta_blob(tmp.sha256, extension)
+        final.parent.mkdir(exist_ok=True)
+        # Mismo contenido: reemplazar es inocuo y deja el archivo garantizado
+        os.replace(tmp.ruta, final)
+    except BaseException:
+        recibido.descartar()
+        raise
+
+    return _ruta_static(tmp.sha256, extension)
+
+
+def liberar_blob(db: Session, ruta: str | None):
+    """Resta una referencia si `ruta` apunta al almacén (no-op para rutas antiguas)."""
+    sha256 = sha_de_ruta(ruta)
+    if not sha256:
+        return
+    (
+        db.query(ArchivoBlob)
+        .filter(ArchivoBlob.sha256 == sha256, ArchivoBlob.referencias > 0)
+        .update(
+            {ArchivoBlob.referencias: ArchivoBlob.referencias - 1, ArchivoBlob.actualizado_en: datetime.now()},
+            synchronize_session=False,
+        )
+    )
+
+
+# ===========================================================
+# 🧹 Recolección de basura
+# ===========================================================
+def recolectar_basura(db: Session, gracia_segundos: float | None = None, lote: int = 500) -> int:
+    """
+    Borra los blobs sin referencias desde hace más de `gracia_segundos` y
+    los temporales de subidas abortadas. Regresa cuántos blobs borró.
+    """
+    # Import diferido: utils.miniaturas depende de este módulo
+    from utils.miniaturas import borrar_derivados
+
+    gracia = gracia_segundos if gracia_segundos is not None else settings.BLOBS_GC_GRACIA_SEGUNDOS
+    limite = datetime.now() - timedelta(seconds=gracia)
+    borrados = 0
+
+    while True:
+        # skip_locked: no tocar blobs que una subida está referenciando ahora
+        blobs = (
+            db.query(ArchivoBlob)
+            .filter(ArchivoBlob.referencias <= 0, ArchivoBlob.actualizado_en < limite)
+            .limit(lote)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for blob in blobs:
+            _ruta_blob(blob.sha256, blob.extension).unlink(missing_ok=True)
+            borrar_derivados(blob.sha256)
+            db.delete(blob)
+        db.commit()
+        borrados += len(blobs)
+        if len(blobs) < lote:
+            break
+
+    # Archivos sin fila: temporales de subidas abortadas y blobs cuya
+    # transacción hizo rollback después de colocar el archivo
+    corte = time.time() - gracia
+    huerfanos: dict[str, Path] = {}
+    for archivo in [*BLOBS_DIR.glob(".subida_*"), *BLOBS_DIR.glob("*/*")]:
+        try:
+            if archivo.stat().st_mtime >= corte:
+                continue
+        except FileNotFoundError:
+            continue
+        coincidencia = _NOMBRE_BLOB.match(archivo.name)
+        if coincidencia:
+            huerfanos[coincidencia.group(1)] = archivo
+        else:
+            archivo.unlink(missing_ok=True)
+
+    claves = list(huerfanos)
+    for i in range(0, len(claves), lote):
+        existentes = db.query(ArchivoBlob.sha256).filter(ArchivoBlob.sha256.in_(claves[i:i + lote])).all()
+        for (sha256,) in existentes:
+            huerfanos.pop(sha256, None)
+    for sha256, archivo in huerfanos.items():
+        archivo.unlink(missing_ok=True)
+        borrar_derivados(sha256)
+
+    return borrados
+
+
+if __name__ == "__main__":
+    # Para cron:  python -m utils.almacen
+    from database.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    sesion = SessionLocal()
+    try:
+        logger.info("Blobs borrados: %s", recolectar_basura(sesion))
+    finally:
+        sesion.close()
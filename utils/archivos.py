@@ -0,0 +1,55 @@
+# utils/archivos.py
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+
+from fastapi import HTTPException, UploadFile
+
+TAMANO_BLOQUE = 1024 * 1024  # 1 MB
+
+
+def _demasiado_grande(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"El archivo excede el máximo de {max_bytes // (1024 * 1024)} MB",
+    )
+
+
+class ArchivoGuardado(NamedTuple):
+    ruta: Path
+    sha256: str
+    tamano: int
+
+
+def copiar_a_temporal(origen: BinaryIO, carpeta: Path, max_bytes: int) -> ArchivoGuardado:
+    """
+    Copia por bloques a un temporal en `carpeta` (mismo sistema de archivos
+    que el destino final), calculando SHA-256 y cortando al pasar `max_bytes`.
+    Quien llama decide el nombre final y hace el rename atómico
+    (utils/almacen.py).
+    """
+    sha = hashlib.sha256()
+    tamano = 0
+
+    fd, tmp = tempfile.mkstemp(dir=carpeta, prefix=".subida_")
+    try:
+        with os.fdopen(fd, "wb") as destino:
+            while bloque := origen.read(TAMANO_BLOQUE):
+                tamano += len(bloque)
+                if tamano > max_bytes:
+                    raise _demasiado_grande(max_bytes)
+                sha.update(bloque)
+                destino.write(bloque)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    return ArchivoGuardado(Path(tmp), sha.hexdigest(), tamano)
+
+
+def validar_tamano(file: UploadFile, max_bytes: int):
+    """Si el parser ya conoce el tamaño, rechazar sin copiar nada."""
+    if file.size is not None and file.size > max_bytes:
+        raise _demasiado_grande(max_bytes)
@@ -0,0 +1,382 @@
+# utils/busqueda.py
+"""
+Índice de búsqueda en memoria para /buscar (niños, prospectos, tutores,
+personal y demás usuarios).
+
+Cada documento se normaliza (minúsculas, sin acentos: database/texto.py)
+y se parte en trigramas de palabra ("jose" -> "  j", " jo", "jos", "ose",
+"se "). Una consulta puntúa cada documento por la fracción de sus
+trigramas que aparecen en él (desempate: Jaccard), así "jose peres"
+encuentra "José Pérez".
+
+El índice se construye en la primera búsqueda y se mantiene al día con
+las escrituras ORM del propio worker (eventos + after_commit, igual que
+core/cache_roles.py): solo las que tocan columnas indexadas, y la
+relectura se hace en un hilo aparte, no en la petición que escribió.
+Cada BUSQUEDA_RECONSTRUIR_SEGUNDOS se reconstruye en segundo plano para
+recoger lo escrito por otros workers.
+"""
+import heapq
+import logging
+import math
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import NamedTuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, object_session
+
+from config.settings import settings
+from database.session import engine
+from database.texto import normalizar
+from models.ninos import Nino
+from models.ninos_prospecto import NinoProspecto
+from models.personal import Personal
+from models.tutores import Tutor
+from models.usuarios import Usuario
+
+logger = logging.getLogger(__name__)
+
+# ("nino" | "prospecto" | "usuario", id en su tabla)
+Clave = tuple[str, int]
+
+
+class Documento(NamedTuple):
+    tipo: str              # nino | prospecto | tutor | personal | usuario
+    id: int                # id en la tabla de su tipo (id_tutor, id_personal...)
+    titulo: str
+    detalle: str | None
+    texto: str             # normalizado
+    n_trigramas: int       # los trigramas se recalculan de `texto` (no se guardan por documento)
+
+
+def _palabras(texto: str) -> list[str]:
+    return re.findall(r"\w+", texto)
+
+
+def trigramas(texto: str) -> set[str]:
+    salida = set()
+    for palabra in _palabras(texto):
+        relleno = f"  {palabra} "
+        # intern: los mismos trigramas se repiten en miles de documentos
+        salida.update(sys.intern(relleno[i:i + 3]) for i in range(len(relleno) - 2))
+    return salida
+
+
+def _unir(*partes) -> str:
+    return " ".join(p for p in partes if p)
+
+
+def _documento(tipo: str, id_: int, titulo: str, detalle: str | None, *buscable) -> Documento:
+    texto = " ".join(_palabras(normalizar(_unir(titulo, *buscable))))
+    return Documento(tipo, id_, titulo, detalle, texto, len(trigramas(texto)))
+
+
+# ===========================================================
+# 📥 Carga desde la BD
+# ===========================================================
+def _cargar(db: Session, claves: dict[str, set[int]] | None = None) -> dict[Clave, Documento]:
+    """Documentos de las claves pedidas, o de todas las tablas si `claves` es None."""
+
+    def consulta(tipo, query, columna):
+        if claves is None:
+            return query
+        ids = claves.get(tipo)
+        return query.filter(columna.in_(ids)) if ids else None
+
+    docs: dict[Clave, Documento] = {}
+
+    q = consulta("nino", db.query(
+        Nino.id_nino, Nino.nombre, Nino.apellido_paterno, Nino.apellido_materno,
+    ), Nino.id_nino)
+    for r in q or ():
+        titulo = _unir(r.nombre, r.apellido_paterno, r.apellido_materno)
+        docs[("nino", r.id_nino)] = _documento("nino", r.id_nino, titulo, None)
+
+    q = consulta("prospecto", db.query(
+        NinoProspecto.id_prospecto, NinoProspecto.nombre, NinoProspecto.apellido_paterno,
+        NinoProspecto.apellido_materno, NinoProspecto.nombre_tutor, NinoProspecto.telefono_contacto,
+    ), NinoProspecto.id_prospecto)
+    for r in q or ():
+        titulo = _unir(r.nombre, r.apellido_paterno, r.apellido_materno)
+        detalle = ", ".join(p for p in (r.nombre_tutor, r.telefono_contacto) if p) or None
+        # El teléfono también solo con dígitos: "668-123-4567" ~ "6681234567"
+        digitos = re.sub(r"\D", "", r.telefono_contacto or "")
+        docs[("prospecto", r.id_prospecto)] = _documento(
+            "prospecto", r.id_prospecto, titulo, detalle, r.nombre_tutor, r.telefono_contacto, digitos,
+        )
+
+    q = consulta("usuario", db.query(
+        Usuario.id_usuario, Usuario.nombre, Usuario.apellido_paterno, Usuario.apellido_materno,
+        Usuario.correo, Tutor.id_tutor, Tutor.curp, Personal.id_personal,
+    )
+        .outerjoin(Tutor, Tutor.id_usuario == Usuario.id_usuario)
+        .outerjoin(Personal, Personal.id_usuario == Usuario.id_usuario), Usuario.id_usuario)
+    for r in q or ():
+        if r.id_tutor is not None:
+            tipo, id_ = "tutor", r.id_tutor
+        elif r.id_personal is not None:
+            tipo, id_ = "personal", r.id_personal
+        else:
+            tipo, id_ = "usuario", r.id_usuario
+        titulo = _unir(r.nombre, r.apellido_paterno, r.apellido_materno)
+        docs[("usuario", r.id_usuario)] = _documento(tipo, id_, titulo, r.correo, r.correo, r.curp)
+
+    return docs
+
+
+# ===========================================================
+# 🔎 Índice
+# ===========================================================
+class IndiceBusqueda:
+    def __init__(self, intervalo: float, umbral: float):
+        self.intervalo = intervalo
+        self.umbral = umbral
+        self.construido_en = 0.0
+        self._docs: dict[Clave, Documento] = {}
+        self._postings: dict[str, set[Clave]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._reconstruyendo = threading.Lock()
+        # Claves refrescadas mientras se reconstruye: se vuelven a aplicar al final
+        self._tocadas: set[Clave] | None = None
+        # Escrituras confirmadas pendientes de releer (hilo de refresco)
+        self._por_refrescar: set[Clave] = set()
+        self._refrescando = False
+
+    def _agregar(self, clave: Clave, doc: Documento):
+        self._docs[clave] = doc
+        for t in trigramas(doc.texto):
+            self._postings[t].add(clave)
+
+    def _quitar(self, clave: Clave):
+        doc = self._docs.pop(clave, None)
+        if doc is None:
+            return
+        for t in trigramas(doc.texto):
+            claves = self._postings.get(t)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._postings[t]
+
+    def _construir(self, bind: Engine):
+        inicio = time.perf_counter()
+        with self._lock:
+            self._tocadas = set()
+        try:
+            with Session(bind) as db:
+                docs = _cargar(db)
+        except Exception:
+            with self._lock:
+                self._tocadas = None
+            raise
+
+        postings: dict[str, set[Clave]] = defaultdict(set)
+        for clave, doc in docs.items():
+            for t in trigramas(doc.texto):
+                postings[t].add(clave)
+
+        with self._lock:
+            tocadas, self._tocadas = self._tocadas, None
+            self._docs, self._postings = docs, postings
+            self.construido_en = time.monotonic()
+        if tocadas:
+            self.refrescar(bind, tocadas)
+        logger.info("Índice de búsqueda: %d documentos en %.0f ms", len(docs), (time.perf_counter() - inicio) * 1000)
+
+    def reconstruir(self, bind: Engine):
+        """Reconstrucción completa; si ya hay una en curso, no hace nada."""
+        if not self._reconstruyendo.acquire(blocking=False):
+            return
+        try:
+            self._construir(bind)
+        except Exception:
+            logger.exception("No se pudo reconstruir el índice de búsqueda")
+        finally:
+            self._reconstruyendo.release()
+
+    def asegurar(self, bind: Engine):
+        """La primera vez construye en la petición; si está viejo, en segundo plano."""
+        if not self.construido_en:
+            with self._reconstruyendo:
+                if not self.construido_en:
+                    self._construir(bind)
+        elif time.monotonic() - self.construido_en > self.intervalo and not self._reconstruyendo.locked():
+            threading.Thread(target=self.reconstruir, args=(bind,), name="indice-busqueda", daemon=True).start()
+
+    def refrescar(self, bind: Engine, claves: set[Clave]):
+        """Vuelve a leer estas claves de la BD (las que ya no existen se quitan)."""
+        with self._lock:
+            if not self.construido_en and self._tocadas is None:
+                return  # aún no se construye: la primera búsqueda lo carga todo
+
+        por_tipo: dict[str, set[int]] = defaultdict(set)
+        for tipo, id_ in claves:
+            por_tipo[tipo].add(id_)
+        with Session(bind) as db:
+            docs = _cargar(db, por_tipo)
+
+        with self._lock:
+            if self._tocadas is not None:
+                self._tocadas |= claves
+            for clave in claves:
+                self._quitar(clave)
+                if clave in docs:
+                    self._agregar(clave, docs[clave])
+
+    def programar_refresco(self, bind: Engine, claves: set[Clave]):
+        """refrescar() en un hilo aparte; las claves que llegan mientras corre se juntan."""
+        with self._lock:
+            self._por_refrescar |= claves
+            if self._refrescando:
+                return
+            self._refrescando = True
+        threading.Thread(
+            target=self._refrescar_pendientes, args=(bind,), name="indice-busqueda-refresco", daemon=True,
+        ).start()
+
+    def _refrescar_pendientes(self, bind: Engine):
+        while True:
+            with self._lock:
+                claves, self._por_refrescar = self._por_refrescar, set()
+                if not claves:
+                    self._refrescando = False
+                    return
+            try:
+                self.refrescar(bind, claves)
+            except Exception:
+                logger.exception("No se pudo actualizar el índice de búsqueda")
+
+    def buscar(self, q: str, limite: int = 20, tipos: set[str] | None = None) -> list[tuple[Documento, float]]:
+        texto = " ".join(_palabras(normalizar(q)))
+        consulta = trigramas(texto)
+        if not consulta:
+            return []
+
+        total = len(consulta)
+        # Con menos aciertos que esto ningún documento llega al umbral
+        minimo = max(1, math.ceil(self.umbral * total))
+        with self._lock:
+            aciertos: Counter[Clave] = Counter()
+            for t in consulta:
+                aciertos.update(self._postings.get(t, ()))
+
+            # De más a menos aciertos; se para al llenar `limite` (con empates)
+            resultados, corte = [], minimo
+            for clave, n in sorted(aciertos.items(), key=itemgetter(1), reverse=True):
+                if n < corte:
+                    break
+                doc = self._docs[clave]
+                if tipos and doc.tipo not in tipos:
+                    continue
+                # Desempate: el documento más parecido en conjunto (Jaccard)
+                resultados.append((n, n / (total + doc.n_trigramas - n), doc))
+                if len(resultados) == limite:
+                    corte = n
+
+        mejores = heapq.nlargest(limite, resultados, key=itemgetter(0, 1))
+        return [(doc, n / total) for n, _, doc in mejores]
+
+    def estado(self) -> dict:
+        with self._lock:
+            return {
+                "documentos": len(self._docs),
+                "trigramas": len(self._postings),
+                "antiguedad_segundos": round(time.monotonic() - self.construido_en, 1) if self.construido_en else None,
+            }
+
+
+indice_busqueda = IndiceBusqueda(settings.BUSQUEDA_RECONSTRUIR_SEGUNDOS, settings.BUSQUEDA_UMBRAL)
+
+
+# ===========================================================
+# 🔄 Actualización con las escrituras
+#   Se anota en la sesión al hacer flush y, al confirmar, se relee en el
+#   hilo de refresco. Un UPDATE que no toca columnas indexadas (p. ej.
+#   ultimo_login, version_token) no se anota.
+# ===========================================================
+_PENDIENTES = "busqueda_pendientes"
+
+# Columnas que alimentan los documentos de _cargar
+_COLUMNAS_INDEXADAS = {
+    Nino: ("nombre", "apellido_paterno", "apellido_materno"),
+    NinoProspecto: ("nombre", "apellido_paterno", "apellido_materno", "nombre_tutor", "telefono_contacto"),
+    Usuario: ("nombre", "apellido_paterno", "apellido_materno", "correo"),
+    Tutor: ("id_usuario", "curp"),
+    Personal: ("id_usuario",),
+}
+
+
+def _marcar(target, *claves: Clave):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDIENTES, set()).update(claves)
+
+
+def _cambio_indexado(target) -> bool:
+    atributos = inspect(target).attrs
+    return any(atributos[c].history.has_changes() for c in _COLUMNAS_INDEXADAS[type(target)])
+
+
+@event.listens_for(Nino, "after_insert")
+@event.listens_for(Nino, "after_delete")
+def _nino_modificado(mapper, connection, target):
+    _marcar(target, ("nino", target.id_nino))
+
+
+@event.listens_for(NinoProspecto, "after_insert")
+@event.listens_for(NinoProspecto, "after_delete")
+def _prospecto_modificado(mapper, connection, target):
+    _marcar(target, ("prospecto", target.id_prospecto))
+
+
+@event.listens_for(Nino, "after_update")
+@event.listens_for(NinoProspecto, "after_update")
+def _nino_o_prospecto_actualizado(mapper, connection, target):
+    if _cambio_indexado(target):
+        (_nino_modificado if isinstance(target, Nino) else _prospecto_modificado)(mapper, connection, target)
+
+
+@event.listens_for(Usuario, "after_insert")
+@event.listens_for(Usuario, "after_delete")
+@event.listens_for(Tutor, "after_insert")
+@event.listens_for(Tutor, "after_delete")
+@event.listens_for(Personal, "after_insert")
+@event.listens_for(Personal, "after_delete")
+def _usuario_modificado(mapper, connection, target):
+    # Tutor y Personal se indexan con los datos de su usuario
+    if target.id_usuario is not None:
+        _marcar(target, ("usuario", target.id_usuario))
+
+
+@event.listens_for(Usuario, "after_update")
+@event.listens_for(Tutor, "after_update")
+@event.listens_for(Personal, "after_update")
+def _usuario_actualizado(mapper, connection, target):
+    if not _cambio_indexado(target):
+        return
+    # Tutor/Personal que cambia de usuario: el anterior deja de ser tutor/personal
+    anteriores = () if isinstance(target, Usuario) else inspect(target).attrs["id_usuario"].history.deleted
+    claves = {("usuario", id_) for id_ in (target.id_usuario, *anteriores) if id_ is not None}
+    _marcar(target, *claves)
+
+
+@event.listens_for(Session, "after_commit")
+def _refrescar_al_confirmar(session):
+    pendientes = session.info.pop(_PENDIENTES, None)
+    if not pendientes or not indice_busqueda.construido_en:
+        return
+    # Sin consultas dentro del commit de la petición: lo relee el hilo de refresco,
+    # siempre con el engine síncrono (el bind de una AsyncSession no sirve fuera
+    # del event loop)
+    indice_busqueda.programar_refresco(engine, pendientes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session):
+    session.info.pop(_PENDIENTES, None)
@@ -0,0 +1,168 @@
+# utils/correos_outbox.py
+import logging
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.citas import Cita
+from models.correos_outbox import CorreoOutbox
+from utils.tareas_periodicas import TareaPeriodica
+
+logger = logging.getLogger(__name__)
+
+EVENTOS_SOLO_CITAS_VIGENTES = ("recordatorio_24h", "recordatorio_2h")
+
+
+# ===========================================================
+# 📥 Encolar (dentro de la transacción de la Cita)
+# ===========================================================
+def encolar_correo(
+    db: Session, id_cita: int, evento: str, clave: str | None = None, inicio_cita: datetime | None = None,
+) -> CorreoOutbox:
+    """
+    Agrega la notificación a la sesión SIN hacer commit:
+    se confirma junto con el cambio de la Cita.
+    inicio_cita: fecha/hora de la cita al encolar (recordatorios); si
+    cambia antes del envío, el despachador descarta el correo.
+    """
+    correo = CorreoOutbox(
+        id_cita=id_cita, evento=evento, clave=clave, inicio_cita=inicio_cita, proximo_intento=datetime.now(),
+    )
+    db.add(correo)
+    return correo
+
+
+def _backoff(intentos: int) -> timedelta:
+    segundos = settings.OUTBOX_BACKOFF_BASE_SEGUNDOS * (2 ** (intentos - 1))
+    return timedelta(seconds=min(segundos, settings.OUTBOX_BACKOFF_MAX_SEGUNDOS))
+
+
+# ===========================================================
+# 📤 Procesar un lote de pendientes
+#   1. Reclamar: transacción corta que marca las filas "enviando"
+#      con un plazo (OUTBOX_PLAZO_ENVIO_SEGUNDOS) y hace commit.
+#   2. Enviar por SMTP sin ninguna transacción ni candado abiertos.
+#   3. Registrar el resultado de cada fila en su propio commit.
+#   Si el worker muere a la mitad, las filas sin resultado vuelven a
+#   reclamarse al vencer el plazo; las ya registradas no se reenvían.
+# ===========================================================
+class _Reclamado(NamedTuple):
+    id_correo: int
+    id_cita: int
+    evento: str
+    intentos: int
+    inicio_cita: datetime | None
+
+
+def _reclamar(db: Session, limite: int) -> list[_Reclamado]:
+    ahora = datetime.now()
+
+    # skip_locked: varios workers pueden vaciar el outbox sin pisarse (MySQL 8).
+    # "enviando" con el plazo vencido = un worker que murió a mitad del lote
+    filas = (
+        db.query(CorreoOutbox)
+        .filter(CorreoOutbox.estado.in_(("pendiente", "enviando")), CorreoOutbox.proximo_intento <= ahora)
+        .order_by(CorreoOutbox.proximo_intento, CorreoOutbox.id_correo)
+        .limit(limite)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    reclamados = [_Reclamado(c.id_correo, c.id_cita, c.evento, c.intentos, c.inicio_cita) for c in filas]
+    for correo in filas:
+        correo.estado = "enviando"
+        correo.proximo_intento = ahora + timedelta(seconds=settings.OUTBOX_PLAZO_ENVIO_SEGUNDOS)
+    db.commit()
+    return reclamados
+
+
+def _registrar(db: Session, id_correo: int, **valores):
+    """Resultado de una fila; solo si sigue reclamada (nadie la tomó tras vencer el plazo)."""
+    (
+        db.query(CorreoOutbox)
+        .filter(CorreoOutbox.id_correo == id_correo, CorreoOutbox.estado == "enviando")
+        .update(valores, synchronize_session=False)
+    )
+    db.commit()
+
+
+def _inicio(cita: Cita) -> datetime | None:
+    if cita.fecha is None or cita.hora is None:
+        return None
+    return datetime.combine(cita.fecha, cita.hora)
+
+
+def procesar_lote(db: Session, limite: int | None = None) -> int:
+    """
+    Envía los correos pendientes cuyo próximo intento ya venció.
+    Regresa cuántos se procesaron (enviados, reintentados o descartados).
+    """
+    reclamados = _reclamar(db, limite or settings.OUTBOX_LOTE)
+    if not reclamados:
+        return 0
+
+    # Import diferido: smtplib/email y el grafo de modelos de las notificaciones
+    # solo se cargan cuando hay algo que enviar, no al arrancar el worker
+    from utils.email_notificaciones import enviar_notificacion, resolver_datos_citas
+
+    # Citas y destinatarios de todo el lote en un número fijo de consultas.
+    # Se separan de la sesión para que los commits por fila no las expiren
+    ids_cita = [c.id_cita for c in reclamados]
+    citas = {c.id_cita: c for c in db.query(Cita).filter(Cita.id_cita.in_(ids_cita))}
+    datos = resolver_datos_citas(ids_cita, db)
+    db.expunge_all()
+    db.rollback()
+
+    for correo in reclamados:
+        cita = citas.get(correo.id_cita)
+        if not cita:
+            _registrar(db, correo.id_correo, estado="descartado", ultimo_error="La cita ya no existe")
+            continue
+
+        # Un recordatorio encolado antes de cancelar o reprogramar ya no debe salir
+        if correo.evento in EVENTOS_SOLO_CITAS_VIGENTES:
+            if cita.estado == "Cancelada":
+                _registrar(db, correo.id_correo, estado="descartado", ultimo_error="La cita fue cancelada")
+                continue
+            if correo.inicio_cita and _inicio(cita) != correo.inicio_cita:
+                _registrar(db, correo.id_correo, estado="descartado", ultimo_error="La cita fue reprogramada")
+                continue
+
+        try:
+            enviar_notificacion(correo.evento, cita, db, datos.get(correo.id_cita))
+        except Exception as exc:
+            intentos = correo.intentos + 1
+            if intentos >= settings.OUTBOX_MAX_INTENTOS:
+                _registrar(db, correo.id_correo, estado="fallido", intentos=intentos, ultimo_error=str(exc))
+                logger.error("Correo %s fallido tras %s intentos: %s", correo.id_correo, intentos, exc)
+            else:
+                _registrar(
+                    db, correo.id_correo, estado="pendiente", intentos=intentos, ultimo_error=str(exc),
+                    proximo_intento=datetime.now() + _backoff(intentos),
+                )
+                logger.warning("Correo %s reintento %s: %s", correo.id_correo, intentos, exc)
+            continue
+
+        _registrar(db, correo.id_correo, estado="enviado", enviado_en=datetime.now(), ultimo_error=None)
+
+    return len(reclamados)
+
+
+# ===========================================================
+# 🔁 Despachador en segundo plano
+# ===========================================================
+class DespachadorCorreos(TareaPeriodica):
+    """Hilo que vacía el outbox cada OUTBOX_INTERVALO_SEGUNDOS."""
+
+    nombre = "despachador-correos"
+
+    def __init__(self, intervalo: float | None = None):
+        super().__init__(intervalo if intervalo is not None else settings.OUTBOX_INTERVALO_SEGUNDOS)
+
+    def ejecutar(self, db: Session) -> bool:
+        # Lote lleno: probablemente hay más pendientes, seguir sin esperar
+        return procesar_lote(db) >= settings.OUTBOX_LOTE
+
+
+despachador = DespachadorCorreos()
@@ -0,0 +1,138 @@
+# utils/disponibilidad.py
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.citas import Cita
+from models.personal import Personal
+from models.terapias import Terapia
+
+
+def _duracion(minutos: int | None) -> timedelta:
+    return timedelta(minutes=minutos or settings.DURACION_CITA_DEFAULT_MINUTOS)
+
+
+# ===========================================================
+# 📅 Intervalos ocupados de un terapeuta
+# ===========================================================
+def intervalos_ocupados(
+    db: Session,
+    id_personal: int,
+    desde: date,
+    hasta: date,
+    excluir_id_cita: int | None = None,
+) -> list[tuple[datetime, datetime, int]]:
+    """
+    (inicio, fin, id_cita) de las citas no canceladas del terapeuta, ya
+    ordenadas por inicio. La consulta usa el índice (id_personal, fecha, hora)
+    y solo lee el rango pedido.
+    """
+    query = (
+        db.query(Cita.id_cita, Cita.fecha, Cita.hora, Terapia.duracion_minutos)
+        .outerjoin(Terapia, Terapia.id_terapia == Cita.id_terapia)
+        .filter(
+            Cita.id_personal == id_personal,
+            Cita.fecha >= desde,
+            Cita.fecha <= hasta,
+            Cita.hora.is_not(None),
+            # NULL también ocupa: `estado != 'Cancelada'` solo no lo incluye
+            or_(Cita.estado != "Cancelada", Cita.estado.is_(None)),
+        )
+    )
+    if excluir_id_cita:
+        query = query.filter(Cita.id_cita != excluir_id_cita)
+
+    intervalos = []
+    for c in query.order_by(Cita.fecha, Cita.hora).all():
+        inicio = datetime.combine(c.fecha, c.hora)
+        intervalos.append((inicio, inicio + _duracion(c.duracion_minutos), c.id_cita))
+    return intervalos
+
+
+# ===========================================================
+# 🚫 Validar que no haya empalme
+# ===========================================================
+def validar_disponibilidad(
+    db: Session,
+    id_personal: int | None,
+    fecha: date | None,
+    hora: time | None,
+    id_terapia: int | None,
+    excluir_id_cita: int | None = None,
+):
+    """Lanza 409 si la cita se empalma con otra del mismo terapeuta."""
+    if not id_personal or not fecha or not hora:
+        return
+
+    # Bloquea al terapeuta: dos reservas simultáneas no pasan ambas la validación
+    db.query(Personal.id_personal).filter(Personal.id_personal == id_personal).with_for_update().first()
+
+    duracion = None
+    if id_terapia:
+        duracion = db.query(Terapia.duracion_minutos).filter(Terapia.id_terapia == id_terapia).scalar()
+
+    inicio = datetime.combine(fecha, hora)
+    fin = inicio + _duracion(duracion)
+
+    # Se incluye el día anterior por citas que crucen la medianoche
+    ocupados = intervalos_ocupados(db, id_personal, fecha - timedelta(days=1), fecha, excluir_id_cita)
+
+    # Solo las citas que empiezan antes de `fin` pueden empalmarse.
+    # (fin,) queda antes de cualquier (fin, ...): i = primera que empieza en `fin` o después
+    i = bisect_left(ocupados, (fin,))
+    for ocupado_inicio, ocupado_fin, id_cita in ocupados[:i]:
+        if ocupado_fin > inicio:
+            raise HTTPException(
+                status_code=409,
+                detail=f"El terapeuta ya tiene la cita {id_cita} de "
+                       f"{ocupado_inicio:%H:%M} a {ocupado_fin:%H:%M} en ese horario.",
+            )
+
+
+# ===========================================================
+# 🟢 Espacios libres dentro de la jornada
+# ===========================================================
+def espacios_libres(
+    db: Session,
+    id_personal: int,
+    desde: date,
+    hasta: date,
+    duracion_minima: int = 0,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Huecos libres por día dentro de JORNADA_INICIO–JORNADA_FIN.
+    Un solo recorrido sobre los intervalos ya ordenados por la BD.
+    """
+    # Se incluye el día anterior por citas que crucen la medianoche
+    ocupados = intervalos_ocupados(db, id_personal, desde - timedelta(days=1), hasta)
+    minimo = timedelta(minutes=duracion_minima)
+    libres: list[tuple[datetime, datetime]] = []
+
+    i = 0
+    dia = desde
+    while dia <= hasta:
+        cursor = datetime.combine(dia, settings.JORNADA_INICIO)
+        cierre = datetime.combine(dia, settings.JORNADA_FIN)
+
+        # Saltar citas que terminan antes de abrir
+        while i < len(ocupados) and ocupados[i][1] <= cursor:
+            i += 1
+
+        j = i
+        while j < len(ocupados) and ocupados[j][0] < cierre:
+            ocupado_inicio, ocupado_fin, _ = ocupados[j]
+            if ocupado_inicio > cursor and ocupado_inicio - cursor >= minimo:
+                libres.append((cursor, ocupado_inicio))
+            cursor = max(cursor, ocupado_fin)
+            j += 1
+
+        if cierre > cursor and cierre - cursor >= minimo:
+            libres.append((cursor, cierre))
+
+        dia += timedelta(days=1)
+
+    return libres
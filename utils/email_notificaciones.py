@@ -1,20 +1,18 @@
 # utils/email_notificaciones.py
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import List
 from datetime import datetime
 
 from config.settings import settings
+from utils.smtp_pool import pool_smtp
 from models.citas import Cita
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 from models.ninos import Nino
 from models.tutores import Tutor
 from models.personal import Personal
 from models.usuarios import Usuario
 from models.terapias import Terapia
-# al inicio
-from models.ninos_prospecto import NinoProspecto
 
 
 def _enviar_correo(subject: str, body_html: str, destinatarios: List[str]):
@@ -28,10 +26,8 @@ def _enviar_correo(subject: str, body_html: str, destinatarios: List[str]):
 
     msg.attach(MIMEText(body_html, "html", "utf-8"))
 
-    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        server.starttls()
-        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-        server.sendmail(settings.SMTP_FROM_EMAIL, destinatarios, msg.as_string())
+    # Sesión SMTP ya autenticada del pool (sin handshake por mensaje)
+    pool_smtp.enviar(settings.SMTP_FROM_EMAIL, destinatarios, msg.as_string())
 
 
 def _formatear_fecha_hora(fecha, hora) -> str:
@@ -42,70 +38,100 @@ def _formatear_fecha_hora(fecha, hora) -> str:
     return dt.strftime("%A %d de %B de %Y, %H:%M").capitalize()
 
 
-def obtener_correos_tutor_y_terapeuta(cita: Cita, db: Session) -> list[str]:
-    correos: list[str] = []
-
-    # Terapeuta -> personal -> usuarios
-    if cita.id_personal:
-        personal = db.query(Personal).filter(Personal.id_personal == cita.id_personal).first()
-        if personal and personal.id_usuario:
-            u = db.query(Usuario).filter(Usuario.id_usuario == personal.id_usuario).first()
-            if u and u.correo:
-                correos.append(u.correo)
-
-    # Tutor -> ninos -> tutores -> usuarios
-    if cita.id_nino:
-        nino = db.query(Nino).filter(Nino.id_nino == cita.id_nino).first()
-        if nino and nino.id_tutor:
-            tutor = db.query(Tutor).filter(Tutor.id_tutor == nino.id_tutor).first()
-            if tutor and tutor.id_usuario:
-                u = db.query(Usuario).filter(Usuario.id_usuario == tutor.id_usuario).first()
-                if u and u.correo:
-                    correos.append(u.correo)
-
-    # Si no hay niño formal pero sí prospecto
-    if not cita.id_nino and cita.id_nino_prospecto:
-        prospecto = db.query(NinoProspecto).filter(
-            NinoProspecto.id_nino_prospecto == cita.id_nino_prospecto
-        ).first()
-        if prospecto and prospecto.correo_contacto:
-            correos.append(prospecto.correo_contacto)
-
-    # evitar repetidos
-    return list(set(correos))
+class DatosNotificacion:
+    """Destinatarios y nombres para armar el correo de una cita."""
 
+    def __init__(self):
+        self.correos: list[str] = []
+        self.nombre_nino: str | None = None
+        self.nombre_terapeuta: str | None = None
+        self.nombre_terapia: str | None = None
 
-def obtener_nombres_relacionados(cita: Cita, db: Session):
-    nombre_nino = None
-    nombre_terapeuta = None
-    nombre_terapia = None
 
-    if cita.id_nino:
-        nino = db.query(Nino).filter(Nino.id_nino == cita.id_nino).first()
-        if nino:
-            nombre_nino = f"{nino.nombre} {nino.apellido_paterno or ''} {nino.apellido_materno or ''}".strip()
+def _nombre_completo(nombre, apellido_paterno, apellido_materno) -> str:
+    return f"{nombre} {apellido_paterno or ''} {apellido_materno or ''}".strip()
 
-    if cita.id_personal:
-        personal = db.query(Personal).filter(Personal.id_personal == cita.id_personal).first()
-        if personal and personal.id_usuario:
-            u = db.query(Usuario).filter(Usuario.id_usuario == personal.id_usuario).first()
-            if u:
-                nombre_terapeuta = f"{u.nombre} {u.apellido_paterno or ''} {u.apellido_materno or ''}".strip()
 
-    if cita.id_terapia:
-        terapia = db.query(Terapia).filter(Terapia.id_terapia == cita.id_terapia).first()
-        if terapia:
-            nombre_terapia = terapia.nombre_terapia
+# Tamaño de cada IN (...) para no armar sentencias gigantes
+_LOTE_RESOLUCION = 500
 
-    return nombre_nino, nombre_terapeuta, nombre_terapia
 
+def resolver_datos_citas(ids_cita: list[int], db: Session) -> dict[int, DatosNotificacion]:
+    """
+    Resuelve correos (terapeuta y tutor) y nombres de varias citas con UNA
+    consulta con joins por cada lote de 500 ids, en lugar de hasta 8
+    consultas por cita.
 
-def enviar_notificacion_cita_creada(cita: Cita, db: Session):
-    correos = obtener_correos_tutor_y_terapeuta(cita, db)
-    if not correos:
-        return
+    Los prospectos no tienen correo registrado (solo telefono_contacto),
+    así que no aportan destinatarios.
+    """
+    UsuarioTerapeuta = aliased(Usuario)
+    UsuarioTutor = aliased(Usuario)
+
+    datos: dict[int, DatosNotificacion] = {}
+    ids = list(dict.fromkeys(ids_cita))
+
+    for i in range(0, len(ids), _LOTE_RESOLUCION):
+        filas = (
+            db.query(
+                Cita.id_cita,
+                Nino.nombre.label("nino_nombre"),
+                Nino.apellido_paterno.label("nino_apellido_paterno"),
+                Nino.apellido_materno.label("nino_apellido_materno"),
+                UsuarioTerapeuta.nombre.label("terapeuta_nombre"),
+                UsuarioTerapeuta.apellido_paterno.label("terapeuta_apellido_paterno"),
+                UsuarioTerapeuta.apellido_materno.label("terapeuta_apellido_materno"),
+                UsuarioTerapeuta.correo.label("terapeuta_correo"),
+                UsuarioTutor.correo.label("tutor_correo"),
+                Terapia.nombre_terapia,
+            )
+            .outerjoin(Personal, Personal.id_personal == Cita.id_personal)
+            .outerjoin(UsuarioTerapeuta, UsuarioTerapeuta.id_usuario == Personal.id_usuario)
+            .outerjoin(Nino, Nino.id_nino == Cita.id_nino)
+            .outerjoin(Tutor, Tutor.id_tutor == Nino.id_tutor)
+            .outerjoin(UsuarioTutor, UsuarioTutor.id_usuario == Tutor.id_usuario)
+            .outerjoin(Terapia, Terapia.id_terapia == Cita.id_terapia)
+            .filter(Cita.id_cita.in_(ids[i:i + _LOTE_RESOLUCION]))
+            .all()
+        )
+
+        for f in filas:
+            d = DatosNotificacion()
+
+            # Terapeuta -> personal -> usuarios
+            if f.terapeuta_nombre:
+                d.nombre_terapeuta = _nombre_completo(
+                    f.terapeuta_nombre, f.terapeuta_apellido_paterno, f.terapeuta_apellido_materno
+                )
+            if f.terapeuta_correo:
+                d.correos.append(f.terapeuta_correo)
+
+            # Tutor -> ninos -> tutores -> usuarios
+            if f.nino_nombre:
+                d.nombre_nino = _nombre_completo(
+                    f.nino_nombre, f.nino_apellido_paterno, f.nino_apellido_materno
+                )
+            if f.tutor_correo and f.tutor_correo not in d.correos:
+                d.correos.append(f.tutor_correo)
+
+            d.nombre_terapia = f.nombre_terapia
+            datos[f.id_cita] = d
+
+    return datos
+
+
+def obtener_correos_tutor_y_terapeuta(cita: Cita, db: Session) -> list[str]:
+    datos = resolver_datos_citas([cita.id_cita], db).get(cita.id_cita)
+    return datos.correos if datos else []
+
+
+def obtener_nombres_relacionados(cita: Cita, db: Session):
+    datos = resolver_datos_citas([cita.id_cita], db).get(cita.id_cita) or DatosNotificacion()
+    return datos.nombre_nino, datos.nombre_terapeuta, datos.nombre_terapia
 
-    nombre_nino, nombre_terapeuta, nombre_terapia = obtener_nombres_relacionados(cita, db)
+
+def _mensaje_cita_creada(cita: Cita, datos: DatosNotificacion):
+    nombre_nino, nombre_terapeuta, nombre_terapia = datos.nombre_nino, datos.nombre_terapeuta, datos.nombre_terapia
     fecha_hora = _formatear_fecha_hora(cita.fecha, cita.hora)
 
     subject = "📅 Nueva cita programada - Autismo Mochis IA"
@@ -122,15 +148,11 @@ def enviar_notificacion_cita_creada(cita: Cita, db: Session):
     <p>Este mensaje fue enviado automáticamente por el sistema Autismo Mochis IA.</p>
     """
 
-    _enviar_correo(subject, body, correos)
-
+    return subject, body
 
-def enviar_notificacion_cita_cancelada(cita: Cita, db: Session):
-    correos = obtener_correos_tutor_y_terapeuta(cita, db)
-    if not correos:
-        return
 
-    nombre_nino, nombre_terapeuta, nombre_terapia = obtener_nombres_relacionados(cita, db)
+def _mensaje_cita_cancelada(cita: Cita, datos: DatosNotificacion):
+    nombre_nino, nombre_terapeuta, nombre_terapia = datos.nombre_nino, datos.nombre_terapeuta, datos.nombre_terapia
     fecha_hora = _formatear_fecha_hora(cita.fecha, cita.hora)
 
     subject = "❌ Cita cancelada - Autismo Mochis IA"
@@ -146,4 +168,63 @@ def enviar_notificacion_cita_cancelada(cita: Cita, db: Session):
     <p>Este mensaje fue enviado automáticamente por el sistema Autismo Mochis IA.</p>
     """
 
-    _enviar_correo(subject, body, correos)
+    return subject, body
+
+
+def _mensaje_recordatorio(cita: Cita, datos: DatosNotificacion, cuando: str):
+    nombre_nino, nombre_terapeuta, nombre_terapia = datos.nombre_nino, datos.nombre_terapeuta, datos.nombre_terapia
+    fecha_hora = _formatear_fecha_hora(cita.fecha, cita.hora)
+
+    subject = f"⏰ Recordatorio: cita {cuando} - Autismo Mochis IA"
+
+    body = f"""
+    <h2>Recordatorio de cita {cuando}</h2>
+    <p><strong>Paciente:</strong> {nombre_nino or 'No asignado'}</p>
+    <p><strong>Terapeuta:</strong> {nombre_terapeuta or 'No asignado'}</p>
+    <p><strong>Servicio:</strong> {nombre_terapia or 'No especificado'}</p>
+    <p><strong>Fecha y hora:</strong> {fecha_hora}</p>
+    <p>Si no puedes asistir, comunícate con el centro.</p>
+    <hr>
+    <p>Este mensaje fue enviado automáticamente por el sistema Autismo Mochis IA.</p>
+    """
+
+    return subject, body
+
+
+def _mensaje_recordatorio_24h(cita: Cita, datos: DatosNotificacion):
+    return _mensaje_recordatorio(cita, datos, "mañana")
+
+
+def _mensaje_recordatorio_2h(cita: Cita, datos: DatosNotificacion):
+    return _mensaje_recordatorio(cita, datos, "en unas horas")
+
+
+# Evento del outbox -> función que arma (subject, body)
+MENSAJES_POR_EVENTO = {
+    "cita_creada": _mensaje_cita_creada,
+    "cita_cancelada": _mensaje_cita_cancelada,
+    "recordatorio_24h": _mensaje_recordatorio_24h,
+    "recordatorio_2h": _mensaje_recordatorio_2h,
+}
+
+
+def enviar_notificacion(evento: str, cita: Cita, db: Session, datos: DatosNotificacion | None = None):
+    """
+    `datos` permite a los envíos masivos pasar lo ya resuelto con
+    resolver_datos_citas y no consultar cita por cita.
+    """
+    if datos is None:
+        datos = resolver_datos_citas([cita.id_cita], db).get(cita.id_cita)
+    if not datos or not datos.correos:
+        return
+
+    subject, body = MENSAJES_POR_EVENTO[evento](cita, datos)
+    _enviar_correo(subject, body, datos.correos)
+
+
+def enviar_notificacion_cita_creada(cita: Cita, db: Session):
+    enviar_notificacion("cita_creada", cita, db)
+
+
+def enviar_notificacion_cita_cancelada(cita: Cita, db: Session):
+    enviar_notificacion("cita_cancelada", cita, db)
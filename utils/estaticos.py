@@ -0,0 +1,53 @@
+# utils/estaticos.py
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# blobs/ab/<sha256>.<ext>  y  derivados/ab/<sha256>_<tamaño>.<ext>
+_NOMBRE_INMUTABLE = re.compile(r"^(?:blobs|derivados)/[0-9a-f]{2}/([0-9a-f]{64}(?:_\d+)?)(?:\.[A-Za-z0-9]{0,15})?$")
+
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+# Rutas de antes del almacén: el contenido puede cambiar con el mismo nombre
+CACHE_REVALIDAR = "no-cache"
+
+# Bloques grandes: menos vueltas al event loop con PDFs de varios MB
+TAMANO_BLOQUE = 512 * 1024
+
+
+class EstaticosCacheables(StaticFiles):
+    """
+    StaticFiles para /static con encabezados de caché:
+
+    - Nombres direccionados por contenido (blobs/derivados): ETag fuerte
+      tomado del hash del nombre y Cache-Control inmutable por un año.
+    - Resto de archivos: ETag por mtime/tamaño y `no-cache` (el navegador
+      revalida y recibe 304 si no cambió).
+
+    Range / If-Range y el envío sin copia (`http.response.pathsend`, cuando
+    el servidor ASGI lo soporta) los resuelve FileResponse.
+    """
+
+    def file_response(
+        self,
+        full_path: os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        relativa = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+        coincidencia = _NOMBRE_INMUTABLE.match(relativa)
+
+        if coincidencia:
+            headers = {"etag": f'"{coincidencia.group(1)}"', "cache-control": CACHE_INMUTABLE}
+        else:
+            headers = {"cache-control": CACHE_REVALIDAR}
+
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        response.chunk_size = TAMANO_BLOQUE
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,78 @@
+# utils/exportacion.py
+"""
+Exportación a CSV / XLSX por partes, para StreamingResponse.
+
+Las filas llegan de un iterador (p. ej. una consulta con yield_per), así
+que la memoria no crece con el tamaño del reporte:
+
+- CSV: se escribe un bloque de `filas_por_parte` filas y se envía.
+- XLSX (requiere XlsxWriter): el formato es un zip que no se puede
+  mandar antes de cerrarlo; se arma en modo constant_memory sobre un
+  archivo temporal y luego se envía ese archivo por partes.
+"""
+import csv
+import importlib.util
+import io
+import tempfile
+from datetime import date, datetime, time
+from typing import Iterable, Iterator, Sequence
+
+XLSX_DISPONIBLE = importlib.util.find_spec("xlsxwriter") is not None
+
+# Límite de filas de una hoja de Excel (incluye el encabezado)
+MAX_FILAS_XLSX = 1_048_576
+
+
+def csv_por_partes(encabezados: Sequence[str], filas: Iterable[Sequence], filas_por_parte: int = 1000) -> Iterator[bytes]:
+    # BOM: Excel abre el CSV como UTF-8 (acentos, ñ)
+    buffer = io.StringIO()
+    buffer.write("\ufeff")
+    escritor = csv.writer(buffer)
+    escritor.writerow(encabezados)
+
+    pendientes = 0
+    for fila in filas:
+        escritor.writerow(fila)
+        pendientes += 1
+        if pendientes >= filas_por_parte:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pendientes = 0
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+def xlsx_por_partes(
+    encabezados: Sequence[str],
+    filas: Iterable[Sequence],
+    hoja: str = "Datos",
+    tam_parte: int = 64 * 1024,
+) -> Iterator[bytes]:
+    import xlsxwriter  # opcional: solo al exportar a XLSX
+
+    with tempfile.TemporaryFile() as archivo:
+        libro = xlsxwriter.Workbook(archivo, {"constant_memory": True})
+        hoja_xlsx = libro.add_worksheet(hoja)
+        negrita = libro.add_format({"bold": True})
+        formatos = {
+            datetime: libro.add_format({"num_format": "yyyy-mm-dd hh:mm"}),
+            date: libro.add_format({"num_format": "yyyy-mm-dd"}),
+            time: libro.add_format({"num_format": "hh:mm"}),
+        }
+
+        hoja_xlsx.write_row(0, 0, encabezados, negrita)
+        for i, fila in enumerate(filas, start=1):
+            if i >= MAX_FILAS_XLSX:
+                raise ValueError("El reporte excede el máximo de filas de Excel; usar CSV")
+            for j, valor in enumerate(fila):
+                formato = formatos.get(type(valor))
+                if formato is not None:
+                    hoja_xlsx.write_datetime(i, j, valor, formato)
+                elif valor is not None:
+                    hoja_xlsx.write(i, j, valor)
+        libro.close()
+
+        archivo.seek(0)
+        while parte := archivo.read(tam_parte):
+            yield parte
@@ -0,0 +1,84 @@
+# utils/miniaturas.py
+import importlib.util
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from config.settings import settings
+from utils.almacen import BLOBS_DIR, sha_de_ruta
+
+# Pillow es opcional (sin él se sirve la foto original) y se importa
+# dentro del hilo de miniaturas, no al arrancar el worker
+PILLOW_DISPONIBLE = importlib.util.find_spec("PIL") is not None
+
+logger = logging.getLogger(__name__)
+
+# uploads/derivados/ab/<sha256>_<tamaño>.<formato>
+DERIVADOS_DIR = BLOBS_DIR.parent / "derivados"
+PREFIJO_STATIC = f"/static/{DERIVADOS_DIR.name}/"
+DERIVADOS_DIR.mkdir(parents=True, exist_ok=True)
+
+TAMANOS = (64, 256, 1024)
+FORMATOS = {"webp": "WEBP", "jpg": "JPEG"}
+
+# Un solo hilo: redimensionar es CPU y no debe competir con las peticiones
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="miniaturas")
+
+
+def _ruta_derivado(sha256: str, tamano: int, formato: str) -> Path:
+    return DERIVADOS_DIR / sha256[:2] / f"{sha256}_{tamano}.{formato}"
+
+
+def _generar(origen: Path, sha256: str):
+    from PIL import Image, ImageOps
+
+    with Image.open(origen) as imagen:
+        imagen = ImageOps.exif_transpose(imagen).convert("RGB")
+        # Del más grande al más chico: cada uno parte del anterior
+        for tamano in sorted(TAMANOS, reverse=True):
+            imagen.thumbnail((tamano, tamano))
+            for formato, formato_pil in FORMATOS.items():
+                destino = _ruta_derivado(sha256, tamano, formato)
+                if destino.exists():
+                    continue
+                destino.parent.mkdir(exist_ok=True)
+                tmp = destino.with_name(f".{destino.name}.tmp")
+                imagen.save(tmp, formato_pil, quality=settings.MINIATURAS_CALIDAD)
+                tmp.replace(destino)
+
+
+def _trabajo(origen: Path, sha256: str):
+    try:
+        _generar(origen, sha256)
+    except Exception:
+        logger.exception("No se pudieron generar las miniaturas de %s", sha256)
+
+
+def programar_derivados(ruta: str | None):
+    """Encola la generación de miniaturas de una foto del almacén (no bloquea)."""
+    sha256 = sha_de_ruta(ruta)
+    if not PILLOW_DISPONIBLE or not sha256:
+        return
+    origen = BLOBS_DIR / ruta.removeprefix(f"/static/{BLOBS_DIR.name}/")
+    _executor.submit(_trabajo, origen, sha256)
+
+
+def ruta_miniatura(ruta: str | None, tamano_minimo: int = 64, formato: str = "webp") -> str | None:
+    """
+    La variante más chica de al menos `tamano_minimo` px que ya exista en
+    disco; si todavía no se genera (o la foto es anterior al almacén), la original.
+    """
+    sha256 = sha_de_ruta(ruta)
+    if not sha256:
+        return ruta
+    for tamano in TAMANOS:
+        if tamano < tamano_minimo:
+            continue
+        if _ruta_derivado(sha256, tamano, formato).exists():
+            return f"{PREFIJO_STATIC}{sha256[:2]}/{sha256}_{tamano}.{formato}"
+    return ruta
+
+
+def borrar_derivados(sha256: str):
+    for archivo in (DERIVADOS_DIR / sha256[:2]).glob(f"{sha256}_*"):
+        archivo.unlink(missing_ok=True)
@@ -0,0 +1,123 @@
+# utils/recordatorios.py
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.citas import Cita
+from models.correos_outbox import CorreoOutbox
+from utils.correos_outbox import encolar_correo
+from utils.tareas_periodicas import TareaPeriodica
+
+logger = logging.getLogger(__name__)
+
+# (evento, anticipación) del más cercano al más lejano
+RECORDATORIOS = (
+    ("recordatorio_2h", timedelta(hours=2)),
+    ("recordatorio_24h", timedelta(hours=24)),
+)
+
+_LOTE_CLAVES = 500
+
+
+def _clave(evento: str, id_cita: int, inicio: datetime) -> str:
+    # Incluye fecha/hora: si la cita se reprograma, se genera un recordatorio nuevo
+    return f"{evento}:{id_cita}:{inicio.isoformat(timespec='minutes')}"
+
+
+def _evento_para(inicio: datetime, ahora: datetime) -> str | None:
+    faltan = inicio - ahora
+    if faltan <= timedelta(0):
+        return None
+    for evento, anticipacion in RECORDATORIOS:
+        if faltan <= anticipacion:
+            return evento
+    return None
+
+
+# ===========================================================
+# ⏰ Encolar recordatorios vencidos
+# ===========================================================
+def programar_recordatorios(db: Session, ahora: datetime | None = None) -> int:
+    """
+    Encola en el outbox los recordatorios de las citas que empiezan en las
+    próximas 24 h. Solo lee el rango de fechas [hoy, mañana] vía el índice
+    de fecha, no toda la tabla. Regresa cuántos recordatorios se encolaron.
+    """
+    ahora = ahora or datetime.now()
+    horizonte = ahora + max(anticipacion for _, anticipacion in RECORDATORIOS)
+
+    citas = (
+        db.query(Cita.id_cita, Cita.fecha, Cita.hora)
+        .filter(
+            Cita.fecha >= ahora.date(),
+            Cita.fecha <= horizonte.date(),
+            Cita.hora.is_not(None),
+            or_(Cita.estado != "Cancelada", Cita.estado.is_(None)),
+        )
+        .all()
+    )
+
+    candidatos: dict[str, tuple[int, str, datetime]] = {}
+    for c in citas:
+        inicio = datetime.combine(c.fecha, c.hora)
+        evento = _evento_para(inicio, ahora)
+        if evento:
+            candidatos[_clave(evento, c.id_cita, inicio)] = (c.id_cita, evento, inicio)
+
+    # Descartar los que ya se encolaron (en este u otro worker)
+    claves = list(candidatos)
+    for i in range(0, len(claves), _LOTE_CLAVES):
+        existentes = (
+            db.query(CorreoOutbox.clave)
+            .filter(CorreoOutbox.clave.in_(claves[i:i + _LOTE_CLAVES]))
+            .all()
+        )
+        for (clave,) in existentes:
+            candidatos.pop(clave, None)
+
+    if not candidatos:
+        return 0
+
+    for clave, (id_cita, evento, inicio) in candidatos.items():
+        encolar_correo(db, id_cita, evento, clave=clave, inicio_cita=inicio)
+
+    try:
+        db.commit()
+        return len(candidatos)
+    except IntegrityError:
+        # Otro worker ganó la carrera con alguna clave: reintentar uno a uno
+        db.rollback()
+
+    encolados = 0
+    for clave, (id_cita, evento, inicio) in candidatos.items():
+        try:
+            with db.begin_nested():
+                encolar_correo(db, id_cita, evento, clave=clave, inicio_cita=inicio)
+            encolados += 1
+        except IntegrityError:
+            pass
+    db.commit()
+    return encolados
+
+
+# ===========================================================
+# 🔁 Programador en segundo plano
+# ===========================================================
+class ProgramadorRecordatorios(TareaPeriodica):
+    """Hilo que revisa cada RECORDATORIOS_INTERVALO_SEGUNDOS qué recordatorios encolar."""
+
+    nombre = "recordatorios-citas"
+
+    def __init__(self, intervalo: float | None = None):
+        super().__init__(intervalo if intervalo is not None else settings.RECORDATORIOS_INTERVALO_SEGUNDOS)
+
+    def ejecutar(self, db: Session) -> bool:
+        programar_recordatorios(db)
+        return False
+
+
+programador_recordatorios = ProgramadorRecordatorios()
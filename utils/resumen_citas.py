@@ -0,0 +1,163 @@
+# utils/resumen_citas.py
+"""
+Mantiene citas_resumen_diario (models/citas_resumen.py) al día con cada
+INSERT / UPDATE / DELETE de Cita hecho por el ORM (routers/citas.py).
+
+Los eventos de mapper corren dentro del flush, en la misma conexión y
+transacción que el cambio de la cita: si la transacción se revierte, el
+conteo también. Cada cambio es un upsert `total = total + delta`, así
+que dos workers pueden sumar sobre la misma llave sin pisarse.
+
+Las llaves incluyen id_personal e id_terapia, y en la BD esas FKs de
+citas son ON DELETE SET NULL / ON UPDATE CASCADE: al borrar (o cambiar
+el id de) un Personal o una Terapia por el ORM, sus conteos se mueven a
+la llave que deja la cascada (0 o el id nuevo) en el mismo flush.
+
+Los UPDATE/DELETE masivos (query.update/delete, de citas, personal o
+terapias) no pasan por aquí: después de uno, recalcular con
+`recalcular_resumen`.
+"""
+from datetime import date
+
+from sqlalchemy import delete, event, func, inspect, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.citas import Cita
+from models.citas_resumen import CitaResumenDiario
+from models.personal import Personal
+from models.terapias import Terapia
+
+Llave = tuple[date, int, int, str]
+
+_CAMPOS = ("fecha", "id_personal", "id_terapia", "estado")
+_RESUMEN = CitaResumenDiario.__table__
+
+
+def _llave(fecha, id_personal, id_terapia, estado) -> Llave | None:
+    if fecha is None:
+        return None  # sin fecha no aparece en el dashboard
+    return fecha, id_personal or 0, id_terapia or 0, estado or ""
+
+
+def _llave_actual(cita: Cita) -> Llave | None:
+    return _llave(*(getattr(cita, campo) for campo in _CAMPOS))
+
+
+def _llave_previa(cita: Cita) -> Llave | None:
+    """Llave con los valores que tenía la fila antes de este flush."""
+    estado = inspect(cita)
+    valores = []
+    for campo in _CAMPOS:
+        historial = estado.attrs[campo].history
+        valores.append(historial.deleted[0] if historial.deleted else getattr(cita, campo))
+    return _llave(*valores)
+
+
+def _upsert(connection: Connection, filas: list[dict]):
+    dialecto = connection.dialect.name
+    if dialecto == "mysql":
+        from sqlalchemy.dialects.mysql import insert as insert_mysql
+
+        stmt = insert_mysql(_RESUMEN).values(filas)
+        stmt = stmt.on_duplicate_key_update(total=_RESUMEN.c.total + stmt.inserted.total)
+    else:
+        # SQLite (y PostgreSQL) comparten ON CONFLICT ... DO UPDATE
+        from sqlalchemy.dialects.sqlite import insert as insert_sqlite
+
+        stmt = insert_sqlite(_RESUMEN).values(filas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_CAMPOS),
+            set_={"total": _RESUMEN.c.total + stmt.excluded.total},
+        )
+    connection.execute(stmt)
+
+
+def ajustar(connection: Connection, deltas: dict[Llave | None, int]):
+    filas = [
+        dict(zip(_CAMPOS, llave), total=delta)
+        for llave, delta in deltas.items()
+        if llave is not None and delta
+    ]
+    if filas:
+        _upsert(connection, filas)
+
+
+# ===========================================================
+# 🔄 Eventos de Cita
+# ===========================================================
+@event.listens_for(Cita, "after_insert")
+def _cita_insertada(mapper, connection, target):
+    ajustar(connection, {_llave_actual(target): 1})
+
+
+@event.listens_for(Cita, "after_update")
+def _cita_actualizada(mapper, connection, target):
+    antes, despues = _llave_previa(target), _llave_actual(target)
+    if antes != despues:
+        ajustar(connection, {antes: -1, despues: 1})
+
+
+@event.listens_for(Cita, "after_delete")
+def _cita_eliminada(mapper, connection, target):
+    ajustar(connection, {_llave_previa(target): -1})
+
+
+def _conservar_valor_previo(target, value, oldvalue, initiator):
+    pass
+
+
+# active_history: al asignar sobre un atributo expirado (p. ej. después de
+# un commit) se carga el valor viejo, para poder restarlo de su llave
+for _campo in _CAMPOS:
+    event.listen(getattr(Cita, _campo), "set", _conservar_valor_previo, active_history=True)
+
+
+# ===========================================================
+# 🔗 Cascadas de personal / terapias
+#   Lo que siga contado bajo el id viejo (p. ej. citas que el ORM no
+#   tocó) pasa a la llave en la que las deja la FK de la BD.
+# ===========================================================
+def _reasignar(connection: Connection, campo: str, anterior: int, nuevo: int):
+    columna = _RESUMEN.c[campo]
+    filas = [dict(f._mapping) for f in connection.execute(select(_RESUMEN).where(columna == anterior))]
+    if not filas:
+        return
+    connection.execute(delete(_RESUMEN).where(columna == anterior))
+    for fila in filas:
+        fila[campo] = nuevo
+    ajustar(connection, {tuple(f[c] for c in _CAMPOS): f["total"] for f in filas})
+
+
+@event.listens_for(Personal, "after_delete")
+@event.listens_for(Terapia, "after_delete")
+def _referencia_eliminada(mapper, connection, target):
+    campo = mapper.primary_key[0].key
+    _reasignar(connection, campo, getattr(target, campo), 0)
+
+
+@event.listens_for(Personal, "after_update")
+@event.listens_for(Terapia, "after_update")
+def _referencia_actualizada(mapper, connection, target):
+    campo = mapper.primary_key[0].key
+    historial = inspect(target).attrs[campo].history
+    if historial.deleted and historial.deleted[0] != getattr(target, campo):
+        _reasignar(connection, campo, historial.deleted[0], getattr(target, campo))
+
+
+# ===========================================================
+# 🧮 Recalcular desde cero
+# ===========================================================
+def recalcular_resumen(db: Session) -> int:
+    """Rehace la tabla a partir de citas (en la transacción de `db`). Regresa las filas."""
+    llaves = (
+        Cita.fecha,
+        func.coalesce(Cita.id_personal, 0),
+        func.coalesce(Cita.id_terapia, 0),
+        func.coalesce(Cita.estado, ""),
+    )
+    conteos = select(*llaves, func.count()).where(Cita.fecha.is_not(None)).group_by(*llaves)
+
+    db.execute(delete(_RESUMEN))
+    db.execute(insert(_RESUMEN).from_select([*_CAMPOS, "total"], conteos))
+    return db.execute(select(func.count()).select_from(_RESUMEN)).scalar_one()
@@ -0,0 +1,163 @@
+# utils/smtp_pool.py
+import logging
+import queue
+import smtplib
+import time
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================================
+# 📡 Conexión SMTP autenticada y reutilizable
+# ===========================================================
+class _SesionSMTP(smtplib.SMTP):
+    """smtplib.SMTP que anota si el servidor ya aceptó el MAIL FROM del envío en curso."""
+
+    mail_aceptado = False
+
+    def mail(self, *args, **kwargs):
+        respuesta = super().mail(*args, **kwargs)
+        self.mail_aceptado = respuesta[0] == 250
+        return respuesta
+
+
+class ConexionSMTP:
+    def __init__(self, id_conexion: int):
+        self.id_conexion = id_conexion
+        self._smtp: _SesionSMTP | None = None
+        self._ultimo_uso = 0.0
+
+        # Contadores
+        self.mensajes_enviados = 0
+        self.reconexiones = 0
+        self.handshakes = 0
+        self.tiempo_handshake_total = 0.0
+        self.ultimo_handshake = 0.0
+
+    def _conectar(self):
+        inicio = time.perf_counter()
+        smtp = _SesionSMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SEGUNDOS)
+        try:
+            if settings.SMTP_STARTTLS:
+                smtp.starttls()
+            if settings.SMTP_USER:
+                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+
+        self.ultimo_handshake = time.perf_counter() - inicio
+        self.tiempo_handshake_total += self.ultimo_handshake
+        if self.handshakes:
+            self.reconexiones += 1
+        self.handshakes += 1
+        self._smtp = smtp
+
+    def _viva(self) -> bool:
+        """NOOP solo si estuvo ociosa más de SMTP_POOL_NOOP_SEGUNDOS."""
+        if self._smtp is None:
+            return False
+        if time.monotonic() - self._ultimo_uso < settings.SMTP_POOL_NOOP_SEGUNDOS:
+            return True
+        try:
+            return self._smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def enviar(self, remitente: str, destinatarios: list[str], mensaje: str):
+        if not self._viva():
+            self.cerrar()
+            self._conectar()
+
+        smtp = self._smtp
+        smtp.mail_aceptado = False
+        try:
+            smtp.sendmail(remitente, destinatarios, mensaje)
+        except smtplib.SMTPServerDisconnected:
+            # Después del MAIL FROM (p. ej. timeout tras DATA) el servidor pudo
+            # haber recibido el mensaje: no se reenvía, decide el outbox
+            if smtp.mail_aceptado:
+                raise
+            # El servidor cerró la sesión ociosa antes de empezar: reconectar una vez
+            logger.info("Conexión SMTP %s perdida, reconectando", self.id_conexion)
+            self.cerrar()
+            self._conectar()
+            self._smtp.sendmail(remitente, destinatarios, mensaje)
+
+        self.mensajes_enviados += 1
+        self._ultimo_uso = time.monotonic()
+
+    def cerrar(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+    def estadisticas(self) -> dict:
+        return {
+            "id_conexion": self.id_conexion,
+            "conectada": self._smtp is not None,
+            "mensajes_enviados": self.mensajes_enviados,
+            "reconexiones": self.reconexiones,
+            "handshakes": self.handshakes,
+            "ultimo_handshake_ms": round(self.ultimo_handshake * 1000, 2),
+            "handshake_promedio_ms": round(
+                self.tiempo_handshake_total * 1000 / self.handshakes, 2
+            ) if self.handshakes else 0.0,
+        }
+
+
+# ===========================================================
+# 🏊 Pool de conexiones
+# ===========================================================
+class PoolSMTP:
+    """
+    Mantiene hasta `tamano` sesiones SMTP autenticadas. Cada mensaje toma
+    una sesión libre (o espera), así muchos mensajes comparten el handshake.
+    """
+
+    def __init__(self, tamano: int | None = None):
+        self.tamano = tamano or settings.SMTP_POOL_TAMANO
+        self._conexiones = [ConexionSMTP(i + 1) for i in range(self.tamano)]
+        self._libres: queue.LifoQueue[ConexionSMTP] = queue.LifoQueue()
+        for conexion in reversed(self._conexiones):
+            self._libres.put(conexion)
+
+    def enviar(self, remitente: str, destinatarios: list[str], mensaje: str):
+        conexion = self._libres.get()
+        try:
+            conexion.enviar(remitente, destinatarios, mensaje)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+            # El servidor respondió con un código de error: la sesión sigue sirviendo
+            raise
+        except Exception:
+            conexion.cerrar()
+            raise
+        finally:
+            self._libres.put(conexion)
+
+    def cerrar(self):
+        """
+        Cierra las sesiones libres. Las que otro hilo tiene en uso no se
+        tocan: siguen abiertas al devolverse (se reconectan al usarse si hace falta).
+        """
+        libres = []
+        while True:
+            try:
+                libres.append(self._libres.get_nowait())
+            except queue.Empty:
+                break
+        for conexion in reversed(libres):
+            conexion.cerrar()
+            self._libres.put(conexion)
+
+    def estadisticas(self) -> list[dict]:
+        return [c.estadisticas() for c in self._conexiones]
+
+
+pool_smtp = PoolSMTP()
@@ -0,0 +1,57 @@
+# utils/tareas_periodicas.py
+import logging
+import threading
+
+from sqlalchemy.orm import Session
+
+from database.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================================
+# 🔁 Tarea periódica en un hilo (despachador, recordatorios, ...)
+# ===========================================================
+class TareaPeriodica:
+    """
+    Hilo daemon que cada `intervalo` segundos abre una sesión y llama a
+    `ejecutar(db)`. Si `ejecutar` regresa True vuelve a correr sin esperar
+    (p. ej. un lote lleno). Un error se registra y hace rollback; el ciclo sigue.
+    """
+
+    nombre = "tarea-periodica"
+
+    def __init__(self, intervalo: float):
+        self.intervalo = intervalo
+        self._detener = threading.Event()
+        self._hilo: threading.Thread | None = None
+
+    def ejecutar(self, db: Session) -> bool:
+        raise NotImplementedError
+
+    def iniciar(self):
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name=self.nombre, daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0):
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout)
+
+    def _ciclo(self):
+        while not self._detener.is_set():
+            seguir = False
+            db = SessionLocal()
+            try:
+                seguir = self.ejecutar(db)
+            except Exception:
+                db.rollback()
+                logger.exception("Error en la tarea %s", self.nombre)
+            finally:
+                db.close()
+
+            if not seguir:
+                self._detener.wait(self.intervalo)